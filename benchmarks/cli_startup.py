@@ -0,0 +1,250 @@
+"""
+smart-lead CLI 启动时间基准测试
+
+对 smart-lead --help 和每个子命令的 --help 分别启动子进程：
+- 使用 python -X importtime 统计导入耗时（总计与耗时最多的顶层模块）
+- 不带 -X importtime 多次运行取进程墙钟时间的中位数
+
+smart-lead --help 不应导入任何子命令模块和重量级依赖（HEAVY_MODULES），
+其导入耗时超过 --budget-ms 或导入了重量级依赖时以退出码 1 结束；
+子命令的 --help 只导入该命令执行所需的模块（数据库、配置等），
+不应导入 Web 框架和 LLM/邮件 SDK（SUBCOMMAND_HEAVY_MODULES），
+导入耗时不应超过 --subcommand-budget-ms。
+也可保存基线并对比（超过阈值的回归以退出码 1 结束）。
+
+使用方法：
+    python -m benchmarks.cli_startup
+    python -m benchmarks.cli_startup --budget-ms 80 --rounds 10
+    python -m benchmarks.cli_startup --save-baseline benchmarks/baselines/cli_startup.json
+    python -m benchmarks.cli_startup --compare benchmarks/baselines/cli_startup.json
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from cli.main import LAZY_COMMANDS
+
+from .reporting import (
+    compare_with_baseline,
+    config_differences,
+    format_comparison,
+    load_report,
+    save_report,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# smart-lead --help 不允许导入的模块（导入耗时以秒计）
+HEAVY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "zai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "resend",
+    "sqlalchemy",
+    "fastapi",
+    "starlette",
+    "uvicorn",
+    "pydantic_settings",
+)
+
+# 子命令 --help 不允许导入的模块（只在 API 服务或实际调用 LLM/发送邮件时需要）
+SUBCOMMAND_HEAVY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "zai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "resend",
+    "fastapi",
+    "starlette",
+    "uvicorn",
+)
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        每个模块一项：module、self_us、cumulative_us、depth（0 表示顶层导入）
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return rows
+
+
+def _command(args: Sequence[str], importtime: bool) -> List[str]:
+    flags = ["-X", "importtime"] if importtime else []
+    return [sys.executable, *flags, "-m", "cli.main", *args]
+
+
+def measure_target(args: Sequence[str], rounds: int) -> Dict[str, Any]:
+    """
+    测量一个命令行
+
+    Returns:
+        import_ms（导入总耗时）、wall_ms（墙钟时间中位数）、modules（导入的模块数）、
+        top（耗时最多的顶层模块）、imported（导入的模块名集合）、error（失败时的输出）
+    """
+    proc = subprocess.run(
+        _command(args, importtime=True), capture_output=True, text=True, cwd=ROOT
+    )
+    rows = parse_importtime(proc.stderr)
+    result: Dict[str, Any] = {
+        "import_ms": round(sum(row["self_us"] for row in rows) / 1000, 2),
+        "modules": len(rows),
+        "top": sorted(
+            (row for row in rows if row["depth"] == 0),
+            key=lambda row: row["cumulative_us"],
+            reverse=True,
+        )[:5],
+        "imported": {row["module"] for row in rows},
+        "error": "",
+    }
+    if proc.returncode != 0:
+        # 缺少可选依赖等情况：只报告，不计时
+        lines = [
+            line for line in proc.stderr.splitlines() if "import time:" not in line
+        ]
+        result["error"] = lines[-1] if lines else f"退出码 {proc.returncode}"
+        return result
+
+    wall = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run(_command(args, importtime=False), capture_output=True, cwd=ROOT)
+        wall.append((time.perf_counter() - start) * 1000)
+    result["wall_ms"] = round(statistics.median(wall), 2)
+    return result
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="smart-lead CLI 启动时间基准测试")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=100.0,
+        help="smart-lead --help 的导入耗时预算（毫秒）",
+    )
+    parser.add_argument(
+        "--subcommand-budget-ms",
+        type=float,
+        default=1200.0,
+        help="每个子命令 --help 的导入耗时预算（毫秒）",
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="墙钟时间的测量次数")
+    parser.add_argument(
+        "--no-subcommands", action="store_true", help="只测量 smart-lead --help"
+    )
+    parser.add_argument("--save-baseline", help="把本次结果保存为基线 JSON")
+    parser.add_argument("--compare", help="与基线 JSON 对比")
+    parser.add_argument(
+        "--threshold", type=float, default=20.0, help="回归阈值（百分比）"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """主函数"""
+    args = parse_args(argv)
+    targets = {"--help": ["--help"]}
+    if not args.no_subcommands:
+        targets.update({name: [name, "--help"] for name in LAZY_COMMANDS})
+
+    report: Dict[str, Any] = {"targets": {}}
+    failed = False
+    width = max(len(name) for name in targets)
+    print(f"{'命令':<{width}}  {'导入 ms':>10}  {'墙钟 ms':>10}  {'模块数':>6}")
+    for name, command_args in targets.items():
+        result = measure_target(command_args, args.rounds)
+        if result["error"]:
+            print(f"{name:<{width}}  {'失败':>10}  {result['error']}")
+            continue
+        report["targets"][name] = {
+            key: result[key] for key in ("import_ms", "wall_ms", "modules")
+        }
+        print(
+            f"{name:<{width}}  {result['import_ms']:>10.1f}  "
+            f"{result['wall_ms']:>10.1f}  {result['modules']:>6}"
+        )
+        for row in result["top"]:
+            print(
+                f"{'':<{width}}    {row['cumulative_us'] / 1000:>8.1f}  {row['module']}"
+            )
+
+        if name == "--help":
+            heavy = sorted(
+                module
+                for module in result["imported"]
+                if module.split(".")[0] in HEAVY_MODULES
+                or (module.startswith("cli.") and module != "cli.main")
+            )
+            budget = args.budget_ms
+        else:
+            heavy = sorted(
+                module
+                for module in result["imported"]
+                if module.split(".")[0] in SUBCOMMAND_HEAVY_MODULES
+            )
+            budget = args.subcommand_budget_ms
+        if heavy:
+            failed = True
+            print(f"  ✗ {name} --help 导入了不应导入的模块: {', '.join(heavy[:10])}")
+        if result["import_ms"] > budget:
+            failed = True
+            print(
+                f"  ✗ {name} --help 导入耗时 {result['import_ms']:.1f}ms "
+                f"超过预算 {budget:g}ms"
+            )
+
+    if args.save_baseline:
+        save_report(report, args.save_baseline, vars(args))
+        print(f"\n基线已保存: {args.save_baseline}")
+
+    if args.compare:
+        differences = config_differences(
+            load_report(args.compare).get("config", {}),
+            vars(args),
+            ignored=(
+                "save_baseline",
+                "compare",
+                "threshold",
+                "budget_ms",
+                "subcommand_budget_ms",
+            ),
+        )
+        if differences:
+            print(f"\n警告: 运行参数与基线不同 {differences}")
+        rows = compare_with_baseline(
+            report, args.compare, args.threshold, ("import_ms", "wall_ms")
+        )
+        print(f"\n与基线对比（阈值 {args.threshold}%）:")
+        print(format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+FindKP 端到端吞吐/延迟基准测试
+
+在固定的公司语料上运行 FindKPService.find_kps（或 batch-findkp 全流程），
+搜索使用 httpx.MockTransport 替代 Serper，LLM 使用替身，二者的延迟分布可配置；
+数据库默认使用临时目录中的 SQLite 文件（需要安装 aiosqlite），也可通过 --db-url 指向本地 MySQL。
+
+报告内容：公司/分钟、各阶段 p50/p95/p99 延迟、数据库往返次数、内存分配，
+可保存为基线并在之后的运行中对比（超过阈值的回归以退出码 1 结束）。
+
+使用方法：
+    python -m benchmarks.findkp_e2e --companies 200 --concurrency 8
+    python -m benchmarks.findkp_e2e --search-latency lognormal:400,0.4 --llm-latency lognormal:1500,0.5
+    python -m benchmarks.findkp_e2e --mode batch --companies 100
+    python -m benchmarks.findkp_e2e --save-baseline benchmarks/baselines/findkp_e2e.json
+    python -m benchmarks.findkp_e2e --compare benchmarks/baselines/findkp_e2e.json --threshold 10
+"""
+
+import argparse
+import asyncio
+import functools
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import logs
+from config import settings
+from core.search import SerperSearchProvider
+from core.search.telemetry import get_telemetry_writer
+from database import models
+from database.repository import Repository
+from findkp.service import FindKPService
+from llm.usage import get_usage_recorder
+
+from .reporting import (
+    compare_with_baseline,
+    config_differences,
+    format_comparison,
+    latency_summary,
+    load_report,
+    save_report,
+)
+from .stubs import (
+    LatencyModel,
+    MockSerperTransport,
+    StubLLM,
+    generate_corpus,
+    generate_trade_rows,
+)
+
+# 计时的方法 -> 阶段名称
+STAGES = {
+    (FindKPService, "find_kps"): "total",
+    (FindKPService, "_search_and_save_company_info"): "company_info",
+    (FindKPService, "_search_and_save_contacts"): "contacts",
+    (FindKPService, "_search_with_multiple_providers"): "search",
+    (FindKPService, "extract_company_info_with_llm"): "llm_company_info",
+    (FindKPService, "_extract_contacts_map_reduce"): "llm_contacts",
+    (FindKPService, "_extract_and_save_public_emails"): "public_emails",
+    (Repository, "create_contacts_batch"): "db_save_contacts",
+}
+
+# 默认参与基线对比的指标后缀
+COMPARED_METRICS = (
+    "companies_per_min",
+    ".p50",
+    ".p95",
+    ".p99",
+    "round_trips_per_company",
+    "_kb",
+)
+
+
+class StageTimer:
+    """按阶段收集方法耗时（毫秒）"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, func, stage: str):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.samples[stage].append((time.perf_counter() - start) * 1000)
+
+        return wrapper
+
+    def install(self, stack: ExitStack) -> None:
+        for (owner, name), stage in STAGES.items():
+            original = getattr(owner, name)
+            stack.enter_context(
+                mock.patch.object(owner, name, self.wrap(original, stage))
+            )
+
+
+class RoundTripCounter:
+    """统计发送到数据库的语句数"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+async def _prepare_database(db_url: str):
+    engine = create_async_engine(db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+        await conn.run_sync(models.Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine, session_factory
+
+
+async def _run_find_kps(
+    session_factory,
+    companies: List[Tuple[str, str]],
+    concurrency: int,
+) -> int:
+    """并发执行 find_kps（每个公司使用独立会话），返回失败数"""
+    service = FindKPService()
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def run_one(name_en: str, name_local: str) -> None:
+        nonlocal errors
+        async with semaphore:
+            async with session_factory() as session:
+                try:
+                    await service.find_kps(name_en, name_local, "Vietnam", session)
+                    await session.commit()
+                except Exception:
+                    errors += 1
+                    await session.rollback()
+
+    await asyncio.gather(*(run_one(*company) for company in companies))
+    await service.aclose()
+    return errors
+
+
+async def _seed_trade_records(session_factory, companies: List[Tuple[str, str]]):
+    """写入 batch 模式使用的贸易记录"""
+    async with session_factory() as session:
+        await session.execute(
+            insert(models.TradeRecord), generate_trade_rows(companies)
+        )
+        await session.commit()
+
+
+async def _run_batch(session_factory, companies: List[Tuple[str, str]]) -> int:
+    """执行 batch-findkp 全流程（聚合、消歧、评分、逐个 find_kps），返回失败数"""
+    from cli import batch_findkp
+
+    with mock.patch.object(batch_findkp, "BatchSessionLocal", session_factory):
+        stats = await batch_findkp._run_batch_findkp(top=len(companies))
+    return stats["failed"]
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """运行一次基准测试并生成报告"""
+    db_url = args.db_url or (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='findkp-bench-db-')}/bench.db"
+    )
+    engine, session_factory = await _prepare_database(db_url)
+    companies = generate_corpus(args.companies, seed=args.seed)
+    if args.mode == "batch":
+        await _seed_trade_records(session_factory, companies)
+    round_trips = RoundTripCounter(engine)
+
+    search_latency = LatencyModel(args.search_latency, seed=args.seed)
+    llm = StubLLM(LatencyModel(args.llm_latency, seed=args.seed + 1))
+    transport = MockSerperTransport(search_latency, args.results_per_query)
+    timer = StageTimer()
+    get_telemetry_writer().session_factory = session_factory
+    get_usage_recorder().session_factory = session_factory
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            mock.patch("findkp.service.get_llm_for_task", lambda *a, **k: llm)
+        )
+        stack.enter_context(
+            mock.patch(
+                "findkp.service.SerperSearchProvider",
+                functools.partial(SerperSearchProvider, transport=transport),
+            )
+        )
+        timer.install(stack)
+
+        if args.trace_alloc:
+            tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter()
+        if args.mode == "batch":
+            errors = await _run_batch(session_factory, companies)
+        else:
+            errors = await _run_find_kps(session_factory, companies, args.concurrency)
+        elapsed = time.perf_counter() - start
+        blocks_after = sys.getallocatedblocks()
+        allocations: Dict[str, Any] = {"net_blocks": blocks_after - blocks_before}
+        if args.trace_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            allocations.update(
+                {"retained_kb": round(current / 1024), "peak_kb": round(peak / 1024)}
+            )
+
+    await get_telemetry_writer().close()
+    await get_usage_recorder().close()
+    await engine.dispose()
+
+    processed = len(timer.samples["total"]) or len(companies)
+    return {
+        "throughput": {
+            "companies": processed,
+            "errors": errors,
+            "elapsed_s": round(elapsed, 3),
+            "companies_per_min": round(processed / elapsed * 60, 2),
+        },
+        "stages": {
+            stage: latency_summary(timer.samples[stage])
+            for stage in STAGES.values()
+            if timer.samples[stage]
+        },
+        "db": {
+            "round_trips": round_trips.count,
+            "round_trips_per_company": round(round_trips.count / processed, 2),
+        },
+        "stubs": {
+            "search_http_requests": transport.requests,
+            "llm_calls": llm.calls,
+        },
+        "allocations": allocations,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """输出报告"""
+    throughput = report["throughput"]
+    print(
+        f"\n公司数: {throughput['companies']}（失败 {throughput['errors']}），"
+        f"耗时 {throughput['elapsed_s']}s，吞吐 {throughput['companies_per_min']} 公司/分钟"
+    )
+    print(f"\n{'阶段':<18}{'次数':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    for stage, summary in report["stages"].items():
+        print(
+            f"{stage:<18}{summary['count']:>8}{summary['p50']:>12.2f}"
+            f"{summary['p95']:>12.2f}{summary['p99']:>12.2f}"
+        )
+    db = report["db"]
+    print(
+        f"\n数据库往返: {db['round_trips']}（每公司 {db['round_trips_per_company']}）"
+    )
+    print(f"替身调用: {report['stubs']}")
+    print(f"内存分配: {report['allocations']}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FindKP 端到端基准测试")
+    parser.add_argument(
+        "--mode",
+        choices=["find_kps", "batch"],
+        default="find_kps",
+        help="find_kps: 并发执行 find_kps；batch: 运行 batch-findkp 全流程",
+    )
+    parser.add_argument("--companies", type=int, default=50, help="语料公司数量")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="find_kps 模式的并发数"
+    )
+    parser.add_argument(
+        "--search-latency",
+        default="fixed:0",
+        help="搜索延迟分布（fixed:ms / uniform:a,b / lognormal:中位数ms,sigma）",
+    )
+    parser.add_argument("--llm-latency", default="fixed:0", help="LLM 延迟分布")
+    parser.add_argument(
+        "--results-per-query", type=int, default=10, help="每个查询的搜索结果数"
+    )
+    parser.add_argument(
+        "--db-url",
+        default=None,
+        help="数据库 URL（默认临时 SQLite 文件；会重建所有表，勿指向生产库）",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="语料和延迟的随机种子")
+    parser.add_argument(
+        "--trace-alloc",
+        action="store_true",
+        help="使用 tracemalloc 统计峰值内存（会明显拖慢运行，延迟指标不可与未开启时比较）",
+    )
+    parser.add_argument("--save-baseline", help="把本次结果保存为基线 JSON")
+    parser.add_argument("--compare", help="与基线 JSON 对比")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="回归阈值（百分比）"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """主函数"""
+    args = parse_args(argv)
+
+    # 基准测试不访问网络，也不写入项目的 logs 目录
+    settings.SEARCH_REPLAY_SNAPSHOT = ""
+    settings.SERPER_API_KEY = settings.SERPER_API_KEY or "benchmark"
+    logs.LOGS_DIR = Path(tempfile.mkdtemp(prefix="findkp-bench-"))
+    for log_type in ("requests", "responses"):
+        (logs.LOGS_DIR / "llm" / log_type).mkdir(parents=True)
+    logs.logger.remove()
+    logs.logger.add(sys.stderr, level="ERROR")
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+
+    if args.save_baseline:
+        save_report(report, args.save_baseline, vars(args))
+        print(f"\n基线已保存: {args.save_baseline}")
+
+    if args.compare:
+        rows = compare_with_baseline(
+            report, args.compare, args.threshold, COMPARED_METRICS
+        )
+        differences = config_differences(
+            load_report(args.compare).get("config", {}),
+            vars(args),
+            ignored=("save_baseline", "compare", "threshold", "db_url"),
+        )
+        if differences:
+            print(f"\n警告: 运行参数与基线不同 {differences}")
+        print(f"\n与基线对比（阈值 {args.threshold}%）:")
+        print(format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+FindKP 热点辅助函数微基准测试
+
+覆盖每个公司都会执行的纯 CPU 路径：
+- FindKPService._extract_json_from_text / _fix_common_json_issues / _parse_json_with_fallback
+- FindKPService._extract_emails_from_snippets / _filter_public_emails
+- ResultAggregator.aggregate
+
+语料按固定种子生成，规模为 10 / 100 / 1000 条（搜索结果数或 LLM 输出中的联系人数），
+LLM 输出包含 markdown 代码块、前后说明文字、尾随逗号、单引号、注释和截断等常见问题。
+每个用例报告 ops/sec、单次耗时和单次调用的内存峰值，可追加到历史文件跟踪趋势，
+也可保存基线并对比（超过阈值的回归以退出码 1 结束）。
+
+使用方法：
+    python -m benchmarks.findkp_micro
+    python -m benchmarks.findkp_micro -k aggregate --sizes 10,100
+    python -m benchmarks.findkp_micro --history benchmarks/results/findkp_micro.jsonl
+    python -m benchmarks.findkp_micro --save-baseline benchmarks/baselines/findkp_micro.json
+    python -m benchmarks.findkp_micro --compare benchmarks/baselines/findkp_micro.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import logs
+from core.schemas import SearchResult
+from findkp.result_aggregator import ResultAggregator
+from findkp.service import FindKPService
+
+from .reporting import (
+    compare_with_baseline,
+    config_differences,
+    format_comparison,
+    load_report,
+    save_report,
+)
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+_SURNAMES = ["Nguyen", "Tran", "Le", "Pham", "Hoang", "Vu", "Dang", "Bui", "Do"]
+_GIVEN = ["Van An", "Thi Binh", "Minh", "Thanh Ha", "Quoc Huy", "Lan", "Tuan"]
+_ROLES = ["Purchasing Manager", "Sales Director", "Procurement Officer", "CEO"]
+_PREFIXES = ["info", "sales", "contact", "admin", "hr", "ketoan", "support"]
+
+
+def _contact(rng: random.Random, index: int, domain: str) -> Dict[str, Any]:
+    surname, given = rng.choice(_SURNAMES), rng.choice(_GIVEN)
+    return {
+        "full_name": f"{surname} {given}",
+        "email": f"{given.split()[0].lower()}.{surname.lower()}{index}@{domain}",
+        "role": rng.choice(_ROLES),
+        "linkedin_url": f"https://www.linkedin.com/in/{surname.lower()}-{index}",
+        "confidence_score": round(rng.uniform(0.3, 0.95), 2),
+    }
+
+
+def generate_llm_outputs(size: int, seed: int = 7) -> Dict[str, str]:
+    """
+    生成包含 size 个联系人的各种 LLM 输出
+
+    Returns:
+        {变体名称: 文本}
+    """
+    rng = random.Random(seed)
+    contacts = [_contact(rng, index, "anphat.com.vn") for index in range(size)]
+    payload = json.dumps({"contacts": contacts}, ensure_ascii=False, indent=2)
+    single_quoted = (
+        "{'contacts': ["
+        + ", ".join(
+            "{" + ", ".join(f"'{k}': '{v}'" for k, v in c.items()) + "}"
+            for c in contacts
+        )
+        + "]}"
+    )
+    trailing_commas = payload.replace("\n  ]", ",\n  ]").replace("\n    }", ",\n    }")
+    return {
+        "fenced": f"Here are the contacts:\n```json\n{payload}\n```\nLet me know!",
+        "prose": f"Dựa trên kết quả tìm kiếm, tôi tìm thấy: {payload} (hết)",
+        "messy": (
+            "// extracted contacts\n"
+            + trailing_commas
+            + "\n/* confidence is estimated */"
+        ),
+        "single_quotes": single_quoted,
+        "truncated": payload[: len(payload) * 2 // 3],
+    }
+
+
+def generate_search_results(size: int, seed: int = 11) -> List[Dict[str, str]]:
+    """生成 size 条搜索结果（约 20% 为重复链接或相似标题，snippet 中带邮箱）"""
+    rng = random.Random(seed)
+    domains = ["anphat.com.vn", "gmail.com", "yahoo.com", "vinaplast.vn"]
+    results = []
+    for index in range(size):
+        if results and rng.random() < 0.2:
+            duplicate = dict(rng.choice(results))
+            duplicate["snippet"] += " Cập nhật."
+            results.append(duplicate)
+            continue
+        domain = rng.choice(domains)
+        emails = ", ".join(
+            f"{rng.choice(_PREFIXES + ['nguyen.an', 'tran.binh'])}{rng.randint(1, 99)}@{domain}"
+            for _ in range(rng.randint(0, 3))
+        )
+        results.append(
+            {
+                "title": f"{rng.choice(_ROLES)} - An Phat Plastic {index}",
+                "link": f"https://{domain}/lien-he/{index}",
+                "snippet": f"Liên hệ phòng kinh doanh: {emails}. Hotline 0{rng.randint(10**8, 10**9)}",
+            }
+        )
+    return results
+
+
+def generate_results_map(size: int, queries: int = 6) -> Dict[str, List[SearchResult]]:
+    """把 size 条搜索结果按查询分组（模拟多查询批量搜索的返回）"""
+    results = [SearchResult(**item) for item in generate_search_results(size)]
+    return {
+        f"query {index}": results[index::queries]
+        for index in range(min(queries, len(results)))
+    }
+
+
+def build_cases(sizes: Tuple[int, ...]) -> Dict[str, Callable[[], Any]]:
+    """
+    构建所有用例
+
+    Returns:
+        {"函数[变体].规模": 无参可调用对象}
+    """
+    # 只测试纯函数，不需要初始化 LLM 和搜索提供者
+    service = FindKPService.__new__(FindKPService)
+    aggregator = ResultAggregator()
+    cases: Dict[str, Callable[[], Any]] = {}
+
+    for size in sizes:
+        for variant, text in generate_llm_outputs(size).items():
+            cases[f"extract_json_from_text[{variant}].{size}"] = (
+                lambda text=text: service._extract_json_from_text(text)
+            )
+            cases[f"parse_json_with_fallback[{variant}].{size}"] = (
+                lambda text=text: service._parse_json_with_fallback(text)
+            )
+        messy = generate_llm_outputs(size)["messy"]
+        cases[f"fix_common_json_issues[messy].{size}"] = (
+            lambda text=messy: service._fix_common_json_issues(text)
+        )
+
+        results = generate_search_results(size)
+        cases[f"extract_emails_from_snippets.{size}"] = (
+            lambda results=results: service._extract_emails_from_snippets(results)
+        )
+        emails = service._extract_emails_from_snippets(results) * max(1, size // 20)
+        cases[f"filter_public_emails.{size}"] = (
+            lambda emails=emails: service._filter_public_emails(emails, "anphat.com.vn")
+        )
+
+        results_map = generate_results_map(size)
+        cases[f"aggregate.{size}"] = (
+            lambda results_map=results_map: aggregator.aggregate(results_map)
+        )
+    return cases
+
+
+def measure(func: Callable[[], Any], rounds: int, min_round_time: float) -> Dict:
+    """
+    测量一个用例
+
+    先校准每轮循环次数（每轮至少 min_round_time 秒），再运行 rounds 轮取中位数；
+    内存峰值单独用 tracemalloc 测一次调用，避免影响计时。
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_round_time / 10 else 2
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(per_call)
+    return {
+        "ops_per_sec": round(1 / median, 2) if median else 0.0,
+        "mean_us": round(statistics.fmean(per_call) * 1e6, 3),
+        "stdev_us": round(statistics.pstdev(per_call) * 1e6, 3),
+        "alloc_peak_kb": round(peak / 1024, 2),
+        "loops": loops,
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def append_history(report: Dict[str, Any], path: str) -> None:
+    """把本次结果追加到历史文件（每行一次运行，用于跟踪趋势）"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "cases": {
+            name: {key: result[key] for key in ("ops_per_sec", "alloc_peak_kb")}
+            for name, result in report["cases"].items()
+        },
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FindKP 热点辅助函数微基准测试")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="语料规模（逗号分隔）",
+    )
+    parser.add_argument(
+        "-k", dest="keyword", default="", help="只运行名称包含该字符串的用例"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="每个用例的测量轮数")
+    parser.add_argument(
+        "--min-round-time", type=float, default=0.05, help="每轮最短时间（秒）"
+    )
+    parser.add_argument("--history", help="把结果追加到该 JSONL 历史文件")
+    parser.add_argument("--save-baseline", help="把本次结果保存为基线 JSON")
+    parser.add_argument("--compare", help="与基线 JSON 对比")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="回归阈值（百分比）"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """主函数"""
+    args = parse_args(argv)
+    sizes = tuple(int(size) for size in args.sizes.split(",") if size)
+
+    # 日志输出不计入被测函数的耗时
+    logs.logger.remove()
+
+    cases = {
+        name: func for name, func in build_cases(sizes).items() if args.keyword in name
+    }
+    report: Dict[str, Any] = {"cases": {}}
+    width = max((len(name) for name in cases), default=10)
+    print(f"{'用例':<{width}}  {'ops/sec':>12}  {'mean µs':>12}  {'峰值 KB':>10}")
+    for name, func in cases.items():
+        result = measure(func, args.rounds, args.min_round_time)
+        report["cases"][name] = result
+        print(
+            f"{name:<{width}}  {result['ops_per_sec']:>12.1f}  "
+            f"{result['mean_us']:>12.2f}  {result['alloc_peak_kb']:>10.1f}"
+        )
+
+    if args.history:
+        append_history(report, args.history)
+        print(f"\n已追加到历史文件: {args.history}")
+
+    if args.save_baseline:
+        save_report(report, args.save_baseline, vars(args))
+        print(f"\n基线已保存: {args.save_baseline}")
+
+    if args.compare:
+        differences = config_differences(
+            load_report(args.compare).get("config", {}),
+            vars(args),
+            ignored=("save_baseline", "compare", "threshold", "history", "keyword"),
+        )
+        if differences:
+            print(f"\n警告: 运行参数与基线不同 {differences}")
+        rows = compare_with_baseline(
+            report, args.compare, args.threshold, ("ops_per_sec", "alloc_peak_kb")
+        )
+        print(f"\n与基线对比（阈值 {args.threshold}%）:")
+        print(format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
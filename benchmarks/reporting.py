@@ -0,0 +1,164 @@
+"""基准测试结果统计、保存和基线对比"""
+
+import json
+import math
+import platform
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 越大越好的指标（其余指标越小越好）
+HIGHER_IS_BETTER_SUFFIXES = ("companies_per_min", "ops_per_sec")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        values: 样本
+        pct: 百分位（0-100）
+
+    Returns:
+        百分位数，没有样本时返回 0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(samples_ms: Iterable[float]) -> Dict[str, float]:
+    """生成延迟摘要（毫秒）：count、mean、p50、p95、p99、max"""
+    samples = list(samples_ms)
+    return {
+        "count": len(samples),
+        "mean": round(sum(samples) / len(samples), 3) if samples else 0.0,
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def flatten_metrics(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """把嵌套的报告展开为 {"a.b.c": 数值}，只保留数值指标"""
+    flat: Dict[str, float] = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def save_report(
+    report: Dict[str, Any], path: str, config: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    保存报告（可作为之后对比的基线）
+
+    Args:
+        report: 报告（只包含指标）
+        path: JSON 文件路径
+        config: 本次运行的参数（不参与对比）
+    """
+    data = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": config or {},
+        "report": report,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """读取 save_report 保存的文件（包含 config 和 report）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def config_differences(
+    baseline_config: Dict[str, Any],
+    config: Dict[str, Any],
+    ignored: Sequence[str] = (),
+) -> Dict[str, Tuple[Any, Any]]:
+    """找出与基线运行参数不同的项（参数不同时对比结果没有意义）"""
+    return {
+        key: (baseline_config[key], value)
+        for key, value in config.items()
+        if key in baseline_config
+        and key not in ignored
+        and baseline_config[key] != value
+    }
+
+
+def compare_with_baseline(
+    report: Dict[str, Any],
+    baseline_path: str,
+    threshold_pct: float = 10.0,
+    metric_suffixes: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    与保存的基线对比
+
+    Args:
+        report: 本次报告
+        baseline_path: 基线 JSON 文件路径
+        threshold_pct: 变差超过该百分比视为回归
+        metric_suffixes: 只对比以这些后缀结尾的指标（展开后的名称），None 表示所有共同指标
+
+    Returns:
+        每个指标的对比结果（name、baseline、current、change_pct、regression）
+    """
+    baseline = flatten_metrics(load_report(baseline_path)["report"])
+    current = flatten_metrics(report)
+
+    names = sorted(set(baseline) & set(current))
+    if metric_suffixes is not None:
+        names = [name for name in names if name.endswith(tuple(metric_suffixes))]
+
+    rows = []
+    for name in names:
+        before, after = baseline[name], current[name]
+        if before == 0:
+            change_pct = 0.0 if after == 0 else math.inf
+        else:
+            change_pct = (after - before) / abs(before) * 100
+        if name.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            regression = change_pct < -threshold_pct
+        else:
+            regression = change_pct > threshold_pct
+        rows.append(
+            {
+                "name": name,
+                "baseline": before,
+                "current": after,
+                "change_pct": round(change_pct, 2),
+                "regression": regression,
+            }
+        )
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """格式化基线对比表格"""
+    if not rows:
+        return "基线中没有可对比的指标"
+    width = max(len(row["name"]) for row in rows)
+    lines = [f"{'指标':<{width}}  {'基线':>12}  {'本次':>12}  {'变化':>9}"]
+    for row in rows:
+        flag = "  ← 回归" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:<{width}}  {row['baseline']:>12.3f}  "
+            f"{row['current']:>12.3f}  {row['change_pct']:>8.2f}%{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,290 @@
+"""基准测试用的搜索/LLM 替身和固定语料
+
+- LatencyModel：可配置的延迟分布（fixed / uniform / lognormal），使用固定种子
+- MockSerperTransport：httpx.MockTransport，按查询确定性地生成 Serper 响应
+- StubLLM：兼容 ainvoke / with_structured_output，从提示词中的搜索结果生成答案
+- generate_corpus：固定的越南进口商语料（含名称变体和贸易记录）
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import httpx
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from core.company_names import normalize_company_name
+from schemas.contact import CompanyInfoResponse, ContactsResponse
+
+_DOMAIN_IN_QUERY = re.compile(r"@?([a-z0-9-]+(?:\.[a-z0-9-]+)*\.vn)\b")
+_LINK_DOMAIN = re.compile(r"https?://(?:www\.)?([a-z0-9.-]+\.vn)")
+_EMAIL = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+
+class LatencyModel:
+    """
+    延迟分布
+
+    规格字符串：
+    - "0" 或 "fixed:120"：固定延迟（毫秒）
+    - "uniform:50,200"：均匀分布（毫秒）
+    - "lognormal:300,0.5"：对数正态分布（中位数毫秒, sigma）
+    """
+
+    def __init__(self, spec: str = "0", seed: int = 0):
+        self.spec = spec
+        self._random = random.Random(seed)
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        self.kind = kind
+        self.params = [float(value) for value in params.split(",") if value]
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"不支持的延迟分布: {spec}")
+
+    def sample_ms(self) -> float:
+        """采样一次延迟（毫秒）"""
+        if self.kind == "fixed":
+            return self.params[0] if self.params else 0.0
+        if self.kind == "uniform":
+            low, high = self.params
+            return self._random.uniform(low, high)
+        median, sigma = self.params
+        return median * self._random.lognormvariate(0.0, sigma)
+
+    async def sleep(self) -> None:
+        """按分布等待一次"""
+        delay = self.sample_ms()
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+
+def company_domain(name: str) -> str:
+    """由公司名称生成确定性的域名（同一公司的名称变体得到同一域名）"""
+    tokens = normalize_company_name(name).replace("vietnam", "").split()
+    slug = "".join(tokens)[:24] or "company"
+    return f"{slug}.com.vn"
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _organic_results(query: str, count: int) -> List[Dict[str, Any]]:
+    """按查询确定性地生成 organic 结果"""
+    rng = random.Random(_seed(query))
+    match = _DOMAIN_IN_QUERY.search(query.lower())
+    if match:
+        domain = match.group(1)
+    else:
+        domain = company_domain(query.replace("official website", ""))
+
+    surnames = ["nguyen", "tran", "le", "pham", "hoang", "vu", "dang"]
+    roles = ["Purchasing Manager", "Sales Director", "Procurement Officer", "CEO"]
+    results = []
+    for position in range(1, count + 1):
+        person = f"{rng.choice(surnames)}.{rng.choice('abcdefghik')}{position}"
+        results.append(
+            {
+                "title": f"{domain} - {rng.choice(roles)} | page {position}",
+                "link": f"https://www.{domain}/page-{position}-{rng.randint(1, 9999)}",
+                "snippet": (
+                    f"Liên hệ {person.title()} ({rng.choice(roles)}): "
+                    f"{person}@{domain}, hotline +84 {rng.randint(10**8, 10**9 - 1)}. "
+                    f"Email chung: info@{domain}"
+                ),
+                "position": position,
+            }
+        )
+    return results
+
+
+class MockSerperTransport(httpx.MockTransport):
+    """替代 Serper 网络请求的 httpx 传输层"""
+
+    def __init__(self, latency: LatencyModel, results_per_query: int = 10):
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.requests = 0
+        super().__init__(self._handle)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await self.latency.sleep()
+        payload = json.loads(request.content)
+        queries = payload if isinstance(payload, list) else [payload]
+        responses = [
+            {
+                "searchParameters": {**query, "type": "search", "engine": "google"},
+                "organic": _organic_results(query["q"], self.results_per_query),
+                "credits": 1,
+            }
+            for query in queries
+        ]
+        body = responses if isinstance(payload, list) else responses[0]
+        return httpx.Response(200, json=body)
+
+
+def _prompt_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(
+        message.get("content", "") if isinstance(message, dict) else message.content
+        for message in messages
+    )
+
+
+def _answer(prompt: str, schema: Optional[Type[BaseModel]]) -> Dict[str, Any]:
+    """从提示词中的搜索结果生成确定性的答案"""
+    if schema is CompanyInfoResponse:
+        match = _LINK_DOMAIN.search(prompt)
+        return {
+            "domain": match.group(1) if match else None,
+            "industry": "Import & Distribution",
+            "positioning": "Importer",
+            "brief": "Benchmark company",
+        }
+    emails = [
+        email
+        for email in dict.fromkeys(_EMAIL.findall(prompt))
+        if not email.startswith("info@")
+    ]
+    return {
+        "contacts": [
+            {
+                "full_name": email.split("@")[0].replace(".", " ").title(),
+                "email": email,
+                "role": "Purchasing Manager",
+                "confidence_score": round(0.6 + 0.05 * (index % 8), 2),
+            }
+            for index, email in enumerate(emails[:5])
+        ]
+    }
+
+
+class StubLLM:
+    """兼容 LangChain 接口的 LLM 替身"""
+
+    def __init__(self, latency: LatencyModel, model: str = "benchmark-stub"):
+        self.latency = latency
+        self.model = model
+        self.calls = 0
+
+    async def ainvoke(self, messages: Any, **kwargs) -> AIMessage:
+        self.calls += 1
+        await self.latency.sleep()
+        answer = _answer(_prompt_text(messages), ContactsResponse)
+        return AIMessage(content=f"```json\n{json.dumps(answer)}\n```")
+
+    def with_structured_output(self, schema: Type[BaseModel], **kwargs):
+        return _StructuredStub(self, schema)
+
+
+class _StructuredStub:
+    def __init__(self, llm: StubLLM, schema: Type[BaseModel]):
+        self.llm = llm
+        self.schema = schema
+
+    async def ainvoke(self, messages: Any, **kwargs) -> BaseModel:
+        self.llm.calls += 1
+        await self.llm.latency.sleep()
+        return self.schema.model_validate(_answer(_prompt_text(messages), self.schema))
+
+
+_NAME_WORDS = [
+    "An Phat",
+    "Binh Minh",
+    "Hoa Sen",
+    "Thanh Cong",
+    "Viet Tien",
+    "Phu Thai",
+    "Sao Mai",
+    "Dai Duong",
+    "Hung Thinh",
+    "Minh Long",
+    "Kim Son",
+    "Tan Hiep",
+    "Hai Ha",
+    "Truong Thanh",
+    "Nam Viet",
+    "Quang Trung",
+    "Hoang Gia",
+    "Thien Long",
+]
+_SECTORS = ["Plastic", "Steel", "Textile", "Food", "Chemical", "Packaging", "Paper"]
+
+
+def generate_corpus(size: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    生成固定的公司语料
+
+    Args:
+        size: 公司数量
+        seed: 随机种子
+
+    Returns:
+        [(英文名, 本地名)]
+    """
+    rng = random.Random(seed)
+    companies = []
+    seen = set()
+    while len(companies) < size:
+        words = f"{rng.choice(_NAME_WORDS)} {rng.choice(_SECTORS)}"
+        suffix = len(companies) // (len(_NAME_WORDS) * len(_SECTORS))
+        if suffix:
+            words += f" {suffix}"
+        if words in seen:
+            continue
+        seen.add(words)
+        companies.append(
+            (
+                f"{words.upper()} COMPANY LIMITED",
+                f"CÔNG TY TNHH {words.upper()}",
+            )
+        )
+    return companies
+
+
+def generate_trade_rows(
+    companies: List[Tuple[str, str]], shipments_per_company: int = 5, seed: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    为语料生成 trade_records 行（每个公司带一个名称变体，用于覆盖消歧路径）
+
+    Args:
+        companies: generate_corpus 的结果
+        shipments_per_company: 每个公司的出货记录数
+        seed: 随机种子
+
+    Returns:
+        trade_records 行数据列表
+    """
+    rng = random.Random(seed)
+    base_date = datetime(2025, 1, 1)
+    rows = []
+    for index, (name_en, name_local) in enumerate(companies):
+        variants = [
+            (name_en, name_local),
+            (name_en.replace("COMPANY LIMITED", "CO., LTD"), name_local),
+        ]
+        for shipment in range(shipments_per_company):
+            importer_en, importer = variants[shipment % len(variants)]
+            rows.append(
+                {
+                    "trade_id": f"bench-{index}-{shipment}",
+                    "dedup_key": f"bench-{index}-{shipment}",
+                    "trade_date": base_date + timedelta(days=rng.randint(0, 365)),
+                    "importer": importer,
+                    "importer_en": importer_en,
+                    "exporter": "BENCHMARK EXPORTER",
+                    "catalog": "imports",
+                    "sum_of_usd": round(rng.uniform(1_000, 500_000), 2),
+                    "hs_code": rng.choice(["390110", "720851", "520100", "481910"]),
+                }
+            )
+    return rows
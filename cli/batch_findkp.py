@@ -1,16 +1,28 @@
 """批量 FindKP CLI 命令 - 从 trade_records 表中批量查询并执行 FindKP"""
 
-import asyncio
 import logging
-from typing import Set, Tuple
+from collections import Counter
+from typing import Dict, Optional, Tuple
 
 import click
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import AsyncSessionLocal
-from database.models import TradeRecord
+from config import settings
+from core.metrics import format_summary
+from core.profiling import run_profiled
+from core.search.telemetry import close_telemetry_writer
+from database.connection import ENGINES, BatchSessionLocal, read_session
+from database.pool import format_pool_status
+from database.repository import Repository
+from findkp.entity_resolution import ImporterResolver, build_alias_rows
+from findkp.priority_scheduler import (
+    ImporterScore,
+    PriorityScorer,
+    format_score,
+    select_importers,
+)
 from findkp.service import FindKPService
+from llm.usage import close_usage_recorder
 
 # 配置日志格式
 logging.basicConfig(
@@ -38,13 +50,37 @@ def setup_logging(verbose: bool):
     help="显示详细日志输出",
     default=False,
 )
-def batch_findkp(verbose: bool):
+@click.option(
+    "--top",
+    type=int,
+    default=None,
+    help="只处理价值分数最高的前 N 个公司",
+)
+@click.option(
+    "--min-usd",
+    type=float,
+    default=None,
+    help="只处理美元总额不低于该值的公司",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="剖析本次运行（折叠栈写入 logs/profiles/cli，并检测事件循环阻塞）",
+)
+def batch_findkp(
+    verbose: bool, top: Optional[int], min_usd: Optional[float], profile: bool
+):
     """
     批量从 trade_records 表中查询公司并执行 FindKP 操作
 
+    公司按价值分数（出货次数、美元总额、最近交易、HS 编码匹配）从高到低处理。
+
     示例:
         smart-lead batch-findkp
         smart-lead batch-findkp --verbose
+        smart-lead batch-findkp --top 100 --min-usd 50000
+        smart-lead batch-findkp --top 20 --profile
     """
     setup_logging(verbose)
 
@@ -55,7 +91,11 @@ def batch_findkp(verbose: bool):
         logger.info("")
 
         # 运行异步任务
-        result = asyncio.run(_run_batch_findkp(verbose))
+        result = run_profiled(
+            _run_batch_findkp(verbose, top=top, min_usd=min_usd),
+            "batch-findkp",
+            enabled=profile,
+        )
 
         # 输出结果统计
         logger.info("")
@@ -67,6 +107,14 @@ def batch_findkp(verbose: bool):
         logger.info(f"失败数量: {result['failed']}")
         logger.info(f"总找到联系人: {result['total_contacts']}")
 
+        if result.get("cascade"):
+            cascade = result["cascade"]
+            logger.info(
+                f"联系人提取级联: 调用 {cascade['calls']} 次, "
+                f"升级 {cascade['escalated']} 次 ({cascade['escalation_rate']:.1%}), "
+                f"估算节省延迟: {cascade['estimated_latency_saved']} 秒"
+            )
+
         if result["failed_companies"]:
             logger.info("")
             logger.info("失败的公司列表:")
@@ -74,6 +122,14 @@ def batch_findkp(verbose: bool):
             for company in result["failed_companies"]:
                 logger.info(f"  - {company}")
 
+        logger.info("")
+        logger.info("阶段耗时与缓存命中:")
+        logger.info("-" * 60)
+        for line in format_summary().splitlines():
+            logger.info(line)
+        for line in format_pool_status(ENGINES).splitlines():
+            logger.info(line)
+
         logger.info("=" * 60)
         return 0
 
@@ -85,31 +141,85 @@ def batch_findkp(verbose: bool):
         return 1
 
 
-async def _run_batch_findkp(verbose: bool = False):
+async def _run_batch_findkp(
+    verbose: bool = False,
+    top: Optional[int] = None,
+    min_usd: Optional[float] = None,
+):
     """执行批量 FindKP 异步任务"""
-    async with AsyncSessionLocal() as session:
+    service = FindKPService()
+    async with BatchSessionLocal() as session:
         try:
-            service = FindKPService()
+            repo = Repository(session)
 
-            # 1. 查询 trade_records 表，获取 importer 和 importer_en
-            logger.info("正在查询 trade_records 表...")
-            query = select(TradeRecord.importer, TradeRecord.importer_en).filter(
-                TradeRecord.importer.isnot(None), TradeRecord.importer != ""
-            )
-            result = await session.execute(query)
-            rows = result.all()
+            # 1. 在数据库中按 (importer_en, importer) 聚合 trade_records
+            #    （全表扫描使用只读副本，未配置或不可用时使用批处理连接池）
+            logger.info("正在聚合 trade_records 表...")
+            async with read_session(fallback=BatchSessionLocal) as read_db:
+                rows = await Repository(read_db).get_importer_trade_aggregates(
+                    settings.FINDKP_TARGET_HS_CODES
+                )
 
-            # 2. 去重：使用 set 存储 (importer, importer_en) 元组
-            companies_set: Set[Tuple[str, str]] = set()
+            # 2. 按名称变体汇总聚合指标
+            name_counts: Dict[Tuple[str, str], int] = Counter()
+            variant_metrics: Dict[Tuple[str, str], ImporterScore] = {}
             for row in rows:
                 importer = row.importer.strip() if row.importer else ""
                 importer_en = row.importer_en.strip() if row.importer_en else ""
                 if importer:
                     # 使用 importer_en 或 importer 作为英文名称
                     company_name_en = importer_en if importer_en else importer
-                    companies_set.add((company_name_en, importer))
+                    variant = (company_name_en, importer)
+                    name_counts[variant] += row.shipments
+                    variant_metrics.setdefault(variant, ImporterScore(*variant)).merge(
+                        row.shipments,
+                        float(row.total_usd or 0),
+                        row.last_trade_date,
+                        int(row.hs_matched or 0),
+                    )
 
-            companies = list(companies_set)
+            # 3. 进口商消歧：将同一公司的名称变体合并为一个规范公司，并持久化别名映射
+            known_aliases = await repo.get_company_aliases()
+            resolver = ImporterResolver(
+                threshold=settings.FINDKP_ENTITY_MATCH_THRESHOLD,
+                known_aliases=known_aliases,
+            )
+            clusters = resolver.resolve(name_counts)
+            new_aliases = build_alias_rows(clusters, known_aliases)
+            if new_aliases:
+                await repo.create_company_aliases(new_aliases)
+                logger.info(f"新增 {len(new_aliases)} 条公司别名映射")
+
+            # 4. 价值优先调度：按规范公司合并指标、批量评分并过滤
+            importers = []
+            for cluster in clusters:
+                if len(cluster.variants) > 1:
+                    logger.debug(
+                        f"合并名称变体 -> {cluster.canonical_name_en}: "
+                        f"{[variant[0] for variant in cluster.variants]}"
+                    )
+                importer = ImporterScore(*cluster.canonical)
+                for variant in cluster.variants:
+                    metrics = variant_metrics[variant]
+                    importer.merge(
+                        metrics.shipments,
+                        metrics.total_usd,
+                        metrics.last_trade_date,
+                        metrics.hs_matched,
+                    )
+                importers.append(importer)
+
+            scorer = PriorityScorer(
+                weights=settings.FINDKP_PRIORITY_WEIGHTS,
+                recency_half_life_days=settings.FINDKP_RECENCY_HALF_LIFE_DAYS,
+                hs_match_enabled=bool(settings.FINDKP_TARGET_HS_CODES),
+            )
+            importers = select_importers(
+                scorer.score(importers), top=top, min_usd=min_usd
+            )
+
+            companies = [(i.name_en, i.name_local) for i in importers]
+            scores = {(i.name_en, i.name_local): i for i in importers}
             total_companies = len(companies)
 
             if total_companies == 0:
@@ -122,10 +232,13 @@ async def _run_batch_findkp(verbose: bool = False):
                     "failed_companies": [],
                 }
 
-            logger.info(f"找到 {total_companies} 个去重后的公司")
+            logger.info(
+                f"找到 {len(name_counts)} 个名称变体，消歧后 {len(clusters)} 个公司，"
+                f"按价值优先处理 {total_companies} 个"
+            )
             logger.info("")
 
-            # 3. 统计信息
+            # 5. 统计信息
             stats = {
                 "total": total_companies,
                 "success": 0,
@@ -134,12 +247,15 @@ async def _run_batch_findkp(verbose: bool = False):
                 "failed_companies": [],
             }
 
-            # 4. 逐个处理公司
+            # 6. 按价值分数从高到低逐个处理公司
             for idx, (company_name_en, company_name_local) in enumerate(companies, 1):
                 logger.info("")
                 logger.info("-" * 60)
                 logger.info(f"[{idx}/{total_companies}] 处理公司: {company_name_en}")
                 logger.info(f"  本地名称: {company_name_local}")
+                logger.info(
+                    f"  价值分数: {format_score(scores[(company_name_en, company_name_local)])}"
+                )
 
                 try:
                     # 执行 FindKP
@@ -171,6 +287,9 @@ async def _run_batch_findkp(verbose: bool = False):
                         f"{company_name_en} ({company_name_local})"
                     )
 
+            if service.strong_contacts_llm:
+                stats["cascade"] = service.cascade_stats.summary()
+
             return stats
 
         except Exception as e:
@@ -179,3 +298,7 @@ async def _run_batch_findkp(verbose: bool = False):
             raise
         finally:
             await session.close()
+            await service.aclose()
+            # 写完 Serper 遥测队列和 LLM 用量缓冲区中剩余的记录
+            await close_telemetry_writer()
+            await close_usage_recorder()
@@ -1,6 +1,5 @@
 """Compose and Send CLI 命令 - 撰写邮件并发送"""
 
-import asyncio
 import logging
 import sys
 from typing import Optional
@@ -8,8 +7,10 @@ from typing import Optional
 import click
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.profiling import run_profiled
 from database.connection import AsyncSessionLocal
 from database.repository import Repository
+from llm.usage import close_usage_recorder
 from writer.service import WriterService
 from mail_manager.service import MailManagerService
 from schemas.mail_manager import SendEmailRequest
@@ -34,9 +35,16 @@ logger = logging.getLogger(__name__)
     type=int,
     help="联系人ID（为指定联系人生成并发送邮件）",
 )
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="剖析本次运行（折叠栈写入 logs/profiles/cli，并检测事件循环阻塞）",
+)
 def compose_and_send(
     company_id: Optional[int],
     contact_id: Optional[int],
+    profile: bool,
 ):
     """
     为指定公司或指定联系人撰写邮件内容并发送
@@ -47,6 +55,9 @@ def compose_and_send(
 
         # 为指定联系人生成并发送邮件
         smart-lead compose-and-send --contact-id 123
+
+        # 剖析本次运行
+        smart-lead compose-and-send --company-id 1 --profile
     """
     # 验证参数
     if not company_id and not contact_id:
@@ -76,11 +87,13 @@ def compose_and_send(
         logger.info("")
 
         # 运行异步任务
-        result = asyncio.run(
+        result = run_profiled(
             _run_compose_and_send(
                 company_id=company_id,
                 contact_id=contact_id,
-            )
+            ),
+            "compose-and-send",
+            enabled=profile,
         )
 
         # 输出结果
@@ -313,3 +326,5 @@ async def _run_compose_and_send(
             raise
         finally:
             await session.close()
+            # 写入 LLM 用量缓冲区中剩余的记录
+            await close_usage_recorder()
@@ -8,6 +8,8 @@ from typing import Optional
 import click
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.search.telemetry import close_telemetry_writer
+from llm.usage import close_usage_recorder
 from database.connection import AsyncSessionLocal
 from findkp.service import FindKPService
 
@@ -110,9 +112,9 @@ async def _run_findkp(
     company_name_en: str, company_name_local: str, country: Optional[str]
 ):
     """执行 FindKP 异步任务"""
+    service = FindKPService()
     async with AsyncSessionLocal() as session:
         try:
-            service = FindKPService()
             result = await service.find_kps(company_name_en, company_name_local, country, session)
             await session.commit()
             return result
@@ -122,4 +124,8 @@ async def _run_findkp(
             raise
         finally:
             await session.close()
+            await service.aclose()
+            # 写完 Serper 遥测队列和 LLM 用量缓冲区中剩余的记录
+            await close_telemetry_writer()
+            await close_usage_recorder()
 
@@ -0,0 +1,132 @@
+"""进口商贸易汇总 CLI 命令 - 从 importer_trade_summaries 读取进口商的采购概况"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+import click
+
+from database.connection import read_session
+from database.repository import Repository
+
+# 配置日志格式
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# 详情中每类主要取值显示的数量
+DETAIL_TOP_N = 5
+# 列表中进口商名称的最大显示宽度
+NAME_WIDTH = 60
+
+
+@click.command(name="importer-summary")
+@click.argument("names", nargs=-1)
+@click.option(
+    "--top",
+    type=int,
+    default=20,
+    help="未指定进口商名称时，按美元总额列出前 N 个进口商",
+)
+@click.option(
+    "--min-usd",
+    type=float,
+    default=None,
+    help="列表模式下的美元总额下限",
+)
+def importer_summary(names: Tuple[str, ...], top: int, min_usd: Optional[float]):
+    """
+    进口商贸易汇总报告（出货次数、金额、主要 HS 编码/商品/出口商）
+
+    进口商名称可以是任意写法，内部规范化后查询。
+
+    示例:
+        smart-lead importer-summary "CÔNG TY TNHH ABC VIỆT NAM"
+        smart-lead importer-summary --top 50 --min-usd 100000
+    """
+    try:
+        if names:
+            summaries = asyncio.run(_get_summaries(list(names)))
+        else:
+            summaries = asyncio.run(_get_top_summaries(top, min_usd))
+    except Exception as e:
+        logger.error(f"查询进口商贸易汇总失败: {e}")
+        return 1
+
+    if names:
+        for name, summary in zip(names, summaries):
+            if summary is None:
+                click.echo(f"{name}: 没有贸易汇总记录\n")
+            else:
+                click.echo(format_summary_detail(summary) + "\n")
+    else:
+        click.echo(format_summary_table(summaries))
+    return 0
+
+
+async def _get_summaries(names: List[str]) -> List[Any]:
+    """按名称查询汇总（只读副本，未配置或不可用时为主库）"""
+    async with read_session() as session:
+        repository = Repository(session)
+        return [await repository.get_importer_summary(name) for name in names]
+
+
+async def _get_top_summaries(limit: int, min_usd: Optional[float]) -> List[Any]:
+    """查询美元总额最高的汇总（只读副本，未配置或不可用时为主库）"""
+    async with read_session() as session:
+        return await Repository(session).get_top_importer_summaries(
+            limit=limit, min_usd=min_usd
+        )
+
+
+def _format_date(value: Any) -> str:
+    return value.strftime("%Y-%m-%d") if value else "-"
+
+
+def format_summary_detail(summary: Any) -> str:
+    """格式化单个进口商的汇总详情"""
+    lines = [
+        f"{summary.importer}"
+        + (f" ({summary.importer_en})" if summary.importer_en else ""),
+        f"  出货次数: {summary.shipments}",
+        f"  美元总额: {float(summary.total_usd or 0):,.2f}",
+        f"  总重量: {float(summary.total_weight or 0):,.2f}",
+        f"  交易日期: {_format_date(summary.first_trade_date)} ~ "
+        f"{_format_date(summary.last_trade_date)}",
+    ]
+    for title, values in (
+        ("主要 HS 编码", summary.top_hs_codes),
+        ("主要商品", summary.top_goods),
+        ("主要出口商", summary.top_exporters),
+    ):
+        lines.append(f"  {title}:")
+        for item in (values or [])[:DETAIL_TOP_N]:
+            lines.append(
+                f"    - {item['value']} ({item['shipments']} 次, "
+                f"{item['total_usd']:,.2f} USD)"
+            )
+    if summary.importer_names and len(summary.importer_names) > 1:
+        lines.append(f"  其他写法: {', '.join(summary.importer_names)}")
+    return "\n".join(lines)
+
+
+def format_summary_table(summaries: List[Any]) -> str:
+    """格式化进口商汇总列表"""
+    if not summaries:
+        return "没有进口商贸易汇总记录"
+
+    names = [(summary.importer or "")[:NAME_WIDTH] for summary in summaries]
+    width = max(len("进口商"), *(len(name) for name in names))
+    lines = [
+        f"{'进口商'.ljust(width)}  {'出货':>7}  {'美元总额':>16}  {'最近交易':>10}"
+    ]
+    for name, summary in zip(names, summaries):
+        lines.append(
+            f"{name.ljust(width)}  {summary.shipments:>7}  "
+            f"{float(summary.total_usd or 0):>16,.2f}  "
+            f"{_format_date(summary.last_trade_date):>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""LLM 用量报告 CLI 命令 - 按任务类型、模型、公司统计 token 用量和成本"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from database.connection import read_session
+from database.repository import Repository
+
+# 配置日志格式
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command(name="llm-usage")
+@click.option(
+    "--by",
+    "group_by",
+    type=click.Choice(list(Repository.LLM_USAGE_GROUP_COLUMNS)),
+    multiple=True,
+    help="分组维度（可重复），默认 --by task_type --by model",
+)
+@click.option(
+    "--days",
+    type=float,
+    default=None,
+    help="只统计最近 N 天",
+)
+@click.option(
+    "--limit",
+    type=int,
+    default=20,
+    help="最多显示的行数",
+)
+def llm_usage(group_by: Tuple[str, ...], days: Optional[float], limit: int):
+    """
+    LLM token 用量与成本报告（成本最高的在前）
+
+    示例:
+        smart-lead llm-usage
+        smart-lead llm-usage --by company --days 7
+        smart-lead llm-usage --by task_type --by company --limit 50
+    """
+    group_by = group_by or ("task_type", "model")
+    since = datetime.now() - timedelta(days=days) if days else None
+
+    try:
+        rows = asyncio.run(_run_llm_usage(list(group_by), since, limit))
+    except Exception as e:
+        logger.error(f"查询 LLM 用量失败: {e}")
+        return 1
+
+    click.echo(format_usage_table(rows, list(group_by)))
+    return 0
+
+
+async def _run_llm_usage(
+    group_by: List[str], since: Optional[datetime], limit: int
+) -> List[Dict[str, Any]]:
+    """查询用量报告（只读副本，未配置或不可用时为主库）"""
+    async with read_session() as session:
+        return await Repository(session).get_llm_usage_report(
+            group_by=group_by, since=since, limit=limit
+        )
+
+
+def format_usage_table(rows: List[Dict[str, Any]], group_by: List[str]) -> str:
+    """格式化用量报告表格"""
+    if not rows:
+        return "没有 LLM 用量记录"
+
+    columns = []
+    for name in group_by:
+        if name == "company":
+            columns.extend(["company_id", "company_name"])
+        else:
+            columns.append(name)
+
+    def label(row: Dict[str, Any]) -> List[str]:
+        return ["-" if row.get(name) is None else str(row[name]) for name in columns]
+
+    widths = [
+        max(len(name), *(len(label(row)[index]) for row in rows))
+        for index, name in enumerate(columns)
+    ]
+    header = "  ".join(name.ljust(width) for name, width in zip(columns, widths))
+    lines = [
+        f"{header}  {'调用':>7}  {'估算':>5}  {'输入token':>11}  {'输出token':>11}  "
+        f"{'平均输入':>9}  {'成本USD':>10}"
+    ]
+    for row in rows:
+        keys = "  ".join(value.ljust(width) for value, width in zip(label(row), widths))
+        lines.append(
+            f"{keys}  {row['calls']:>7}  {row['estimated_calls']:>5}  "
+            f"{row['input_tokens']:>11}  {row['output_tokens']:>11}  "
+            f"{row['avg_input_tokens']:>9.0f}  {row['cost_usd']:>10.4f}"
+        )
+    total_cost = sum(row["cost_usd"] for row in rows)
+    total_tokens = sum(row["input_tokens"] + row["output_tokens"] for row in rows)
+    lines.append(f"合计: {total_tokens} token，{total_cost:.4f} USD")
+    return "\n".join(lines)
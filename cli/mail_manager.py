@@ -8,7 +8,7 @@ from typing import Optional
 import click
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import AsyncSessionLocal
+from database.connection import AsyncSessionLocal, read_session
 from mail_manager.service import MailManagerService
 from schemas.mail_manager import SendEmailRequest, SendBatchEmailRequest
 
@@ -272,18 +272,14 @@ def status(email_id: int, verbose: bool):
 
 async def _run_status(email_id: int):
     """执行查询邮件状态异步任务"""
-    async with AsyncSessionLocal() as session:
+    # 只读查询使用只读副本（未配置或不可用时为主库）
+    async with read_session() as session:
         try:
             service = MailManagerService()
-            result = await service.get_email_status(email_id, session)
-            await session.commit()
-            return result
+            return await service.get_email_status(email_id, session)
         except Exception as e:
-            await session.rollback()
             logger.error(f"查询邮件状态流程失败: {e}", exc_info=True)
             raise
-        finally:
-            await session.close()
 
 
 @mail_group.command(name="list")
@@ -376,15 +372,11 @@ def list_emails(status: Optional[str], limit: int, offset: int, verbose: bool):
 
 async def _run_list(status: Optional[str], limit: int, offset: int):
     """执行查询邮件列表异步任务"""
-    async with AsyncSessionLocal() as session:
+    # 只读查询使用只读副本（未配置或不可用时为主库）
+    async with read_session() as session:
         try:
             service = MailManagerService()
-            result = await service.get_emails_list(status, limit, offset, session)
-            await session.commit()
-            return result
+            return await service.get_emails_list(status, limit, offset, session)
         except Exception as e:
-            await session.rollback()
             logger.error(f"查询邮件列表流程失败: {e}", exc_info=True)
             raise
-        finally:
-            await session.close()
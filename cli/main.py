@@ -1,27 +1,89 @@
-"""CLI 主入口"""
+"""CLI 主入口
+
+子命令模块按需导入：执行 smart-lead <命令> 时只导入该命令所在的模块，
+smart-lead --help 不导入任何子命令模块（LangChain、Google API、SQLAlchemy 等）。
+"""
+
+import importlib
+from typing import Dict, List, Optional, Tuple
 
 import click
-from cli.findkp import findkp
-from cli.batch_findkp import batch_findkp
-from cli.writer import writer_group
-from cli.mail_manager import mail_group
-from cli.compose_and_send import compose_and_send
+
+# 子命令: (模块:属性, 简短说明)。简短说明用于 --help 列表，避免为显示帮助而导入模块
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "findkp": ("cli.findkp:findkp", "查找公司的关键联系人(KP)"),
+    "batch-findkp": (
+        "cli.batch_findkp:batch_findkp",
+        "批量从 trade_records 表中查询公司并执行 FindKP 操作",
+    ),
+    "writer": ("cli.writer:writer_group", "Writer 命令组 - 生成营销邮件"),
+    "mail": ("cli.mail_manager:mail_group", "MailManager 命令组 - 邮件发送和追踪"),
+    "compose-and-send": (
+        "cli.compose_and_send:compose_and_send",
+        "为指定公司或指定联系人撰写邮件内容并发送",
+    ),
+    "llm-usage": ("cli.llm_usage:llm_usage", "LLM token 用量与成本报告"),
+    "importer-summary": (
+        "cli.importer_summary:importer_summary",
+        "进口商贸易汇总报告",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """在首次调用子命令时才导入其模块的命令组"""
+
+    def __init__(
+        self,
+        *args,
+        lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_commands:
+            command = self._load(cmd_name)
+        return command
+
+    def _load(self, cmd_name: str) -> click.Command:
+        module_name, attr = self.lazy_commands[cmd_name][0].split(":")
+        command = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{module_name}:{attr} 不是 click 命令")
+        # 缓存到 commands，同一进程内只导入一次
+        self.add_command(command, cmd_name)
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """帮助信息中的命令列表（未加载的命令使用登记的简短说明）"""
+        rows = []
+        for name in self.list_commands(ctx):
+            command = self.commands.get(name)
+            if command is not None:
+                if command.hidden:
+                    continue
+                help_text = command.get_short_help_str(formatter.width)
+            else:
+                help_text = self.lazy_commands[name][1]
+            rows.append((name, help_text))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
 
 
 # 创建主 CLI 组
-@click.group()
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(version="2.0.0")
 def cli():
     """Smart Lead Agent - 自动化潜在客户开发系统"""
     pass
 
 
-# 注册子命令
-cli.add_command(findkp)
-cli.add_command(batch_findkp)
-cli.add_command(writer_group)
-cli.add_command(mail_group)
-cli.add_command(compose_and_send)
-
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,5 @@
 """Writer CLI 命令"""
 
-import asyncio
 import logging
 import sys
 import tempfile
@@ -10,7 +9,9 @@ from typing import Optional
 import click
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.profiling import run_profiled
 from database.connection import AsyncSessionLocal
+from llm.usage import close_usage_recorder
 from writer.service import WriterService
 
 # 配置日志格式
@@ -61,11 +62,18 @@ def writer_group():
     help="显示详细日志输出",
     default=False,
 )
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="剖析本次运行（折叠栈写入 logs/profiles/cli，并检测事件循环阻塞）",
+)
 def generate(
     company_id: Optional[int],
     company_name: Optional[str],
     verbose: bool,
     generator_version: str,
+    profile: bool,
 ):
     """
     根据公司信息生成营销邮件
@@ -73,6 +81,7 @@ def generate(
     示例:
         smart-lead writer generate --company-id 1
         smart-lead writer generate --company-name "Apple Inc."
+        smart-lead writer generate --company-id 1 --profile
     """
     setup_logging(verbose)
 
@@ -93,7 +102,11 @@ def generate(
         logger.info("")
 
         # 运行异步任务
-        result = asyncio.run(_run_generate(company_id, company_name, generator_version))
+        result = run_profiled(
+            _run_generate(company_id, company_name, generator_version),
+            "writer-generate",
+            enabled=profile,
+        )
 
         # 输出结果
         logger.info("")
@@ -185,3 +198,5 @@ async def _run_generate(
             raise
         finally:
             await session.close()
+            # 写入 LLM 用量缓冲区中剩余的记录
+            await close_usage_recorder()
@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from functools import lru_cache
-from typing import Dict
+from typing import Dict, Any, List
 
 # 在模块加载时，显式地从 .env 文件加载环境变量
 # 这确保了无论从哪里启动应用，配置都能被正确加载
@@ -20,12 +20,38 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # 数据库连接池（database/connection.py），API 与批处理使用独立的连接池
+    DB_POOL_SIZE: int = 10  # API 连接池常驻连接数
+    DB_MAX_OVERFLOW: int = 10  # API 连接池允许临时超出的连接数
+    DB_BATCH_POOL_SIZE: int = 5  # 批处理连接池常驻连接数（batch-findkp、贸易数据导入）
+    DB_BATCH_MAX_OVERFLOW: int = 10  # 批处理连接池允许临时超出的连接数
+    # 连接最长使用时间（秒），应小于 MySQL wait_timeout，-1 表示不回收
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0  # 连接池用尽时等待连接的最长时间（秒）
+    DB_POOL_PRE_PING: str = "idle"  # 检出前检测：always（每次）/ idle（空闲后）/ never
+    DB_POOL_PRE_PING_IDLE: float = 30.0  # idle 策略下连接空闲多久（秒）后检出前需要检测
+
+    # 只读副本（可选，DB_REPLICA_HOST 为空时不启用），只读接口、报表和批处理扫描使用
+    DB_REPLICA_HOST: str = ""
+    DB_REPLICA_PORT: int = 0  # 0 表示与 DB_PORT 相同
+    DB_REPLICA_USER: str = ""  # 为空时与 DB_USER 相同
+    DB_REPLICA_PASSWORD: str = ""  # 为空时与 DB_PASSWORD 相同
+    DB_REPLICA_POOL_SIZE: int = 5  # 副本连接池常驻连接数
+    DB_REPLICA_MAX_OVERFLOW: int = 10  # 副本连接池允许临时超出的连接数
+    DB_REPLICA_RETRY_INTERVAL: float = 30.0  # 副本连接失败后回退到主库的时长（秒）
+
     # API 密钥
     SERPER_API_KEY: str
 
     # Google Search API 配置
     GOOGLE_SEARCH_API_KEY: str = ""  # Google Custom Search API Key
     GOOGLE_SEARCH_CX: str = ""  # Google Custom Search Engine ID
+    GOOGLE_SEARCH_MAX_CONCURRENCY: int = 5  # 批量查询的最大并发请求数
+    GOOGLE_SEARCH_DAILY_QUOTA: int = 100  # 每日查询配额（0=不限制）
+    # 配额重置时区（Google 按太平洋时间零点重置，为空时使用本地时间）
+    GOOGLE_SEARCH_QUOTA_TIMEZONE: str = "America/Los_Angeles"
+    GOOGLE_SEARCH_RATE_LIMIT_RETRIES: int = 3  # 短时速率限制（非每日配额）的重试次数
+    GOOGLE_SEARCH_RATE_LIMIT_BACKOFF: float = 2.0  # 重试的初始退避时间（秒），指数增长
 
     # OpenRouter 配置（用于国外 API：OpenAI、Anthropic 等）
     OPENROUTER_API_KEY: str = ""  #
@@ -41,6 +67,65 @@ class Settings(BaseSettings):
     # LangChain 配置
     LLM_MODEL: str = "deepseek-chat"
     LLM_TEMPERATURE: float = 0.0
+    # 按任务类型路由模型（格式: "provider" 或 "provider:model_name"，如 "glm:glm-4-flash"）
+    LLM_EXTRACT_MODEL: str = ""  # 提取类任务模型（便宜/快速），为空时使用 LLM_MODEL
+    LLM_WRITER_MODEL: str = ""  # 写作类任务模型（能力强），为空时使用 LLM_MODEL
+    # 按任务覆盖模型参数（JSON），如:
+    # {"extract_contacts": {"model": "glm:glm-4-flash", "max_tokens": 2048}}
+    LLM_TASK_ROUTES: Dict[str, Dict[str, Any]] = {}
+    # 回放模式（LLM_MODEL="replay" 或 "replay:<归档目录>"）每次调用注入的模拟延迟（秒）
+    LLM_REPLAY_LATENCY: float = 0.0
+    # LLM 用量统计（llm/usage.py），价格单位为美元 / 百万 token，格式 {"模型": [输入, 输出]}
+    # 如: {"deepseek-chat": [0.28, 0.42]}；未配置价格的模型成本记为 0
+    LLM_PRICING: Dict[str, List[float]] = {}
+    LLM_USAGE_ENABLED: bool = True  # 是否把每次调用的用量写入 llm_usage 表
+    LLM_USAGE_BATCH_SIZE: int = 200  # 缓冲多少条用量记录后批量写入
+
+    # FindKP 模块配置
+    FINDKP_MAP_REDUCE_ENABLED: bool = True  # 搜索结果过多时分块并发提取联系人
+    FINDKP_EXTRACT_CHUNK_TOKENS: int = 3000  # 每个分块的搜索结果 token 上限（估算值）
+    FINDKP_EXTRACT_MAX_CONCURRENCY: int = 4  # 分块提取的最大并发 LLM 调用数
+    # 联系人提取级联：先用快速模型（extract_contacts），结果不可靠时升级到强模型
+    # （extract_contacts_strong，未在 LLM_TASK_ROUTES 中配置时使用 LLM_MODEL）
+    # 快速模型与强模型相同（如未配置 LLM_EXTRACT_MODEL）时不启用级联
+    FINDKP_CASCADE_ENABLED: bool = False
+    FINDKP_CASCADE_MIN_CONFIDENCE: float = 0.5  # 最高置信度低于该值时升级
+    # 批量 FindKP 进口商消歧：区分词相同的名称按词计算的相似度达到该值时视为同一公司
+    FINDKP_ENTITY_MATCH_THRESHOLD: float = 0.9
+    # 批量 FindKP 价值优先调度
+    FINDKP_TARGET_HS_CODES: List[str] = []  # 目标产品 HS 编码前缀，如 ["3901", "3902"]
+    FINDKP_PRIORITY_WEIGHTS: Dict[str, float] = {}  # 覆盖默认权重，如 {"usd": 0.5}
+    FINDKP_RECENCY_HALF_LIFE_DAYS: float = 90.0  # 最近交易得分的半衰期（天）
+
+    # 离线回放搜索（core/search/replay_provider.py），设置快照路径后 FindKP 不再调用 Serper
+    SEARCH_REPLAY_SNAPSHOT: str = ""  # 快照文件路径（.json 或 .json.gz）
+    SEARCH_REPLAY_LATENCY: float = 0.0  # 每次请求注入的固定延迟（秒）
+    SEARCH_REPLAY_JITTER: float = 0.0  # 叠加的最大随机延迟（秒）
+
+    # Serper 遥测后台写入配置（core/search/telemetry.py）
+    SERPER_TELEMETRY_QUEUE_SIZE: int = 10000  # 队列最多缓存的查询响应数
+    SERPER_TELEMETRY_BATCH_SIZE: int = 500  # 每次批量写入的查询响应数
+    SERPER_TELEMETRY_FLUSH_INTERVAL: float = 2.0  # 凑批最长等待时间（秒）
+    SERPER_TELEMETRY_DROP_POLICY: str = "drop_newest"  # 队列满时的丢弃策略
+
+    # API 启动预热（main.py lifespan）
+    API_WARMUP_DB_CONNECTIONS: int = 5  # 启动时预先建立的数据库连接数，0 表示不预热
+    API_WARMUP_HTTP: bool = True  # 启动时预先建立搜索提供者的 HTTP 连接
+    API_WARMUP_PRIME_CACHES: bool = True  # 启动时加载分词器等进程内缓存
+    API_WARMUP_TIMEOUT: float = 10.0  # 预热最长等待时间（秒），超时后照常启动
+
+    # 性能剖析（core/profiling.py）
+    PROFILE_SAMPLE_RATE: float = 0.0  # API 请求抽样剖析比例（0-1），0 表示关闭
+    PROFILE_INTERVAL_MS: float = 5.0  # 调用栈采样间隔（毫秒）
+    PROFILE_OUTPUT_DIR: str = ""  # 折叠栈文件目录，为空时使用 logs/profiles
+    # 事件循环阻塞检测阈值（毫秒），API 中 >0 时启用；CLI --profile 未配置时使用 100
+    LOOP_BLOCK_THRESHOLD_MS: float = 0.0
+
+    # 贸易数据导入配置（scripts/make_t_json.py）
+    TRADE_IMPORT_WORKERS: int = 4  # 并行解析文件的进程数
+    TRADE_IMPORT_CHUNK_SIZE: int = 2000  # 每次批量 INSERT 的行数
+    TRADE_IMPORT_WATCH_INTERVAL: float = 30.0  # --watch 模式轮询间隔（秒）
+    TRADE_IMPORT_WATCH_DEBOUNCE: float = 10.0  # 文件最后修改后静默多久才导入（秒）
 
     # Writer 模块配置
     SENDER_NAME: str = ""  # 发送者姓名
@@ -0,0 +1,114 @@
+"""公司名称规范化
+
+海关数据和搜索结果中的公司名称写法不一（越南语声调、大小写、标点、法律形式后缀），
+这里生成与写法无关的匹配键，供进口商消歧（findkp.entity_resolution）
+和进口商贸易汇总（database.trade_summary）共用。
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+# 公司法律形式/类型词（去除声调、小写后匹配），长短语在前
+LEGAL_TERMS = [
+    "cong ty trach nhiem huu han mot thanh vien",
+    "cong ty trach nhiem huu han",
+    "trach nhiem huu han mot thanh vien",
+    "trach nhiem huu han",
+    "cong ty co phan",
+    "cong ty tnhh mtv",
+    "cong ty tnhh",
+    "cong ty cp",
+    "mot thanh vien",
+    "joint stock company",
+    "joint stock co",
+    "limited liability company",
+    "company limited",
+    "co ltd",
+    "coltd",
+    "pte ltd",
+    "sdn bhd",
+    "co phan",
+    "cong ty",
+    "tnhh",
+    "mtv",
+    "jsc",
+    "corporation",
+    "corp",
+    "company",
+    "limited",
+    "ltd",
+    "llc",
+    "inc",
+    "plc",
+    "co",
+]
+
+_LEGAL_TERMS_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in LEGAL_TERMS) + r")\b"
+)
+# 字母数字之间的点和撇号是名称的一部分（"CO.OP" -> "coop"），不作为分隔符
+_INNER_PUNCT_PATTERN = re.compile(r"(?<=[a-z0-9])[.'](?=[a-z0-9])")
+_NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+_VIETNAM_PATTERN = re.compile(r"\bviet nam\b")
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    去除声调和变音符号（越南语 đ/Đ 单独处理）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        只包含基础拉丁字母的文本
+    """
+    text = text.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def company_name_tokens(name: Optional[str]) -> List[str]:
+    """
+    公司名称的词（按原顺序，已去除声调、标点和法律形式词）
+
+    名称只由法律形式词组成时保留这些词，避免返回空列表。
+
+    Args:
+        name: 公司名称
+
+    Returns:
+        词列表（空名称返回空列表）
+    """
+    if not name:
+        return []
+
+    text = _INNER_PUNCT_PATTERN.sub("", fold_diacritics(name).lower())
+    text = _NON_ALNUM_PATTERN.sub(" ", text).strip()
+    text = _VIETNAM_PATTERN.sub("vietnam", text)
+    stripped = _LEGAL_TERMS_PATTERN.sub(" ", text)
+    return stripped.split() or text.split()
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """
+    规范化公司名称，生成用于匹配的键
+
+    处理步骤：去除声调 -> 小写 -> 标点替换为空格（字母间的点除外）
+    -> 统一 "viet nam" 写法 -> 去除法律形式词 -> 词去重并排序。
+
+    Args:
+        name: 公司名称
+
+    Returns:
+        规范化后的名称（空名称返回空字符串）
+
+    Example:
+        >>> normalize_company_name("CÔNG TY TNHH ABC Việt Nam")
+        'abc vietnam'
+        >>> normalize_company_name("ABC VIETNAM CO., LTD")
+        'abc vietnam'
+        >>> normalize_company_name("CO.OP MART")
+        'coop mart'
+    """
+    return " ".join(sorted(set(company_name_tokens(name))))
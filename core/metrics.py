@@ -0,0 +1,454 @@
+"""进程内指标（Prometheus 文本格式）
+
+轻量的计数器、仪表和直方图实现，不依赖 prometheus_client：
+- 阶段耗时直方图、调用/错误计数器和进行中数量仪表，由 span / timed 统一记录
+- 缓存命中计数器，由 record_cache 记录
+- render_prometheus 输出给 /metrics 端点，format_summary 输出给 CLI 批量任务结束时的摘要
+
+使用方法：
+    from core.metrics import span, timed
+
+    @timed("findkp", "search")
+    async def _search(...): ...
+
+    async with span("serper", "search_batch"):
+        ...
+"""
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 秒；覆盖从数据库语句（毫秒级）到 LLM 调用（数十秒）的范围
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """指标基类：按标签值保存样本"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"指标 {self.name} 的标签应为 {self.labelnames}，实际为 {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def _samples(self) -> Iterable[Tuple[str, LabelValues, Tuple[str, ...], float]]:
+        """(名称后缀, 标签值, 额外标签名, 数值)"""
+        pass
+
+    def render(self) -> List[str]:
+        """生成 Prometheus 文本格式的行"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, values, extra_names, value in self._samples():
+            labels = _format_labels(self.labelnames + extra_names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+    @abstractmethod
+    def reset(self) -> None:
+        """清空所有样本"""
+        pass
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self):
+        for values, value in sorted(self.values().items()):
+            yield "", values, (), value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """可增可减的仪表"""
+
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "sum", "max")
+
+    def __init__(self, size: int):
+        self.bucket_counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class Histogram(_Metric):
+    """累积分桶直方图"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.bucket_counts[index] += 1
+                    break
+            series.count += 1
+            series.sum += value
+            series.max = max(series.max, value)
+
+    def series(self) -> Dict[LabelValues, Dict[str, float]]:
+        """
+        每个标签组合的统计
+
+        Returns:
+            {标签值: {"count", "sum", "max", "p50", "p95", "p99"}}，分位数由分桶线性插值估算
+        """
+        with self._lock:
+            snapshot = {
+                key: (list(s.bucket_counts), s.count, s.sum, s.max)
+                for key, s in self._series.items()
+            }
+        return {
+            key: {
+                "count": count,
+                "sum": total,
+                "max": maximum,
+                **{
+                    f"p{q}": self._quantile(q / 100, counts, count, maximum)
+                    for q in (50, 95, 99)
+                },
+            }
+            for key, (counts, count, total, maximum) in snapshot.items()
+        }
+
+    def _quantile(
+        self, q: float, counts: List[int], total: int, maximum: float
+    ) -> float:
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                upper = min(bound, maximum)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        # 落在最大分桶之外
+        return maximum
+
+    def _samples(self):
+        with self._lock:
+            snapshot = sorted(
+                (key, list(s.bucket_counts), s.count, s.sum)
+                for key, s in self._series.items()
+            )
+        for values, counts, count, total in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield "_bucket", values + (_format_value(bound),), ("le",), cumulative
+            yield "_bucket", values + ("+Inf",), ("le",), count
+            yield "_sum", values, (), total
+            yield "_count", values, (), count
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """指标注册表（同名指标只创建一次）"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"指标 {name} 已注册为 {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        """所有指标的 Prometheus 文本格式"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清空所有样本（保留注册的指标）"""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram(
+    "smartlead_stage_duration_seconds",
+    "Stage latency in seconds",
+    ("component", "stage"),
+)
+STAGE_CALLS = registry.counter(
+    "smartlead_stage_calls_total", "Stage calls", ("component", "stage")
+)
+STAGE_ERRORS = registry.counter(
+    "smartlead_stage_errors_total", "Stage errors", ("component", "stage")
+)
+STAGE_IN_FLIGHT = registry.gauge(
+    "smartlead_stage_in_flight", "Stage calls in progress", ("component", "stage")
+)
+CACHE_LOOKUPS = registry.counter(
+    "smartlead_cache_lookups_total", "Cache lookups", ("cache", "result")
+)
+
+
+class span:
+    """
+    记录一个阶段的耗时、调用数、错误数和进行中数量
+
+    同时支持 with 和 async with；块内抛出异常时计入错误数（异常照常抛出）。
+    """
+
+    __slots__ = ("component", "stage", "_start")
+
+    def __init__(self, component: str, stage: str):
+        self.component = component
+        self.stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> "span":
+        STAGE_CALLS.inc(component=self.component, stage=self.stage)
+        STAGE_IN_FLIGHT.inc(component=self.component, stage=self.stage)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self._start
+        STAGE_IN_FLIGHT.dec(component=self.component, stage=self.stage)
+        STAGE_DURATION.observe(elapsed, component=self.component, stage=self.stage)
+        # 取消不算错误
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            STAGE_ERRORS.inc(component=self.component, stage=self.stage)
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+def timed(component: str, stage: Optional[str] = None) -> Callable:
+    """
+    用 span 包装函数（支持同步和异步函数）
+
+    Args:
+        component: 组件名称，例如 "findkp"
+        stage: 阶段名称，默认使用函数名（去掉前导下划线）
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__.lstrip("_")
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(component, name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(component, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_error(component: str, stage: str) -> None:
+    """记录被捕获处理（未抛出）的错误"""
+    STAGE_ERRORS.inc(component=component, stage=stage)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """记录一次缓存查找"""
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_prometheus() -> str:
+    """/metrics 端点的响应内容"""
+    return registry.render()
+
+
+def stage_summary() -> List[Dict[str, object]]:
+    """
+    各阶段的统计摘要
+
+    Returns:
+        按组件和阶段排序的列表，每项包含 component、stage、count、errors、
+        mean_ms、p50_ms、p95_ms、max_ms
+    """
+    errors = STAGE_ERRORS.values()
+    rows = []
+    for (component, stage), stats in sorted(STAGE_DURATION.series().items()):
+        count = stats["count"]
+        rows.append(
+            {
+                "component": component,
+                "stage": stage,
+                "count": count,
+                "errors": int(errors.get((component, stage), 0)),
+                "mean_ms": stats["sum"] / count * 1000 if count else 0.0,
+                "p50_ms": stats["p50"] * 1000,
+                "p95_ms": stats["p95"] * 1000,
+                "max_ms": stats["max"] * 1000,
+            }
+        )
+    return rows
+
+
+def format_summary() -> str:
+    """格式化阶段耗时和缓存命中摘要（CLI 批量任务结束时输出）"""
+    rows = stage_summary()
+    if not rows:
+        return "没有记录到阶段耗时"
+    width = max(len(f"{row['component']}.{row['stage']}") for row in rows)
+    lines = [
+        f"{'阶段':<{width}}  {'次数':>7}  {'错误':>5}  {'平均ms':>9}  "
+        f"{'p50ms':>9}  {'p95ms':>9}  {'最大ms':>9}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['component'] + '.' + row['stage']:<{width}}  {row['count']:>7}  "
+            f"{row['errors']:>5}  {row['mean_ms']:>9.1f}  {row['p50_ms']:>9.1f}  "
+            f"{row['p95_ms']:>9.1f}  {row['max_ms']:>9.1f}"
+        )
+
+    caches: Dict[str, Dict[str, float]] = {}
+    for (cache, result), value in CACHE_LOOKUPS.values().items():
+        caches.setdefault(cache, {})[result] = value
+    for cache, results in sorted(caches.items()):
+        hits, misses = results.get("hit", 0), results.get("miss", 0)
+        ratio = hits / (hits + misses) * 100 if hits + misses else 0.0
+        lines.append(
+            f"缓存 {cache}: 命中 {int(hits)}，未命中 {int(misses)}（命中率 {ratio:.1f}%）"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,359 @@
+"""按需性能剖析
+
+- SamplingProfiler：统计采样剖析器（后台线程定期采样目标线程的调用栈），
+  输出 flamegraph.pl / speedscope 可读取的折叠栈格式（"a;b;c 次数"）
+- ProfilingMiddleware：按 PROFILE_SAMPLE_RATE 抽样剖析 API 请求，每个请求一个折叠栈文件
+  （纯 ASGI 中间件，CLI 导入本模块时不导入 Starlette）
+- LoopBlockDetector：事件循环阻塞检测，心跳协程超过阈值未运行时，
+  由看门狗线程抓取事件循环线程当时的调用栈并记录日志
+- run_profiled：CLI 的 --profile 入口，剖析整个 asyncio.run 并同时检测事件循环阻塞
+
+不依赖第三方剖析器；采样只在启用时进行，未启用时没有额外开销。
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+import logs
+from config import settings
+from core.metrics import registry
+from logs import logger
+
+T = TypeVar("T")
+
+LOOP_BLOCKS = registry.histogram(
+    "smartlead_event_loop_block_seconds",
+    "Event loop stalls longer than the detector threshold",
+)
+
+
+def profile_dir() -> Path:
+    """剖析结果目录（PROFILE_OUTPUT_DIR，默认 logs/profiles）"""
+    if settings.PROFILE_OUTPUT_DIR:
+        return Path(settings.PROFILE_OUTPUT_DIR)
+    return logs.LOGS_DIR / "profiles"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """
+    统计采样剖析器
+
+    后台线程每隔 interval 秒读取一次目标线程的调用栈（sys._current_frames），
+    按折叠栈计数。采样间隔越小越精确，开销也越大（5ms 时通常低于 5%）。
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        初始化剖析器
+
+        Args:
+            interval: 采样间隔（秒）
+            thread_id: 被采样的线程，默认为调用 start 的线程
+        """
+        self.interval = max(interval, 0.0005)
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self.thread_id == own_id:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._sample, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def folded(self) -> str:
+        """折叠栈文本（每行 "栈帧1;栈帧2;... 次数"）"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def write_folded(self, path: Path) -> Path:
+        """写入折叠栈文件（可用 flamegraph.pl 或 speedscope 打开）"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded(), encoding="utf-8")
+        return path
+
+    def top(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """
+        耗时最多的函数
+
+        Returns:
+            按 total 降序的列表，每项包含 function、self（位于栈顶的采样比例）和
+            total（出现在栈中的采样比例）
+        """
+        if not self.samples:
+            return []
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = [frame.rsplit(":", 1)[0] for frame in stack.split(";")]
+            own[frames[-1]] += count
+            for function in set(frames):
+                total[function] += count
+        return [
+            {
+                "function": function,
+                "self": own[function] / self.samples,
+                "total": count / self.samples,
+            }
+            for function, count in total.most_common(limit)
+        ]
+
+    def format_top(self, limit: int = 15) -> str:
+        """格式化耗时最多的函数"""
+        lines = [
+            f"采样 {self.samples} 次，{self.duration:.2f} 秒（间隔 {self.interval * 1000:g}ms）",
+            f"{'total':>7}  {'self':>7}  函数",
+        ]
+        for row in self.top(limit):
+            lines.append(
+                f"{row['total']:>7.1%}  {row['self']:>7.1%}  {row['function']}"
+            )
+        return "\n".join(lines)
+
+
+class LoopBlockDetector:
+    """
+    事件循环阻塞检测器
+
+    心跳协程每隔 interval 秒醒来一次；看门狗线程发现心跳迟到超过 threshold 时，
+    抓取事件循环线程当时的调用栈（即阻塞事件循环的同步代码）。
+    心跳恢复后按实际阻塞时长记录日志和指标。
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: Optional[float] = None):
+        """
+        初始化检测器
+
+        Args:
+            threshold: 报告的最短阻塞时长（秒）
+            interval: 心跳间隔（秒），默认 threshold / 4
+        """
+        self.threshold = threshold
+        self.interval = interval or threshold / 4
+        self.events: List[Dict[str, Any]] = []
+        self._beat = 0.0
+        self._captured_beat = -1.0
+        self._captured_stack: List[str] = []
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._beat - self.interval
+            if lag >= self.threshold:
+                stack = (
+                    self._captured_stack if self._captured_beat == self._beat else []
+                )
+                self._report(lag, stack)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            if beat == self._captured_beat:
+                continue
+            if time.monotonic() - beat - self.interval < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            self._captured_stack = [
+                f"{summary.filename}:{summary.lineno} {summary.name}"
+                for summary in traceback.extract_stack(frame)[-12:]
+            ]
+            self._captured_beat = beat
+
+    def _report(self, lag: float, stack: List[str]) -> None:
+        LOOP_BLOCKS.observe(lag)
+        self.events.append({"duration": lag, "stack": stack})
+        location = "\n    ".join(stack) if stack else "（未抓取到调用栈）"
+        logger.warning(
+            f"事件循环被阻塞 {lag * 1000:.0f}ms（阈值 {self.threshold * 1000:.0f}ms），"
+            f"阻塞时的调用栈:\n    {location}"
+        )
+
+    def start(self) -> "LoopBlockDetector":
+        """在当前事件循环中启动（需在协程中调用）"""
+        loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-block-detector", daemon=True
+        )
+        self._watchdog.start()
+        return self
+
+    async def stop(self) -> None:
+        """停止检测"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def summary(self) -> str:
+        """阻塞事件汇总"""
+        if not self.events:
+            return f"未发现超过 {self.threshold * 1000:.0f}ms 的事件循环阻塞"
+        durations = [event["duration"] for event in self.events]
+        return (
+            f"事件循环阻塞 {len(durations)} 次，累计 {sum(durations):.2f} 秒，"
+            f"最长 {max(durations) * 1000:.0f}ms"
+        )
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+def _interval() -> float:
+    return settings.PROFILE_INTERVAL_MS / 1000
+
+
+def _loop_block_threshold() -> float:
+    """CLI 剖析时的阻塞阈值（LOOP_BLOCK_THRESHOLD_MS 未配置时为 100ms）"""
+    return (settings.LOOP_BLOCK_THRESHOLD_MS or 100.0) / 1000
+
+
+async def _run_monitored(coro: Awaitable[T], detector: LoopBlockDetector) -> T:
+    detector.start()
+    try:
+        return await coro
+    finally:
+        await detector.stop()
+
+
+def run_profiled(coro: Awaitable[T], name: str, enabled: bool = True) -> T:
+    """
+    执行 asyncio.run(coro)，启用时同时剖析并检测事件循环阻塞
+
+    结束时把折叠栈写入 <剖析目录>/cli/<name>_<时间>.folded，
+    并在日志中输出耗时最多的函数和阻塞汇总。
+
+    Args:
+        coro: CLI 命令的主协程
+        name: 命令名称（用于文件名）
+        enabled: 是否启用剖析（--profile）
+    """
+    if not enabled:
+        return asyncio.run(coro)
+
+    detector = LoopBlockDetector(_loop_block_threshold())
+    profiler = SamplingProfiler(_interval())
+    try:
+        with profiler:
+            return asyncio.run(_run_monitored(coro, detector))
+    finally:
+        path = profiler.write_folded(
+            profile_dir() / "cli" / f"{name}_{_timestamp()}.folded"
+        )
+        logger.info(
+            f"剖析结果已保存: {path}\n{profiler.format_top()}\n{detector.summary()}"
+        )
+
+
+class ProfilingMiddleware:
+    """
+    API 请求抽样剖析中间件（ASGI）
+
+    按 sample_rate 抽样请求，在请求处理期间采样事件循环线程，
+    结果写入 <剖析目录>/api/<时间>_<方法>_<路径>.folded。
+    同一时间只剖析一个请求（事件循环线程是共享的，并发请求的采样会互相混入）。
+    """
+
+    def __init__(self, app, sample_rate: float, interval: float = 0.005):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._active = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or self._active
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profiler = SamplingProfiler(self.interval).start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            self._active = False
+            slug = scope["path"].strip("/").replace("/", "_") or "root"
+            path = (
+                profile_dir()
+                / "api"
+                / f"{_timestamp()}_{scope['method']}_{slug}.folded"
+            )
+            try:
+                profiler.write_folded(path)
+                logger.info(
+                    f"请求剖析已保存: {path}（{profiler.duration * 1000:.0f}ms，"
+                    f"{profiler.samples} 次采样）"
+                )
+            except OSError as e:
+                logger.error(f"保存请求剖析失败: {e}")
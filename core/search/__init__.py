@@ -6,9 +6,11 @@
 from core.search.base import BaseSearchProvider
 from core.search.serper_provider import SerperSearchProvider
 from core.search.google_provider import GoogleSearchProvider
+from core.search.replay_provider import ReplaySearchProvider
 
 __all__ = [
     "BaseSearchProvider",
     "SerperSearchProvider",
     "GoogleSearchProvider",
+    "ReplaySearchProvider",
 ]
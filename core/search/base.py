@@ -42,3 +42,13 @@ class BaseSearchProvider(ABC):
             格式：{"query1": [SearchResult, ...], "query2": [SearchResult, ...]}
         """
         pass
+
+    async def warmup(self) -> None:
+        """
+        预先建立到提供者的网络连接（API 启动时调用）
+
+        默认不做任何事；使用共享 HTTP 客户端的提供者重写该方法。
+        """
+
+    async def aclose(self) -> None:
+        """释放提供者持有的资源（如共享 HTTP 客户端），默认不做任何事"""
@@ -2,24 +2,97 @@
 
 import httpx
 import asyncio
+from datetime import date, datetime
 from typing import List, Dict, Any, Optional
-from urllib.parse import urlencode
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from core.search.base import BaseSearchProvider
 from core.schemas import SearchResult
 from config import settings
 from logs import logger
 
 
+class DailyQuotaTracker:
+    """
+    每日配额跟踪器（进程内）
+
+    Google Custom Search API 每天有固定的查询配额，超出后请求会返回 429。
+    在本地计数，配额用尽后直接跳过请求，避免无效调用；
+    配额按太平洋时间零点重置（与 Google 一致），日期变化时自动重置。
+    """
+
+    def __init__(self, daily_limit: int, timezone: str = "America/Los_Angeles"):
+        """
+        初始化配额跟踪器
+
+        Args:
+            daily_limit: 每日配额（0 表示不限制）
+            timezone: 配额重置所在的时区（IANA 名称，为空时使用本地时间）
+        """
+        self.daily_limit = daily_limit
+        self.tz: Optional[ZoneInfo] = None
+        if timezone:
+            try:
+                self.tz = ZoneInfo(timezone)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"未知的配额时区 {timezone}，使用本地时间")
+        self._day = self._today()
+        self._used = 0
+        self._exhausted = False
+
+    def _today(self) -> date:
+        """配额时区的当前日期"""
+        return datetime.now(self.tz).date() if self.tz else date.today()
+
+    def _reset_if_new_day(self) -> None:
+        """日期变化时重置计数"""
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._exhausted = False
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """今日剩余配额，不限制时返回 None"""
+        self._reset_if_new_day()
+        if self._exhausted:
+            return 0
+        if self.daily_limit <= 0:
+            return None
+        return max(self.daily_limit - self._used, 0)
+
+    def try_acquire(self) -> bool:
+        """
+        尝试占用一次配额
+
+        Returns:
+            是否占用成功（配额已用尽时返回 False）
+        """
+        remaining = self.remaining
+        if remaining == 0:
+            return False
+        self._used += 1
+        return True
+
+    def mark_exhausted(self) -> None:
+        """标记今日配额已用尽（收到 API 的配额超限响应时调用）"""
+        self._reset_if_new_day()
+        self._exhausted = True
+
+
 class GoogleSearchProvider(BaseSearchProvider):
     """
     Google Custom Search API 提供者实现。
-    支持单个查询和批量查询，批量查询时并发执行多个单个查询。
+    支持单个查询和批量查询，批量查询时在并发上限内执行多个单个查询，
+    复用同一个连接池，并受每日配额限制。
     """
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         cx: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        daily_quota: Optional[int] = None,
     ):
         """
         初始化 Google 搜索提供者。
@@ -27,22 +100,146 @@ class GoogleSearchProvider(BaseSearchProvider):
         Args:
             api_key: Google Custom Search API Key，如果为 None 则使用配置中的 GOOGLE_SEARCH_API_KEY
             cx: Google Custom Search Engine ID，如果为 None 则使用配置中的 GOOGLE_SEARCH_CX
+            max_concurrency: 批量查询的最大并发数，默认使用 GOOGLE_SEARCH_MAX_CONCURRENCY
+            daily_quota: 每日查询配额，默认使用 GOOGLE_SEARCH_DAILY_QUOTA
         """
         self.api_key = api_key or settings.GOOGLE_SEARCH_API_KEY
         self.cx = cx or settings.GOOGLE_SEARCH_CX
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.timeout = 30.0
+        self.max_concurrency = max(
+            1, max_concurrency or settings.GOOGLE_SEARCH_MAX_CONCURRENCY
+        )
+        self.quota = DailyQuotaTracker(
+            (
+                daily_quota
+                if daily_quota is not None
+                else settings.GOOGLE_SEARCH_DAILY_QUOTA
+            ),
+            settings.GOOGLE_SEARCH_QUOTA_TIMEZONE,
+        )
+        self.rate_limit_retries = max(0, settings.GOOGLE_SEARCH_RATE_LIMIT_RETRIES)
+        self.rate_limit_backoff = settings.GOOGLE_SEARCH_RATE_LIMIT_BACKOFF
+        # 延迟创建的共享 HTTP 客户端（连接池）
+        self._client: Optional[httpx.AsyncClient] = None
 
         if not self.api_key:
             logger.warning("Google Search API Key 未配置")
         if not self.cx:
             logger.warning("Google Search CX (搜索引擎 ID) 未配置")
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享的 HTTP 客户端（首次调用时创建，连接数与并发上限一致）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭共享的 HTTP 客户端"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def warmup(self) -> None:
+        """预先建立到 Google Custom Search 的连接（HEAD 请求不计入配额）"""
+        if not self.api_key or not self.cx:
+            return
+        try:
+            await self._get_client().head(self.base_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Google Search 连接预热失败: {e}")
+
+    @staticmethod
+    def _is_daily_quota_error(response: httpx.Response) -> bool:
+        """
+        429 响应是否为每日配额用尽（否则为每分钟等短时速率限制）
+
+        每日配额：errors[].reason 为 dailyLimitExceeded，
+        或 rateLimitExceeded 且错误信息/详情中的配额限制是按天计算的（"per day"、"PerDay"）。
+        """
+        try:
+            error = response.json().get("error", {})
+        except ValueError:
+            return False
+        if not isinstance(error, dict):
+            return False
+        reasons = {
+            item.get("reason")
+            for item in error.get("errors") or []
+            if isinstance(item, dict)
+        }
+        if "dailyLimitExceeded" in reasons:
+            return True
+        details = " ".join(
+            str(value)
+            for detail in error.get("details") or []
+            if isinstance(detail, dict)
+            for value in (detail.get("metadata") or {}).values()
+        )
+        text = f"{error.get('message', '')} {details}".lower()
+        return "per day" in text or "perday" in text
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """速率限制后的等待时间（优先使用 Retry-After，否则指数退避）"""
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return self.rate_limit_backoff * (2**attempt)
+
+    @staticmethod
+    def _build_params(
+        query: str,
+        num: int = 10,
+        start: int = 1,
+        gl: Optional[str] = None,
+        hl: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        构建 Google Custom Search 查询参数（不含 key/cx）
+
+        Serper 参数转换：
+        - gl（国家代码）→ gl（结果地域加权）
+        - hl（语言代码）→ hl（界面语言）+ lr=lang_xx（限定结果语言）
+        - location 在 Custom Search 中没有对应参数，忽略
+
+        Args:
+            query: 搜索查询字符串
+            num: 返回结果数量，最大 10
+            start: 起始索引
+            gl: 国家代码（如 "vn"）
+            hl: 语言代码（如 "vi"）
+
+        Returns:
+            查询参数字典
+        """
+        params: Dict[str, Any] = {
+            "q": query,
+            "num": min(num, 10),  # Google API 限制最多 10 条
+            "start": start,
+        }
+        if gl:
+            params["gl"] = gl.lower()
+        if hl:
+            params["hl"] = hl
+            params["lr"] = f"lang_{hl.split('-')[0].lower()}"
+        return params
+
     async def search(
         self,
         query: str,
         num: int = 10,
         start: int = 1,
+        gl: Optional[str] = None,
+        hl: Optional[str] = None,
         **kwargs,
     ) -> List[SearchResult]:
         """
@@ -52,6 +249,8 @@ class GoogleSearchProvider(BaseSearchProvider):
             query: 搜索查询字符串
             num: 返回结果数量，默认 10，最大 10
             start: 起始索引，默认 1
+            gl: 国家代码（可选）
+            hl: 语言代码（可选）
             **kwargs: 其他参数
 
         Returns:
@@ -61,37 +260,64 @@ class GoogleSearchProvider(BaseSearchProvider):
             logger.error("Google Search API Key 或 CX 未配置，无法执行搜索")
             return []
 
+        if not self.quota.try_acquire():
+            logger.warning(f"Google Search 今日配额已用尽，跳过查询: '{query}'")
+            return []
+
         params = {
-            "q": query,
+            **self._build_params(query, num=num, start=start, gl=gl, hl=hl),
             "key": self.api_key,
             "cx": self.cx,
-            "num": min(num, 10),  # Google API 限制最多 10 条
-            "start": start,
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}?{urlencode(params)}"
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-
-                items = data.get("items", [])
-                results = [
-                    SearchResult(
-                        title=item.get("title", ""),
-                        link=item.get("link", ""),
-                        snippet=item.get("snippet", ""),
-                    )
-                    for item in items
-                ]
+            attempt = 0
+            while True:
+                response = await self._get_client().get(self.base_url, params=params)
+                if (
+                    response.status_code != 429
+                    or attempt >= self.rate_limit_retries
+                    or self._is_daily_quota_error(response)
+                ):
+                    break
+                # 短时速率限制：退避后重试（不占用额外的每日配额）
+                delay = self._retry_delay(response, attempt)
+                attempt += 1
+                logger.warning(
+                    f"Google Search API 速率限制，{delay:.1f}秒后重试"
+                    f"（第 {attempt}/{self.rate_limit_retries} 次）: '{query}'"
+                )
+                await asyncio.sleep(delay)
+            response.raise_for_status()
+            data = response.json()
 
-                logger.info(
-                    f"Google Search 查询完成: '{query}', 返回 {len(results)} 条结果"
+            items = data.get("items", [])
+            results = [
+                SearchResult(
+                    title=item.get("title", ""),
+                    link=item.get("link", ""),
+                    snippet=item.get("snippet", ""),
                 )
-                return results
+                for item in items
+            ]
+
+            logger.info(
+                f"Google Search 查询完成: '{query}', 返回 {len(results)} 条结果"
+            )
+            return results
 
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                if self._is_daily_quota_error(e.response):
+                    # 每日配额用尽：后续查询直接跳过，直到配额重置
+                    self.quota.mark_exhausted()
+                    logger.warning("Google Search API 每日配额已用尽，今日不再发送请求")
+                else:
+                    logger.warning(
+                        f"Google Search API 速率限制，重试 {self.rate_limit_retries} 次后"
+                        f"仍失败，跳过查询: '{query}'"
+                    )
+                return []
             logger.error(
                 f"Google Search API HTTP 错误: {e.response.status_code} - {e.response.text}"
             )
@@ -108,37 +334,43 @@ class GoogleSearchProvider(BaseSearchProvider):
     ) -> Dict[str, List[SearchResult]]:
         """
         批量执行多个搜索查询。
-        Google Search API 不支持批量查询，因此使用并发执行多个单个查询。
+        Google Search API 不支持批量查询，因此在并发上限内执行多个单个查询。
+        查询参数兼容 Serper 格式（q/gl/hl/location/page），会自动转换。
 
         Args:
             queries: 查询参数字典列表，每个字典包含查询相关的参数
-                   例如：[{"q": "query1", "num": 10}, {"q": "query2", "num": 5}]
+                   例如：[{"q": "query1", "num": 10}, {"q": "query2", "gl": "vn"}]
 
         Returns:
             Dict[str, List[SearchResult]]: 查询到搜索结果的映射
             格式：{"query1": [SearchResult, ...], "query2": [SearchResult, ...]}
             其中 key 是查询字符串（q 参数的值）
         """
-
-        return {}
         if not queries:
             return {}
 
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_query(query_params: Dict[str, Any]) -> List[SearchResult]:
+            # Serper 的 page 参数转换为 Google 的 start 索引
+            page = query_params.get("page", 1) or 1
+            start = query_params.get("start", (page - 1) * 10 + 1)
+            async with semaphore:
+                return await self.search(
+                    query=query_params.get("q", "query"),
+                    num=query_params.get("num", 10),
+                    start=start,
+                    gl=query_params.get("gl"),
+                    hl=query_params.get("hl"),
+                )
+
         # 提取查询字符串和参数
         tasks = []
         query_keys = []
 
         for query_params in queries:
-            query_key = query_params.get("q", "query")
-            query_keys.append(query_key)
-
-            # 创建单个查询任务
-            task = self.search(
-                query=query_key,
-                num=query_params.get("num", 10),
-                start=query_params.get("start", 1),
-            )
-            tasks.append(task)
+            query_keys.append(query_params.get("q", "query"))
+            tasks.append(run_query(query_params))
 
         # 并发执行所有查询
         try:
@@ -157,7 +389,8 @@ class GoogleSearchProvider(BaseSearchProvider):
 
             logger.info(
                 f"Google Search 批量搜索完成: {len(queries)} 个查询, "
-                f"共返回 {sum(len(v) for v in result_map.values())} 条结果"
+                f"共返回 {sum(len(v) for v in result_map.values())} 条结果, "
+                f"今日剩余配额: {self.quota.remaining}"
             )
 
             return result_map
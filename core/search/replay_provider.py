@@ -0,0 +1,231 @@
+"""离线回放搜索提供者
+
+使用 serper_responses / serper_organic_results 中记录的真实查询和结果
+（或从这些表导出的快照文件）响应 search / search_batch，不调用付费 API。
+查询按规范化后的查询字符串建立索引；可注入固定延迟和随机抖动，
+用于离线、可复现地对完整 FindKP 流程做基准测试和性能分析。
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.metrics import record_cache
+from core.schemas import SearchResult
+from core.search.base import BaseSearchProvider
+from logs import logger
+
+SNAPSHOT_VERSION = 1
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """
+    规范化查询字符串（忽略大小写和多余空白）
+
+    Args:
+        query: 原始查询
+
+    Returns:
+        用于索引查找的查询键
+    """
+    return _WHITESPACE_PATTERN.sub(" ", (query or "").casefold()).strip()
+
+
+def _open_snapshot(path: Path, mode: str):
+    """按扩展名打开快照文件（.gz 使用 gzip 压缩）"""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ReplaySearchProvider(BaseSearchProvider):
+    """
+    回放已记录 Serper 数据的搜索提供者
+
+    未记录的查询返回空结果并计入 misses（与真实 API 无结果时的行为一致）。
+    """
+
+    def __init__(
+        self,
+        index: Dict[str, List[Dict[str, str]]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        初始化回放提供者
+
+        Args:
+            index: {规范化查询: [{"title", "link", "snippet"}, ...]}
+            latency: 每次请求注入的固定延迟（秒）
+            jitter: 在固定延迟上叠加的最大随机延迟（秒）
+            seed: 随机抖动的种子（固定后延迟序列可复现）
+        """
+        self.index = index
+        self.latency = max(latency, 0.0)
+        self.jitter = max(jitter, 0.0)
+        self._random = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    async def from_database(
+        cls, db: AsyncSession, limit: Optional[int] = None, **kwargs
+    ) -> "ReplaySearchProvider":
+        """
+        从 serper_responses / serper_organic_results 构建索引
+
+        同一查询记录了多次时使用最近一次有结果的记录。
+
+        Args:
+            db: 异步数据库会话
+            limit: 最多读取的响应记录数（最近的优先），None 表示全部
+            **kwargs: 传给构造函数的其他参数（latency、jitter、seed）
+
+        Returns:
+            回放提供者
+        """
+        from database.repository import Repository
+
+        rows = await Repository(db).get_serper_replay_rows(limit)
+
+        recordings: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            recording = recordings.setdefault(row.trace_id, {"q": row.q, "results": []})
+            if row.link is not None:
+                recording["results"].append(
+                    {
+                        "title": row.title or "",
+                        "link": row.link,
+                        "snippet": row.snippet or "",
+                    }
+                )
+
+        # 记录按时间升序，后出现的覆盖先出现的（空结果不覆盖已有结果）
+        index: Dict[str, List[Dict[str, str]]] = {}
+        for recording in recordings.values():
+            key = normalize_query(recording["q"])
+            if key and (recording["results"] or key not in index):
+                index[key] = recording["results"]
+
+        logger.info(f"回放索引已构建: {len(index)} 个查询（{len(recordings)} 条响应）")
+        return cls(index, **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path], **kwargs) -> "ReplaySearchProvider":
+        """
+        从快照文件加载索引
+
+        Args:
+            path: 快照文件路径（.json 或 .json.gz）
+            **kwargs: 传给构造函数的其他参数（latency、jitter、seed）
+
+        Returns:
+            回放提供者
+        """
+        path = Path(path)
+        with _open_snapshot(path, "r") as f:
+            data = json.load(f)
+        version = data.get("version")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"不支持的快照版本: {version}（{path}）")
+        index = {
+            normalize_query(query): results
+            for query, results in data.get("queries", {}).items()
+        }
+        logger.info(f"已加载回放快照 {path}: {len(index)} 个查询")
+        return cls(index, **kwargs)
+
+    def save_snapshot(self, path: Union[str, Path]) -> int:
+        """
+        导出当前索引为快照文件
+
+        Args:
+            path: 快照文件路径（.gz 结尾时压缩）
+
+        Returns:
+            导出的查询数量
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _open_snapshot(path, "w") as f:
+            json.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "queries": dict(sorted(self.index.items())),
+                },
+                f,
+                ensure_ascii=False,
+            )
+        return len(self.index)
+
+    async def _simulate_latency(self) -> None:
+        """注入一次请求的延迟"""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0.0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _lookup(self, query: str) -> List[SearchResult]:
+        """查找查询的记录结果"""
+        recorded = self.index.get(normalize_query(query))
+        if recorded is None:
+            self.misses += 1
+            record_cache("search_replay", hit=False)
+            logger.debug(f"回放未命中: {query}")
+            return []
+        self.hits += 1
+        record_cache("search_replay", hit=True)
+        results = []
+        for item in recorded:
+            try:
+                results.append(SearchResult(**item))
+            except ValidationError:
+                # 跳过无法通过校验的记录（如无效链接）
+                continue
+        return results
+
+    async def search(self, query: str, **kwargs) -> List[SearchResult]:
+        """
+        回放单个查询
+
+        Args:
+            query: 搜索查询字符串
+            **kwargs: 其他搜索参数（忽略）
+
+        Returns:
+            记录的搜索结果列表
+        """
+        await self._simulate_latency()
+        return self._lookup(query)
+
+    async def search_batch(
+        self, queries: List[Dict[str, Any]], db: Optional[AsyncSession] = None
+    ) -> Dict[str, List[SearchResult]]:
+        """
+        回放批量查询（整批只注入一次延迟，与一次批量 HTTP 请求对应）
+
+        Args:
+            queries: 查询参数字典列表
+            db: 兼容 SerperSearchProvider 的参数（忽略）
+
+        Returns:
+            查询字符串到搜索结果的映射
+        """
+        if not queries:
+            return {}
+        await self._simulate_latency()
+        return {
+            query.get("q", f"query_{idx}"): self._lookup(query.get("q", ""))
+            for idx, query in enumerate(queries)
+        }
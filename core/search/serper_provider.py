@@ -4,7 +4,9 @@ import uuid
 import httpx
 from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.metrics import record_error, timed
 from core.search.base import BaseSearchProvider
+from core.search.telemetry import get_telemetry_writer
 from core.schemas import SearchResult
 from config import settings
 from logs import logger
@@ -17,7 +19,10 @@ class SerperSearchProvider(BaseSearchProvider):
     """
 
     def __init__(
-        self, api_key: Optional[str] = None, db: Optional[AsyncSession] = None
+        self,
+        api_key: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         初始化 Serper 搜索提供者。
@@ -25,11 +30,36 @@ class SerperSearchProvider(BaseSearchProvider):
         Args:
             api_key: Serper API Key，如果为 None 则使用配置中的 SERPER_API_KEY
             db: 可选的数据库会话，用于记录请求和响应数据
+            transport: 可选的 httpx 传输层（基准测试中使用 httpx.MockTransport 代替网络）
         """
         self.api_key = api_key or settings.SERPER_API_KEY
         self.base_url = "https://google.serper.dev/search"
         self.timeout = 30.0
         self.db = db
+        self.transport = transport
+        # 延迟创建的共享 HTTP 客户端（连接池，复用 TLS 连接）
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取共享的 HTTP 客户端（首次调用时创建）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭共享的 HTTP 客户端"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def warmup(self) -> None:
+        """预先建立到 Serper 的连接（HEAD 请求不消耗搜索额度，响应状态不重要）"""
+        try:
+            await self._get_client().head(self.base_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Serper 连接预热失败: {e}")
 
     async def search(
         self,
@@ -83,6 +113,7 @@ class SerperSearchProvider(BaseSearchProvider):
         query_key = query_params.get("q", query)
         return results.get(query_key, [])
 
+    @timed("serper", "search_batch")
     async def search_batch(
         self, queries: List[Dict[str, Any]], db: Optional[AsyncSession] = None
     ) -> Dict[str, List[SearchResult]]:
@@ -93,7 +124,8 @@ class SerperSearchProvider(BaseSearchProvider):
         Args:
             queries: 查询参数字典列表，每个字典包含查询相关的参数
                    例如：[{"q": "query1", "gl": "vn"}, {"q": "query2", "hl": "vi"}]
-            db: 可选的数据库会话，用于记录请求和响应数据
+            db: 可选的数据库会话；传入时记录请求和响应数据
+                （由后台写入器使用独立会话写入，不使用该会话）
 
         Returns:
             Dict[str, List[SearchResult]]: 查询到搜索结果的映射
@@ -114,105 +146,58 @@ class SerperSearchProvider(BaseSearchProvider):
             trace_id = str(uuid.uuid4())
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {
-                    "X-API-KEY": self.api_key,
-                    "Content-Type": "application/json",
-                }
-
-                # 根据 Serper API 文档：
-                # - 单个查询：发送单个对象，返回单个对象（包含 searchParameters、organic、credits）
-                # - 批量查询：发送对象数组，返回对象数组
-                # httpx 的 json 参数会自动序列化 Python 对象（dict/list），无需手动 json.dumps()
-                if len(queries) == 1:
-                    # 单个查询：发送单个字典对象
-                    response = await client.post(
-                        self.base_url,
-                        headers=headers,
-                        json=queries[0],  # httpx 会自动序列化为 JSON
-                    )
-                else:
-                    # 批量查询：发送列表（数组）
-                    response = await client.post(
-                        self.base_url,
-                        headers=headers,
-                        json=queries,  # httpx 会自动序列化为 JSON 数组
-                    )
-
-                response.raise_for_status()
-                response_data = response.json()
-
-                # 记录响应数据到数据库（如果有 db 会话）
-                if db_session and trace_id:
-                    try:
-                        from database.repository import Repository
-
-                        repository = Repository(db_session)
-
-                        # 处理响应：根据返回格式判断是数组还是单个对象
-                        if isinstance(response_data, list):
-                            # 批量查询返回数组，每个元素对应一个查询的结果
-                            # 每个元素格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
-                            # 注意：一个 HTTP 请求对应一个 traceid，但可以为每个查询结果创建独立的响应记录
-                            for idx, query_result in enumerate(response_data):
-                                # 为每个查询结果生成独立的 traceid（因为它们对应不同的查询）
-                                current_trace_id = (
-                                    str(uuid.uuid4()) if idx > 0 else trace_id
-                                )
-
-                                # 记录响应参数
-                                await repository.create_serper_response(
-                                    current_trace_id, query_result, auto_commit=False
-                                )
-
-                                # 记录搜索结果
-                                organic_results = query_result.get("organic", [])
-                                if organic_results:
-                                    await repository.create_serper_organic_results(
-                                        current_trace_id,
-                                        organic_results,
-                                        auto_commit=False,
-                                    )
-                        else:
-                            # 单个查询返回对象，包含 searchParameters、organic、credits 等字段
-                            # 格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
-                            # 记录响应参数
-                            await repository.create_serper_response(
-                                trace_id, response_data, auto_commit=False
-                            )
-
-                            # 记录搜索结果
-                            organic_results = response_data.get("organic", [])
-                            if organic_results:
-                                await repository.create_serper_organic_results(
-                                    trace_id, organic_results, auto_commit=False
-                                )
-                    except Exception as e:
-                        # 记录失败不影响主流程
-                        logger.error(
-                            f"记录 Serper API 响应数据失败: {e}", exc_info=True
-                        )
+            client = self._get_client()
+            headers = {
+                "X-API-KEY": self.api_key,
+                "Content-Type": "application/json",
+            }
+
+            # 根据 Serper API 文档：
+            # - 单个查询：发送单个对象，返回单个对象（包含 searchParameters、organic、credits）
+            # - 批量查询：发送对象数组，返回对象数组
+            # httpx 的 json 参数会自动序列化 Python 对象（dict/list），无需手动 json.dumps()
+            if len(queries) == 1:
+                # 单个查询：发送单个字典对象
+                response = await client.post(
+                    self.base_url,
+                    headers=headers,
+                    json=queries[0],  # httpx 会自动序列化为 JSON
+                )
+            else:
+                # 批量查询：发送列表（数组）
+                response = await client.post(
+                    self.base_url,
+                    headers=headers,
+                    json=queries,  # httpx 会自动序列化为 JSON 数组
+                )
 
-                # 处理响应：根据返回格式判断是数组还是单个对象
-                if isinstance(response_data, list):
-                    # 批量查询返回数组，每个元素对应一个查询的结果
-                    # 每个元素格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
-                    for idx, query_result in enumerate(response_data):
-                        query_key = queries[idx].get("q", f"query_{idx}")
-                        organic_results = query_result.get("organic", [])
-                        result_map[query_key] = [
-                            SearchResult(
-                                title=item.get("title", ""),
-                                link=item.get("link", ""),
-                                snippet=item.get("snippet", ""),
+            response.raise_for_status()
+            response_data = response.json()
+
+            # 遥测数据放入后台写入队列（如果有 db 会话），不在搜索路径上写数据库
+            if db_session and trace_id:
+                try:
+                    writer = get_telemetry_writer()
+                    if isinstance(response_data, list):
+                        # 批量查询返回数组，每个查询结果使用独立的 traceid
+                        for idx, query_result in enumerate(response_data):
+                            current_trace_id = (
+                                str(uuid.uuid4()) if idx > 0 else trace_id
                             )
-                            for item in organic_results
-                        ]
-                else:
-                    # 单个查询返回对象，包含 searchParameters、organic、credits 等字段
-                    # 格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
-                    query_key = queries[0].get("q", "query")
-                    organic_results = response_data.get("organic", [])
+                            await writer.submit(current_trace_id, query_result)
+                    else:
+                        await writer.submit(trace_id, response_data)
+                except Exception as e:
+                    # 记录失败不影响主流程
+                    logger.error(f"提交 Serper API 遥测数据失败: {e}", exc_info=True)
+
+            # 处理响应：根据返回格式判断是数组还是单个对象
+            if isinstance(response_data, list):
+                # 批量查询返回数组，每个元素对应一个查询的结果
+                # 每个元素格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
+                for idx, query_result in enumerate(response_data):
+                    query_key = queries[idx].get("q", f"query_{idx}")
+                    organic_results = query_result.get("organic", [])
                     result_map[query_key] = [
                         SearchResult(
                             title=item.get("title", ""),
@@ -221,13 +206,27 @@ class SerperSearchProvider(BaseSearchProvider):
                         )
                         for item in organic_results
                     ]
+            else:
+                # 单个查询返回对象，包含 searchParameters、organic、credits 等字段
+                # 格式：{"searchParameters": {...}, "organic": [...], "credits": 1}
+                query_key = queries[0].get("q", "query")
+                organic_results = response_data.get("organic", [])
+                result_map[query_key] = [
+                    SearchResult(
+                        title=item.get("title", ""),
+                        link=item.get("link", ""),
+                        snippet=item.get("snippet", ""),
+                    )
+                    for item in organic_results
+                ]
 
-                logger.info(
-                    f"Serper 批量搜索完成: {len(queries)} 个查询, "
-                    f"共返回 {sum(len(v) for v in result_map.values())} 条结果"
-                )
+            logger.info(
+                f"Serper 批量搜索完成: {len(queries)} 个查询, "
+                f"共返回 {sum(len(v) for v in result_map.values())} 条结果"
+            )
 
         except httpx.HTTPStatusError as e:
+            record_error("serper", "search_batch")
             logger.error(
                 f"Serper API HTTP 错误: {e.response.status_code} - {e.response.text}"
             )
@@ -236,12 +235,14 @@ class SerperSearchProvider(BaseSearchProvider):
                 query_key = query.get("q", "query")
                 result_map[query_key] = []
         except httpx.TimeoutException:
+            record_error("serper", "search_batch")
             logger.error(f"Serper API 请求超时: {self.timeout}秒")
             # 初始化所有查询的结果为空列表
             for query in queries:
                 query_key = query.get("q", "query")
                 result_map[query_key] = []
         except Exception as e:
+            record_error("serper", "search_batch")
             logger.error(f"Serper API 调用失败: {e}", exc_info=True)
             # 初始化所有查询的结果为空列表
             for query in queries:
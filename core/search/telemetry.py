@@ -0,0 +1,281 @@
+"""Serper 请求/响应遥测的后台批量写入
+
+搜索完成后只把遥测数据放入有界内存队列，由后台任务使用独立的数据库会话
+批量写入 serper_responses 和 serper_organic_results（多行 INSERT），
+搜索延迟不受数据库速度影响，也不会与调用方并发使用同一个会话。
+
+队列满时按丢弃策略处理：
+- drop_newest：丢弃新提交的记录（默认）
+- drop_oldest：丢弃队列中最早的记录
+- block：等待队列有空位（会把数据库速度传导回搜索路径）
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from core.metrics import registry, span
+from logs import logger
+
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+# 队列元素：(serper_responses 行, serper_organic_results 行列表)
+TelemetryRecord = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+TELEMETRY_RECORDS = registry.counter(
+    "smartlead_serper_telemetry_records_total",
+    "Serper telemetry records by outcome",
+    ("result",),
+)
+TELEMETRY_QUEUE_DEPTH = registry.gauge(
+    "smartlead_serper_telemetry_queue_depth", "Serper telemetry records waiting"
+)
+
+
+def build_telemetry_record(
+    trace_id: str, response_data: Dict[str, Any]
+) -> TelemetryRecord:
+    """
+    把一次查询的 Serper 响应转换为待写入的行数据
+
+    Args:
+        trace_id: UUID traceid
+        response_data: 单个查询的响应（包含 searchParameters、organic、credits）
+
+    Returns:
+        (响应行, 搜索结果行列表)
+    """
+    search_params = response_data.get("searchParameters") or {}
+    response_row = {
+        "trace_id": trace_id,
+        "q": search_params.get("q"),
+        "type": search_params.get("type"),
+        "gl": search_params.get("gl"),
+        "hl": search_params.get("hl"),
+        "location": search_params.get("location"),
+        "tbs": search_params.get("tbs"),
+        "engine": search_params.get("engine"),
+        "credits": response_data.get("credits"),
+    }
+    organic_rows = [
+        {
+            "trace_id": trace_id,
+            "position": item.get("position"),
+            "title": item.get("title", ""),
+            "link": item.get("link", ""),
+            "snippet": item.get("snippet", ""),
+            "date": item.get("date"),
+        }
+        for item in response_data.get("organic") or []
+    ]
+    return response_row, organic_rows
+
+
+class SerperTelemetryWriter:
+    """Serper 遥测后台写入器"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        drop_policy: str = "drop_newest",
+    ):
+        """
+        初始化写入器
+
+        Args:
+            session_factory: 异步会话工厂，默认使用 database.connection.AsyncSessionLocal
+            max_queue_size: 队列最多缓存的查询响应数
+            batch_size: 每次写入的最多查询响应数
+            flush_interval: 凑批的最长等待时间（秒）
+            drop_policy: 队列满时的处理策略（drop_newest / drop_oldest / block）
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f"无效的丢弃策略: {drop_policy}，可选值: {', '.join(DROP_POLICIES)}"
+            )
+        self.session_factory = session_factory
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        """在当前事件循环中启动后台任务（事件循环变化时重新创建队列）"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, trace_id: str, response_data: Dict[str, Any]) -> bool:
+        """
+        提交一个查询响应（除 block 策略外不会等待）
+
+        Args:
+            trace_id: UUID traceid
+            response_data: 单个查询的响应
+
+        Returns:
+            是否已放入队列（被丢弃时返回 False）
+        """
+        queue = self._ensure_started()
+        record = build_telemetry_record(trace_id, response_data)
+        self.submitted += 1
+        TELEMETRY_RECORDS.inc(result="submitted")
+
+        if self.drop_policy == "block":
+            await queue.put(record)
+            TELEMETRY_QUEUE_DEPTH.set(queue.qsize())
+            return True
+
+        try:
+            queue.put_nowait(record)
+            TELEMETRY_QUEUE_DEPTH.set(queue.qsize())
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += 1
+        TELEMETRY_RECORDS.inc(result="dropped")
+        if self.drop_policy == "drop_oldest":
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(record)
+            accepted = True
+        else:
+            accepted = False
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(
+                f"Serper 遥测队列已满（{self.max_queue_size}），"
+                f"策略 {self.drop_policy}，累计丢弃 {self.dropped} 条"
+            )
+        return accepted
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[TelemetryRecord]:
+        """等待第一条记录，然后在 flush_interval 内凑满一批"""
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_batch(self, batch: List[TelemetryRecord]) -> None:
+        """使用独立会话批量写入一批记录（失败只记录日志）"""
+        from database.repository import Repository
+
+        session_factory = self.session_factory
+        if session_factory is None:
+            from database.connection import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+
+        responses = [response_row for response_row, _ in batch]
+        organic_results = [row for _, rows in batch for row in rows]
+        try:
+            async with span("serper_telemetry", "write_batch"):
+                async with session_factory() as session:
+                    await Repository(session).bulk_insert_serper_telemetry(
+                        responses, organic_results
+                    )
+            self.written += len(batch)
+            TELEMETRY_RECORDS.inc(len(batch), result="written")
+        except Exception as e:
+            self.failed += len(batch)
+            TELEMETRY_RECORDS.inc(len(batch), result="failed")
+            logger.error(f"写入 Serper 遥测失败（{len(batch)} 条）: {e}")
+
+    async def _run(self) -> None:
+        """后台写入循环"""
+        queue = self._queue
+        while True:
+            batch = await self._next_batch(queue)
+            TELEMETRY_QUEUE_DEPTH.set(queue.qsize())
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self) -> None:
+        """等待队列中已提交的记录全部写入"""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        if self._task is None or self._task.done():
+            self._ensure_started()
+        await self._queue.join()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        写入剩余记录并停止后台任务
+
+        Args:
+            timeout: 等待剩余记录写入的最长时间（秒）
+        """
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Serper 遥测未能在 {timeout} 秒内写完，剩余 {self._queue.qsize()} 条"
+            )
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.debug(
+            f"Serper 遥测写入器已关闭: 提交 {self.submitted}，写入 {self.written}，"
+            f"丢弃 {self.dropped}，失败 {self.failed}"
+        )
+
+
+_writer: Optional[SerperTelemetryWriter] = None
+
+
+def get_telemetry_writer() -> SerperTelemetryWriter:
+    """获取进程内共享的遥测写入器（按配置创建）"""
+    global _writer
+    if _writer is None:
+        _writer = SerperTelemetryWriter(
+            max_queue_size=settings.SERPER_TELEMETRY_QUEUE_SIZE,
+            batch_size=settings.SERPER_TELEMETRY_BATCH_SIZE,
+            flush_interval=settings.SERPER_TELEMETRY_FLUSH_INTERVAL,
+            drop_policy=settings.SERPER_TELEMETRY_DROP_POLICY,
+        )
+    return _writer
+
+
+async def close_telemetry_writer() -> None:
+    """关闭共享的遥测写入器（进程或事件循环退出前调用）"""
+    if _writer is not None:
+        await _writer.close()
@@ -1,8 +1,23 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
 from config import settings
+from core.metrics import registry
+from database.pool import InstrumentedQueuePool, configure_pool_events
+from logs import logger
+
+READ_ROUTING = registry.counter(
+    "smartlead_db_read_sessions_total",
+    "Read-only sessions by target (replica, primary, primary_fallback)",
+    ("target",),
+)
 
 # 构建异步数据库连接URL（使用 aiomysql）
 DATABASE_URL = (
@@ -10,13 +25,93 @@ DATABASE_URL = (
     f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 )
 
-# 创建异步数据库引擎
-# pool_pre_ping=True: 在每次从连接池中获取连接时，发送一个简单的 "ping" 查询，
-# 以检查连接是否仍然有效。这有助于处理数据库服务器重启或网络问题导致的连接断开。
-engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
+# 只读副本连接URL（DB_REPLICA_HOST 为空时不启用；端口、用户、密码未配置时与主库相同）
+REPLICA_DATABASE_URL = (
+    f"mysql+aiomysql://{settings.DB_REPLICA_USER or settings.DB_USER}:"
+    f"{settings.DB_REPLICA_PASSWORD or settings.DB_PASSWORD}@"
+    f"{settings.DB_REPLICA_HOST}:{settings.DB_REPLICA_PORT or settings.DB_PORT}/"
+    f"{settings.DB_NAME}"
+    if settings.DB_REPLICA_HOST
+    else ""
+)
+
+
+def create_pooled_engine(
+    name: str, pool_size: int, max_overflow: int, url: str = DATABASE_URL
+) -> AsyncEngine:
+    """
+    创建带连接池指标的异步数据库引擎
+
+    pool_recycle、pool_timeout 和检出前检测策略（DB_POOL_PRE_PING）所有连接池共用：
+    - always：每次检出都 ping 一次（每个会话多一次往返）
+    - idle：只 ping 空闲超过 DB_POOL_PRE_PING_IDLE 秒的连接，处理数据库重启或网络断开
+    - never：不 ping，依赖 pool_recycle 在 MySQL wait_timeout 之前回收连接
+
+    Args:
+        name: 连接池名称（指标的 engine 标签）
+        pool_size: 常驻连接数
+        max_overflow: 允许临时超出 pool_size 的连接数
+        url: 数据库连接URL，默认为主库
+
+    Raises:
+        ValueError: DB_POOL_PRE_PING 不是 always / idle / never
+    """
+    pooled_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "always",
+    )
+    configure_pool_events(
+        pooled_engine,
+        name,
+        settings.DB_POOL_PRE_PING,
+        settings.DB_POOL_PRE_PING_IDLE,
+    )
+    return pooled_engine
+
+
+# API 请求和交互式命令使用的引擎
+engine = create_pooled_engine("api", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+# 批处理（batch-findkp、贸易数据导入）使用的独立连接池，长时间运行的批处理不会占满 API 的连接
+batch_engine = create_pooled_engine(
+    "batch", settings.DB_BATCH_POOL_SIZE, settings.DB_BATCH_MAX_OVERFLOW
+)
+
+# 只读副本（可选）：只读接口、报表和批处理的大范围扫描使用，不与主库的写入竞争
+replica_engine: Optional[AsyncEngine] = (
+    create_pooled_engine(
+        "replica",
+        settings.DB_REPLICA_POOL_SIZE,
+        settings.DB_REPLICA_MAX_OVERFLOW,
+        url=REPLICA_DATABASE_URL,
+    )
+    if REPLICA_DATABASE_URL
+    else None
+)
+
+# 所有引擎（连接池状态汇总和关闭时使用）
+ENGINES: Dict[str, AsyncEngine] = {"api": engine, "batch": batch_engine}
+if replica_engine is not None:
+    ENGINES["replica"] = replica_engine
 
 # 创建异步会话工厂
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+BatchSessionLocal = sessionmaker(
+    batch_engine, class_=AsyncSession, expire_on_commit=False
+)
+ReplicaSessionLocal = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+# 只读副本连接失败后，在该时间（time.monotonic）之前直接使用主库
+_replica_down_until = 0.0
 
 # 创建一个Base类，我们定义的ORM模型将继承这个类
 Base = declarative_base()
@@ -39,3 +134,118 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+async def _open_replica_session() -> Optional[AsyncSession]:
+    """
+    打开只读副本会话并立即建立连接
+
+    副本不可用时返回 None，并在 DB_REPLICA_RETRY_INTERVAL 秒内不再尝试。
+    """
+    global _replica_down_until
+    if ReplicaSessionLocal is None or time.monotonic() < _replica_down_until:
+        return None
+
+    session = ReplicaSessionLocal()
+    try:
+        await session.connection()
+    except (exc.DBAPIError, exc.TimeoutError, OSError) as e:
+        await session.close()
+        _replica_down_until = time.monotonic() + settings.DB_REPLICA_RETRY_INTERVAL
+        logger.warning(
+            f"只读副本不可用，{settings.DB_REPLICA_RETRY_INTERVAL:g} 秒内回退到主库: {e}"
+        )
+        return None
+    return session
+
+
+@asynccontextmanager
+async def read_session(
+    fallback: sessionmaker = AsyncSessionLocal,
+) -> AsyncIterator[AsyncSession]:
+    """
+    只读查询的会话（不提交）
+
+    配置了只读副本（DB_REPLICA_HOST）且可连接时使用副本，否则使用 fallback 指向的主库连接池。
+    副本存在复制延迟，刚写入的数据可能还读不到；需要读到自己写入的数据时使用主库会话。
+
+    Args:
+        fallback: 未配置副本或副本不可用时使用的会话工厂（批处理传入 BatchSessionLocal）
+    """
+    session = await _open_replica_session()
+    if session is not None:
+        READ_ROUTING.inc(target="replica")
+    else:
+        READ_ROUTING.inc(
+            target="primary" if replica_engine is None else "primary_fallback"
+        )
+        session = fallback()
+    async with session:
+        yield session
+
+
+async def get_read_db():
+    """
+    FastAPI 依赖项，用于只读接口的数据库会话（只读副本，不可用时回退到主库）
+
+    会话不提交，请求结束时关闭（回滚只读事务）。
+    """
+    async with read_session() as session:
+        yield session
+
+
+async def get_replica_db():
+    """
+    FastAPI 依赖项，只读副本会话；未配置副本或副本不可用时为 None
+
+    用于同时依赖 get_db 的接口：没有副本时直接用主库会话读取，
+    同一请求不会检出第二个主库连接。会话不提交，请求结束时关闭。
+    """
+    session = await _open_replica_session()
+    if session is None:
+        READ_ROUTING.inc(
+            target="primary" if replica_engine is None else "primary_fallback"
+        )
+        yield None
+        return
+    READ_ROUTING.inc(target="replica")
+    async with session:
+        yield session
+
+
+async def warm_up_pool(connections: int) -> int:
+    """
+    预先建立数据库连接并放回连接池，避免第一批请求承担建立连接的延迟
+
+    同时检出 connections 个 API 连接（不超过 DB_POOL_SIZE，超出的连接归还时会被关闭），
+    各执行一次 SELECT 1 后归还。
+
+    Args:
+        connections: 预先建立的连接数
+
+    Returns:
+        成功建立的连接数
+    """
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+
+    async def open_connection():
+        conn = await engine.connect()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        logger.warning(f"数据库连接预热失败 {len(errors)} 个: {errors[0]}")
+    return len(opened)
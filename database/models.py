@@ -77,6 +77,20 @@ class Contact(Base):
     company = relationship("Company", back_populates="contacts")
 
 
+class CompanyAlias(Base):
+    """公司别名映射表模型 - FindKP 板块（进口商名称变体 -> 规范公司）"""
+
+    __tablename__ = "company_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alias_key = Column(
+        String(255), unique=True, nullable=False, index=True, comment="规范化名称"
+    )
+    canonical_name_en = Column(String(512), nullable=False, comment="规范英文名称")
+    canonical_name_local = Column(String(512), comment="规范本地名称")
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
 class SerperResponse(Base):
     """Serper API 响应参数表模型"""
 
@@ -111,6 +125,27 @@ class SerperOrganicResult(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
 
 
+class LLMUsage(Base):
+    """LLM 调用用量表模型（每次调用一行，报告按任务类型、模型、公司聚合）"""
+
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_type = Column(String(64), nullable=False, comment="任务类型")
+    model = Column(String(128), nullable=False, comment="模型名称")
+    company_id = Column(Integer, index=True, comment="关联公司ID")
+    contact_id = Column(Integer, comment="关联联系人ID")
+    input_tokens = Column(Integer, default=0, comment="输入 token 数")
+    output_tokens = Column(Integer, default=0, comment="输出 token 数")
+    usage_source = Column(
+        String(16),
+        nullable=False,
+        comment="用量来源（provider=接口返回，estimated=本地估算）",
+    )
+    cost_usd = Column(DECIMAL(12, 6), default=0, comment="估算成本（美元）")
+    created_at = Column(TIMESTAMP, server_default=func.now(), index=True)
+
+
 class TradeRecord(Base):
     """贸易记录表模型"""
 
@@ -118,6 +153,9 @@ class TradeRecord(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     trade_id = Column(String(64), index=True, comment="贸易ID")
+    dedup_key = Column(
+        String(64), unique=True, comment="去重键(trade_id，缺失时为内容哈希)"
+    )
     trade_date = Column(DateTime, index=True, comment="贸易日期")
 
     # 进口商信息
@@ -179,6 +217,31 @@ class TradeRecord(Base):
     )
 
 
+class ImporterTradeSummary(Base):
+    """进口商贸易汇总表模型（按规范化进口商名称预聚合 trade_records）"""
+
+    __tablename__ = "importer_trade_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    importer_key = Column(
+        String(255), unique=True, nullable=False, index=True, comment="规范化进口商名称"
+    )
+    importer = Column(String(512), comment="进口商名称（出货最多的写法）")
+    importer_en = Column(String(512), comment="进口商英文名称")
+    importer_names = Column(JSON, comment="进口商名称的所有写法(JSON数组)")
+    shipments = Column(Integer, default=0, index=True, comment="出货次数")
+    total_usd = Column(DECIMAL(18, 2), default=0, index=True, comment="美元总额")
+    total_weight = Column(DECIMAL(18, 4), default=0, comment="总重量")
+    top_hs_codes = Column(JSON, comment="主要 HS 编码(JSON数组)")
+    top_goods = Column(JSON, comment="主要商品描述(JSON数组)")
+    top_exporters = Column(JSON, comment="主要出口商(JSON数组)")
+    first_trade_date = Column(DateTime, comment="首次交易日期")
+    last_trade_date = Column(DateTime, index=True, comment="最近交易日期")
+    updated_at = Column(
+        TIMESTAMP, server_default=func.now(), onupdate=func.current_timestamp()
+    )
+
+
 class ProcessedFile(Base):
     """已处理文件记录表模型"""
 
@@ -189,6 +252,8 @@ class ProcessedFile(Base):
         String(512), unique=True, nullable=False, index=True, comment="文件路径"
     )
     file_size = Column(BigInteger, comment="文件大小(字节)")
+    file_mtime_ns = Column(BigInteger, comment="文件修改时间(纳秒时间戳)")
+    content_hash = Column(String(64), index=True, comment="文件内容哈希(SHA-256)")
     processed_at = Column(
         TIMESTAMP, server_default=func.now(), index=True, comment="处理时间"
     )
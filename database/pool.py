@@ -0,0 +1,192 @@
+"""数据库连接池配置与指标
+
+- InstrumentedQueuePool：记录检出耗时（包括等待空闲连接、新建连接和检出前检测）和等待超时
+- configure_pool_events：检出前检测策略（always / idle / never）
+- pool_status / format_pool_status：各连接池的当前状态（批处理结束时输出）
+"""
+
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.metrics import registry
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+# 检出通常在 1ms 以内，分桶从 0.5ms 开始
+CHECKOUT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+POOL_CHECKOUT_SECONDS = registry.histogram(
+    "smartlead_db_pool_checkout_seconds",
+    "Time to check a connection out of the pool (wait, connect and pre-ping)",
+    ("engine",),
+    buckets=CHECKOUT_BUCKETS,
+)
+POOL_TIMEOUTS = registry.counter(
+    "smartlead_db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ("engine",),
+)
+POOL_PINGS = registry.counter(
+    "smartlead_db_pool_pings_total",
+    "Pre-checkout pings by result",
+    ("engine", "result"),
+)
+POOL_IN_USE = registry.gauge(
+    "smartlead_db_pool_connections_in_use",
+    "Connections currently checked out",
+    ("engine",),
+)
+POOL_UTILIZATION = registry.gauge(
+    "smartlead_db_pool_utilization",
+    "Checked-out connections divided by pool_size + max_overflow",
+    ("engine",),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """记录检出耗时和等待超时的连接池（metrics_name 作为指标的 engine 标签）"""
+
+    metrics_name = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(engine=self.metrics_name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(
+                time.perf_counter() - start, engine=self.metrics_name
+            )
+            update_usage(self)
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        update_usage(self)
+
+    def recreate(self):
+        # engine.dispose() 会重建连接池，保留指标名称
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def pool_capacity(pool: Any) -> int:
+    """连接池最多能同时检出的连接数（max_overflow 为 -1 时不限制，按 pool_size 计算）"""
+    return pool.size() + max(pool._max_overflow, 0)
+
+
+def update_usage(pool: Any) -> None:
+    """更新连接池使用中连接数和使用率指标"""
+    in_use = pool.checkedout()
+    capacity = pool_capacity(pool)
+    name = getattr(pool, "metrics_name", "default")
+    POOL_IN_USE.set(in_use, engine=name)
+    POOL_UTILIZATION.set(in_use / capacity if capacity else 0.0, engine=name)
+
+
+def configure_pool_events(
+    engine: AsyncEngine, name: str, pre_ping: str, idle_threshold: float
+) -> None:
+    """
+    为引擎的连接池设置指标名称和检出前检测策略
+
+    Args:
+        engine: 异步引擎（poolclass 为 InstrumentedQueuePool）
+        name: 指标的 engine 标签
+        pre_ping: always 由 SQLAlchemy 在每次检出时检测（需在创建引擎时设置 pool_pre_ping）；
+                  idle 只检测空闲超过 idle_threshold 秒的连接，连续使用的连接不增加往返；
+                  never 不检测（依赖 pool_recycle 回收连接）
+        idle_threshold: idle 策略的空闲阈值（秒）
+
+    Raises:
+        ValueError: 不支持的检测策略
+    """
+    if pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(
+            f"不支持的 DB_POOL_PRE_PING: {pre_ping}，可选 {', '.join(PRE_PING_STRATEGIES)}"
+        )
+    engine.pool.metrics_name = name
+    sync_engine = engine.sync_engine
+
+    if pre_ping != "idle":
+        return
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_checkin = connection_record.info.get("last_checkin")
+        if last_checkin is None or time.monotonic() - last_checkin < idle_threshold:
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # 连接已失效：连接池会丢弃该连接并重新检出
+            POOL_PINGS.inc(engine=name, result="disconnected")
+            raise exc.DisconnectionError(f"连接空闲后检测失败: {e}") from e
+        POOL_PINGS.inc(engine=name, result="ok")
+
+
+def pool_status(engines: Dict[str, AsyncEngine]) -> List[Dict[str, Any]]:
+    """
+    各连接池的当前状态
+
+    Returns:
+        每个引擎一项：engine、size、checked_out、overflow、capacity、utilization、
+        checkouts、checkout_p95_ms、timeouts
+    """
+    checkouts = POOL_CHECKOUT_SECONDS.series()
+    rows = []
+    for name, engine in engines.items():
+        pool = engine.pool
+        capacity = pool_capacity(pool)
+        in_use = pool.checkedout()
+        series = checkouts.get((name,), {})
+        rows.append(
+            {
+                "engine": name,
+                "size": pool.size(),
+                "checked_out": in_use,
+                "overflow": max(pool.overflow(), 0),
+                "capacity": capacity,
+                "utilization": in_use / capacity if capacity else 0.0,
+                "checkouts": int(series.get("count", 0)),
+                "checkout_p95_ms": series.get("p95", 0.0) * 1000,
+                "timeouts": int(POOL_TIMEOUTS.get(engine=name)),
+            }
+        )
+    return rows
+
+
+def format_pool_status(engines: Dict[str, AsyncEngine]) -> str:
+    """格式化连接池状态（每个引擎一行）"""
+    return "\n".join(
+        f"连接池 {row['engine']}: 使用中 {row['checked_out']}/{row['capacity']} "
+        f"({row['utilization']:.0%}), 检出 {row['checkouts']} 次, "
+        f"p95 {row['checkout_p95_ms']:.1f}ms, 超时 {row['timeouts']} 次"
+        for row in pool_status(engines)
+    )
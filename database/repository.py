@@ -1,10 +1,22 @@
+import hashlib
+import json
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List, Dict, Any
+from sqlalchemy import select, insert, delete, update, bindparam, func, case, or_
+from sqlalchemy import exc
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List, Dict, Any, Iterable, AsyncIterator
 
 from . import models
+from core.company_names import normalize_company_name
 from schemas.contact import KPInfo
+from logs import logger
+
+# 只由个别行引起的错误（约束冲突、数据超长/类型错误），可以二分定位坏行；
+# 连接断开、死锁等整个连接或事务级别的错误直接抛出
+ROW_LEVEL_ERRORS = (exc.IntegrityError, exc.DataError)
 
 
 class Repository:
@@ -70,6 +82,34 @@ class Repository:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _build_contact_row(contact_info: KPInfo, company_id: int) -> Dict[str, Any]:
+        """
+        将 KPInfo 转换为 contacts 表的行数据（用于 Core 批量插入）
+
+        Args:
+            contact_info: 联系人信息
+            company_id: 公司ID
+
+        Returns:
+            行数据字典
+        """
+        return {
+            "company_id": company_id,
+            "full_name": contact_info.full_name,
+            "email": contact_info.email,  # 可以为 None
+            "role": contact_info.role,
+            "department": contact_info.department,
+            "linkedin_url": (
+                str(contact_info.linkedin_url) if contact_info.linkedin_url else None
+            ),
+            "twitter_url": (
+                str(contact_info.twitter_url) if contact_info.twitter_url else None
+            ),
+            "source": contact_info.source,
+            "confidence_score": contact_info.confidence_score,
+        }
+
     async def create_contact(
         self, contact_info: KPInfo, company_id: int
     ) -> models.Contact:
@@ -78,92 +118,119 @@ class Repository:
 
         注意：email 可以为空，允许存储没有邮箱的联系人
         """
-        contact = models.Contact(
-            company_id=company_id,
-            full_name=contact_info.full_name,
-            email=contact_info.email,  # 可以为 None
-            role=contact_info.role,
-            department=contact_info.department,
-            linkedin_url=(
-                str(contact_info.linkedin_url) if contact_info.linkedin_url else None
-            ),
-            twitter_url=(
-                str(contact_info.twitter_url) if contact_info.twitter_url else None
-            ),
-            source=contact_info.source,
-            confidence_score=contact_info.confidence_score,
-        )
+        contact = models.Contact(**self._build_contact_row(contact_info, company_id))
         self.db.add(contact)
         await self.db.commit()
         await self.db.refresh(contact)
         return contact
 
-    async def create_contacts_batch(
-        self, contacts_info: List[KPInfo], company_id: int
-    ) -> List[models.Contact]:
+    async def _insert_contact_rows(
+        self, rows: List[Dict[str, Any]]
+    ) -> List[Optional[int]]:
         """
-        批量创建联系人记录 - FindKP 板块（异步版本）
+        使用 Core INSERT 批量插入联系人行（单次往返）
+
+        驱动支持 INSERT ... RETURNING 时（SQLite、MariaDB 等）返回新记录的 ID；
+        MySQL 不支持 RETURNING，此时发送一条多行 INSERT，返回的 ID 为 None。
 
         Args:
-            contacts_info: 联系人信息列表
-            company_id: 公司ID
+            rows: 行数据列表
 
         Returns:
-            创建的联系人列表
-
-        注意：email 可以为空，允许存储没有邮箱的联系人
+            与 rows 顺序一致的 ID 列表
         """
-        contacts = []
-        for contact_info in contacts_info:
-            contact = models.Contact(
-                company_id=company_id,
-                full_name=contact_info.full_name,
-                email=contact_info.email,  # 可以为 None
-                role=contact_info.role,
-                department=contact_info.department,
-                linkedin_url=(
-                    str(contact_info.linkedin_url)
-                    if contact_info.linkedin_url
-                    else None
-                ),
-                twitter_url=(
-                    str(contact_info.twitter_url) if contact_info.twitter_url else None
+        dialect = self.db.get_bind().dialect
+        if dialect.insert_returning and dialect.use_insertmanyvalues:
+            result = await self.db.execute(
+                insert(models.Contact).returning(
+                    models.Contact.id, sort_by_parameter_order=True
                 ),
-                source=contact_info.source,
-                confidence_score=contact_info.confidence_score,
+                rows,
             )
-            self.db.add(contact)
-            contacts.append(contact)
+            return list(result.scalars().all())
 
-        # 批量提交
-        await self.db.commit()
+        await self.db.execute(insert(models.Contact).values(rows))
+        return [None] * len(rows)
 
-        # 刷新所有对象
-        for contact in contacts:
-            await self.db.refresh(contact)
+    async def _insert_contact_rows_isolating_errors(
+        self, rows: List[Dict[str, Any]]
+    ) -> Dict[int, Optional[int]]:
+        """
+        批量插入失败时二分定位坏行：每一半在独立的 SAVEPOINT 中插入，
+        失败则继续拆分，直到单行失败时跳过该行。只有坏行会被丢弃。
+        只隔离行级错误（ROW_LEVEL_ERRORS），其他错误（连接断开、死锁等）直接抛出。
 
-        return contacts
+        Args:
+            rows: 行数据列表
 
-    async def get_all_contacts_with_email_by_company(
-        self, company_id: int
+        Returns:
+            {行在 rows 中的下标: 新记录 ID} 的映射（只包含插入成功的行）
+        """
+        inserted: Dict[int, Optional[int]] = {}
+        pending = [(0, rows)]
+
+        while pending:
+            offset, batch = pending.pop(0)
+            try:
+                async with self.db.begin_nested():
+                    ids = await self._insert_contact_rows(batch)
+                for idx, contact_id in enumerate(ids):
+                    inserted[offset + idx] = contact_id
+            except ROW_LEVEL_ERRORS as e:
+                if len(batch) == 1:
+                    logger.error(f"保存联系人失败，跳过: {e}, 数据: {batch[0]}")
+                    continue
+                mid = len(batch) // 2
+                pending.append((offset, batch[:mid]))
+                pending.append((offset + mid, batch[mid:]))
+
+        return inserted
+
+    async def create_contacts_batch(
+        self,
+        contacts_info: List[KPInfo],
+        company_id: int,
+        isolate_errors: bool = True,
     ) -> List[models.Contact]:
         """
-        获取指定公司的所有有邮箱的联系人（异步版本）
+        批量创建联系人记录 - FindKP 板块（异步版本）
+
+        使用 Core 层批量 INSERT，整批联系人只需一次 INSERT 和一次提交，
+        不再逐行 refresh。整批插入因行级错误失败时（如某一行超长、违反约束），
+        二分定位并跳过坏行，其余联系人照常保存；连接或事务级别的错误直接抛出。
 
         Args:
+            contacts_info: 联系人信息列表
             company_id: 公司ID
+            isolate_errors: 批量插入因行级错误失败时是否隔离坏行（False 则直接抛出异常）
 
         Returns:
-            有邮箱的联系人列表
+            保存成功的联系人列表（按输入顺序）。返回的对象未加入会话，
+            驱动支持 RETURNING 时带有 id，否则 id 为 None
+
+        注意：email 可以为空，允许存储没有邮箱的联系人
         """
-        result = await self.db.execute(
-            select(models.Contact).filter(
-                models.Contact.company_id == company_id,
-                models.Contact.email.isnot(None),
-                models.Contact.email != "",
-            )
-        )
-        return result.scalars().all()
+        rows = [self._build_contact_row(info, company_id) for info in contacts_info]
+        if not rows:
+            return []
+
+        try:
+            # 在 SAVEPOINT 中插入，失败时不影响会话中的其他对象
+            async with self.db.begin_nested():
+                ids = await self._insert_contact_rows(rows)
+            inserted = dict(enumerate(ids))
+        except ROW_LEVEL_ERRORS as e:
+            if not isolate_errors:
+                raise
+            logger.warning(f"批量插入联系人失败，逐步隔离坏行: {e}")
+            inserted = await self._insert_contact_rows_isolating_errors(rows)
+
+        await self.db.commit()
+
+        return [
+            models.Contact(id=contact_id, **rows[idx])
+            for idx, contact_id in sorted(inserted.items())
+        ]
 
     async def get_contacts_by_company(self, company_id: int) -> List[models.Contact]:
         """
@@ -192,45 +259,139 @@ class Repository:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _unique_email_contacts_query(
+        company_id: Optional[int] = None,
+        email_after: Optional[str] = None,
+        email_upto: Optional[str] = None,
+    ):
+        """
+        构建按邮箱去重的联系人查询（在数据库中排名）
+
+        使用窗口函数按 LOWER(email) 分区，按置信度、创建时间（新的优先）排名，
+        每个邮箱只保留排名第一的联系人。
+
+        邮箱范围条件在窗口子查询内部生效，只对范围内的联系人排名。
+        email 列使用不区分大小写的排序规则（utf8mb4_general_ci），
+        同一 LOWER(email) 分区的行总是同时在范围内或范围外。
+
+        Args:
+            company_id: 公司ID，为 None 时查询全部公司
+            email_after: 只包含邮箱大于该值的联系人
+            email_upto: 只包含邮箱小于等于该值的联系人
+
+        Returns:
+            按联系人 ID 升序的查询
+        """
+        email_rank = func.row_number().over(
+            partition_by=func.lower(models.Contact.email),
+            order_by=(
+                func.coalesce(models.Contact.confidence_score, 0).desc(),
+                models.Contact.created_at.desc(),
+                models.Contact.id.desc(),
+            ),
+        )
+        ranked = select(
+            models.Contact.id.label("contact_id"), email_rank.label("email_rank")
+        ).filter(models.Contact.email.isnot(None), models.Contact.email != "")
+        if company_id is not None:
+            ranked = ranked.filter(models.Contact.company_id == company_id)
+        if email_after is not None:
+            ranked = ranked.filter(models.Contact.email > email_after)
+        if email_upto is not None:
+            ranked = ranked.filter(models.Contact.email <= email_upto)
+        ranked = ranked.subquery("ranked_contacts")
+
+        return (
+            select(models.Contact)
+            .join(ranked, models.Contact.id == ranked.c.contact_id)
+            .filter(ranked.c.email_rank == 1)
+            .order_by(models.Contact.id)
+        )
+
     async def get_all_contacts_with_email(self) -> List[models.Contact]:
         """
-        获取所有有邮箱的联系人（按邮箱去重，保留置信度最高的）
+        获取所有有邮箱的联系人（按邮箱去重，保留置信度最高的，置信度相同时保留最新的）
+
+        去重在数据库中完成；联系人较多时请使用 stream_contacts_with_email
+        或 get_contacts_with_email_page。
 
         返回:
             去重后的联系人列表（只包含有邮箱的联系人）
         """
-        # 查询所有有邮箱的联系人
-        result = await self.db.execute(
-            select(models.Contact).filter(
-                models.Contact.email.isnot(None), models.Contact.email != ""
-            )
+        result = await self.db.execute(self._unique_email_contacts_query())
+        return list(result.scalars().all())
+
+    async def get_unique_email_contacts_by_company(
+        self, company_id: int
+    ) -> List[models.Contact]:
+        """
+        获取指定公司按邮箱去重后的联系人（去重规则同 get_all_contacts_with_email）
+
+        Args:
+            company_id: 公司ID
+
+        Returns:
+            去重后的联系人列表（只包含有邮箱的联系人）
+        """
+        result = await self.db.execute(self._unique_email_contacts_query(company_id))
+        return list(result.scalars().all())
+
+    async def stream_contacts_with_email(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[models.Contact]:
+        """
+        流式获取按邮箱去重后的所有联系人（服务端游标，内存占用与 batch_size 相关）
+
+        Args:
+            batch_size: 每次从数据库拉取的行数
+
+        Yields:
+            去重后的联系人
+        """
+        result = await self.db.stream_scalars(
+            self._unique_email_contacts_query().execution_options(yield_per=batch_size)
         )
-        all_contacts = result.scalars().all()
+        async for contact in result:
+            yield contact
+
+    async def get_contacts_with_email_page(
+        self, after_email: Optional[str] = None, limit: int = 1000
+    ) -> List[models.Contact]:
+        """
+        分页获取按邮箱去重后的联系人（按邮箱的键集分页）
 
-        # 按邮箱去重，保留置信度最高的
-        email_map: Dict[str, models.Contact] = {}
-        for contact in all_contacts:
-            if not contact.email:
-                continue
+        先沿 email 索引取出本页的 limit 个邮箱确定范围上界，
+        再只对该范围内的联系人做窗口排名，每页的开销与 limit 相关，与总行数无关。
 
-            email_lower = contact.email.lower()
-            if email_lower not in email_map:
-                email_map[email_lower] = contact
-            else:
-                # 比较置信度，保留更高的
-                existing = email_map[email_lower]
-                existing_score = existing.confidence_score or 0.0
-                current_score = contact.confidence_score or 0.0
+        Args:
+            after_email: 上一页最后一个联系人的邮箱（第一页为 None）
+            limit: 每页邮箱数量
 
-                if current_score > existing_score:
-                    email_map[email_lower] = contact
-                elif current_score == existing_score:
-                    # 置信度相同，保留最新的
-                    if contact.created_at and existing.created_at:
-                        if contact.created_at > existing.created_at:
-                            email_map[email_lower] = contact
+        Returns:
+            本页联系人列表（按邮箱升序），为空表示没有更多数据
+        """
+        bounds = (
+            select(models.Contact.email)
+            .filter(models.Contact.email.isnot(None), models.Contact.email != "")
+            .distinct()
+            .order_by(models.Contact.email)
+            .limit(limit)
+        )
+        if after_email is not None:
+            bounds = bounds.filter(models.Contact.email > after_email)
+        emails = (await self.db.execute(bounds)).scalars().all()
+        if not emails:
+            return []
 
-        return list(email_map.values())
+        result = await self.db.execute(
+            self._unique_email_contacts_query(
+                email_after=after_email, email_upto=emails[-1]
+            )
+            .order_by(None)
+            .order_by(models.Contact.email)
+        )
+        return list(result.scalars().all())
 
     async def update_company_public_emails(
         self, company_id: int, public_emails: List[str]
@@ -265,6 +426,41 @@ class Repository:
         await self.db.refresh(company)
         return company
 
+    async def get_company_aliases(self) -> Dict[str, tuple]:
+        """
+        获取全部公司别名映射 - FindKP 板块（异步版本）
+
+        Returns:
+            {规范化名称: (规范英文名, 规范本地名)}
+        """
+        result = await self.db.execute(
+            select(
+                models.CompanyAlias.alias_key,
+                models.CompanyAlias.canonical_name_en,
+                models.CompanyAlias.canonical_name_local,
+            )
+        )
+        return {
+            row.alias_key: (row.canonical_name_en, row.canonical_name_local or "")
+            for row in result.all()
+        }
+
+    async def create_company_aliases(self, aliases: List[Dict[str, str]]) -> int:
+        """
+        批量保存公司别名映射 - FindKP 板块（异步版本）
+
+        Args:
+            aliases: 别名行数据列表（alias_key、canonical_name_en、canonical_name_local）
+
+        Returns:
+            保存的别名数量
+        """
+        if not aliases:
+            return 0
+        await self.db.execute(insert(models.CompanyAlias), aliases)
+        await self.db.commit()
+        return len(aliases)
+
     async def create_serper_response(
         self, trace_id: str, response_data: Dict[str, Any], auto_commit: bool = True
     ) -> models.SerperResponse:
@@ -342,93 +538,532 @@ class Repository:
 
         return results
 
-    async def create_trade_records_batch(
+    async def bulk_insert_serper_telemetry(
         self,
-        trade_records: List[Dict[str, Any]],
-        source_file: str,
-        auto_commit: bool = True,
-    ) -> List[models.TradeRecord]:
+        responses: List[Dict[str, Any]],
+        organic_results: List[Dict[str, Any]],
+    ) -> None:
+        """
+        批量写入 Serper 响应和搜索结果（多行 INSERT，单次提交）
+
+        Args:
+            responses: serper_responses 行数据列表
+            organic_results: serper_organic_results 行数据列表
+        """
+        if responses:
+            await self.db.execute(insert(models.SerperResponse), responses)
+        if organic_results:
+            await self.db.execute(insert(models.SerperOrganicResult), organic_results)
+        await self.db.commit()
+
+    async def get_serper_replay_rows(self, limit: Optional[int] = None) -> List[Any]:
         """
-        批量创建贸易记录（异步版本）
+        获取已记录的 Serper 查询及其搜索结果（用于离线回放）
 
         Args:
-            trade_records: 贸易记录字典列表
+            limit: 最多读取的响应记录数（最近的优先），None 表示全部
+
+        Returns:
+            行列表（trace_id、q、position、title、link、snippet），
+            按响应时间升序、结果位置升序；无结果的响应 link 为 None
+        """
+        responses = select(
+            models.SerperResponse.trace_id,
+            models.SerperResponse.q,
+            models.SerperResponse.created_at,
+        )
+        if limit is not None:
+            responses = responses.order_by(
+                models.SerperResponse.created_at.desc()
+            ).limit(limit)
+        responses = responses.subquery("responses")
+
+        query = (
+            select(
+                responses.c.trace_id,
+                responses.c.q,
+                models.SerperOrganicResult.position,
+                models.SerperOrganicResult.title,
+                models.SerperOrganicResult.link,
+                models.SerperOrganicResult.snippet,
+            )
+            .outerjoin(
+                models.SerperOrganicResult,
+                models.SerperOrganicResult.trace_id == responses.c.trace_id,
+            )
+            .order_by(
+                responses.c.created_at,
+                responses.c.trace_id,
+                models.SerperOrganicResult.position,
+                models.SerperOrganicResult.id,
+            )
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def bulk_insert_llm_usage(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        批量写入 LLM 调用用量（多行 INSERT，单次提交）
+
+        Args:
+            rows: llm_usage 行数据列表
+        """
+        if not rows:
+            return
+        await self.db.execute(insert(models.LLMUsage), rows)
+        await self.db.commit()
+
+    # 用量报告支持的分组维度
+    LLM_USAGE_GROUP_COLUMNS = ("task_type", "model", "company")
+
+    async def get_llm_usage_report(
+        self,
+        group_by: Iterable[str] = ("task_type", "model"),
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        按维度聚合 LLM 调用用量（成本最高的在前）
+
+        Args:
+            group_by: 分组维度（task_type / model / company）
+            since: 只统计该时间之后的调用，None 表示全部
+            limit: 最多返回的行数
+
+        Returns:
+            行字典列表：分组列（company 维度为 company_id 和 company_name）及
+            calls、estimated_calls、input_tokens、output_tokens、cost_usd、
+            avg_input_tokens、avg_output_tokens
+        """
+        group_by = list(dict.fromkeys(group_by))
+        invalid = set(group_by) - set(self.LLM_USAGE_GROUP_COLUMNS)
+        if invalid:
+            raise ValueError(
+                f"无效的分组维度: {', '.join(sorted(invalid))}，"
+                f"可选值: {', '.join(self.LLM_USAGE_GROUP_COLUMNS)}"
+            )
+
+        usage = models.LLMUsage
+        group_columns = []
+        for name in group_by:
+            if name == "company":
+                group_columns.extend(
+                    [
+                        usage.company_id.label("company_id"),
+                        models.Company.name.label("company_name"),
+                    ]
+                )
+            else:
+                group_columns.append(getattr(usage, name).label(name))
+
+        input_tokens = func.coalesce(func.sum(usage.input_tokens), 0)
+        output_tokens = func.coalesce(func.sum(usage.output_tokens), 0)
+        cost = func.coalesce(func.sum(usage.cost_usd), 0)
+        query = select(
+            *group_columns,
+            func.count(usage.id).label("calls"),
+            func.sum(case((usage.usage_source == "estimated", 1), else_=0)).label(
+                "estimated_calls"
+            ),
+            input_tokens.label("input_tokens"),
+            output_tokens.label("output_tokens"),
+            cost.label("cost_usd"),
+        )
+        if "company" in group_by:
+            query = query.outerjoin(
+                models.Company, models.Company.id == usage.company_id
+            )
+        if since is not None:
+            query = query.where(usage.created_at >= since)
+        if group_columns:
+            query = query.group_by(*group_columns)
+        query = query.order_by(cost.desc(), (input_tokens + output_tokens).desc())
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.db.execute(query)
+        rows = []
+        for row in result.mappings().all():
+            data = dict(row)
+            calls = data["calls"] or 0
+            data["estimated_calls"] = int(data["estimated_calls"] or 0)
+            data["input_tokens"] = int(data["input_tokens"])
+            data["output_tokens"] = int(data["output_tokens"])
+            data["cost_usd"] = float(data["cost_usd"])
+            data["avg_input_tokens"] = data["input_tokens"] / calls if calls else 0.0
+            data["avg_output_tokens"] = data["output_tokens"] / calls if calls else 0.0
+            rows.append(data)
+        return rows
+
+    # 计算内容哈希时忽略的字段（非贸易数据本身的字段）
+    TRADE_DEDUP_EXCLUDED_FIELDS = {
+        "id",
+        "dedup_key",
+        "source_file",
+        "created_at",
+        "updated_at",
+    }
+
+    @staticmethod
+    def build_trade_record_row(
+        item: Dict[str, Any], source_file: str
+    ) -> Dict[str, Any]:
+        """
+        将原始贸易数据（results.content 中的一项）转换为 trade_records 表的行数据
+
+        Args:
+            item: 原始贸易数据字典
             source_file: 来源文件路径
-            auto_commit: 是否自动提交，默认 True
-
-        Returns:
-            创建的 TradeRecord 列表
-        """
-        records = []
-        for item in trade_records:
-            # 解析日期字符串
-            date_value = None
-            if item.get("date"):
-                try:
-                    date_str = item["date"]
-                    # 处理 ISO 格式日期字符串
-                    if "T" in date_str:
-                        date_value = datetime.fromisoformat(
-                            date_str.replace("Z", "+00:00")
-                        )
-                    else:
-                        date_value = datetime.fromisoformat(date_str)
-                except Exception:
-                    date_value = None
-
-            record = models.TradeRecord(
-                trade_id=item.get("tradeId"),
-                trade_date=date_value,
-                importer=item.get("importer"),
-                importer_country_code=item.get("importerCountryCode"),
-                importer_id=item.get("importerId"),
-                importer_en=item.get("importerEn"),
-                importer_orig=item.get("importerOrig"),
-                exporter=item.get("exporter"),
-                exporter_country_code=item.get("exporterCountryCode"),
-                exporter_orig=item.get("exporterOrig"),
-                catalog=item.get("catalog"),
-                state_of_origin=item.get("stateOfOrigin"),
-                state_of_destination=item.get("stateOfDestination"),
-                batch_id=item.get("batchId"),
-                sum_of_usd=item.get("sumOfUSD"),
-                gd_no=item.get("gdNo"),
-                weight_unit_price=item.get("weightUnitPrice"),
-                source_database=item.get("database"),
-                product_tag=item.get("productTag"),
-                goods_desc=item.get("goodsDesc"),
-                goods_desc_vn=item.get("goodsDescVn"),
-                hs_code=item.get("hsCode"),
-                country_of_origin_code=item.get("countryOfOriginCode"),
-                country_of_origin=item.get("countryOfOrigin"),
-                country_of_destination=item.get("countryOfDestination"),
-                country_of_destination_code=item.get("countryOfDestinationCode"),
-                country_of_trade=item.get("countryOfTrade"),
-                qty=item.get("qty"),
-                qty_unit=item.get("qtyUnit"),
-                qty_unit_price=item.get("qtyUnitPrice"),
-                weight=item.get("weight"),
-                transport_type=item.get("transportType"),
-                payment=item.get("payment"),
-                incoterm=item.get("incoterm"),
-                trade_mode=item.get("tradeMode"),
-                rep_num=item.get("repNum"),
-                primary_flag=item.get("primary"),
-                source_file=source_file,
+
+        Returns:
+            行数据字典
+        """
+        # 解析日期字符串
+        date_value = None
+        if item.get("date"):
+            try:
+                date_str = item["date"]
+                # 处理 ISO 格式日期字符串
+                if "T" in date_str:
+                    date_value = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+                else:
+                    date_value = datetime.fromisoformat(date_str)
+            except Exception:
+                date_value = None
+
+        row = {
+            "trade_id": item.get("tradeId"),
+            "trade_date": date_value,
+            "importer": item.get("importer"),
+            "importer_country_code": item.get("importerCountryCode"),
+            "importer_id": item.get("importerId"),
+            "importer_en": item.get("importerEn"),
+            "importer_orig": item.get("importerOrig"),
+            "exporter": item.get("exporter"),
+            "exporter_country_code": item.get("exporterCountryCode"),
+            "exporter_orig": item.get("exporterOrig"),
+            "catalog": item.get("catalog"),
+            "state_of_origin": item.get("stateOfOrigin"),
+            "state_of_destination": item.get("stateOfDestination"),
+            "batch_id": item.get("batchId"),
+            "sum_of_usd": item.get("sumOfUSD"),
+            "gd_no": item.get("gdNo"),
+            "weight_unit_price": item.get("weightUnitPrice"),
+            "source_database": item.get("database"),
+            "product_tag": item.get("productTag"),
+            "goods_desc": item.get("goodsDesc"),
+            "goods_desc_vn": item.get("goodsDescVn"),
+            "hs_code": item.get("hsCode"),
+            "country_of_origin_code": item.get("countryOfOriginCode"),
+            "country_of_origin": item.get("countryOfOrigin"),
+            "country_of_destination": item.get("countryOfDestination"),
+            "country_of_destination_code": item.get("countryOfDestinationCode"),
+            "country_of_trade": item.get("countryOfTrade"),
+            "qty": item.get("qty"),
+            "qty_unit": item.get("qtyUnit"),
+            "qty_unit_price": item.get("qtyUnitPrice"),
+            "weight": item.get("weight"),
+            "transport_type": item.get("transportType"),
+            "payment": item.get("payment"),
+            "incoterm": item.get("incoterm"),
+            "trade_mode": item.get("tradeMode"),
+            "rep_num": item.get("repNum"),
+            "primary_flag": item.get("primary"),
+            "source_file": source_file,
+        }
+        row["dedup_key"] = Repository.build_trade_dedup_key(row)
+        return row
+
+    @staticmethod
+    def build_trade_dedup_key(row: Dict[str, Any]) -> str:
+        """
+        生成贸易记录的去重键
+
+        优先使用 trade_id；缺失时使用记录内容（不含 source_file）的 SHA-1 哈希，
+        这样同一条数据出现在重叠导出或重命名的文件中时，也能被识别为重复。
+
+        Args:
+            row: trade_records 行数据（字段名与列名一致）
+
+        Returns:
+            去重键
+        """
+        if row.get("trade_id"):
+            return str(row["trade_id"])
+
+        def normalize(value: Any) -> Any:
+            # 统一数据库读取值与原始 JSON 值的表示（Decimal/float、时区等）
+            if isinstance(value, datetime):
+                return value.replace(tzinfo=None).isoformat()
+            if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+                return format(Decimal(str(value)).normalize(), "f")
+            return value
+
+        content = {
+            key: normalize(value)
+            for key, value in row.items()
+            if key not in Repository.TRADE_DEDUP_EXCLUDED_FIELDS
+        }
+        payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _build_upsert(
+        self,
+        model,
+        conflict_column: str,
+        exclude: Iterable[str] = (),
+        touch: Iterable[str] = (),
+    ):
+        """
+        构建按唯一键更新的批量 INSERT 语句
+
+        MySQL 使用 INSERT ... ON DUPLICATE KEY UPDATE，SQLite 使用 ON CONFLICT DO UPDATE，
+        已存在的记录更新为最新数据。
+
+        Args:
+            model: ORM 模型
+            conflict_column: 唯一键列名
+            exclude: 冲突时不更新的列（主键、唯一键和 created_at 总是不更新）
+            touch: 冲突时更新为当前时间的列
+
+        Returns:
+            INSERT 语句
+        """
+        touch = list(touch)
+        skipped = {"id", conflict_column, "created_at", *exclude, *touch}
+        update_columns = [
+            column.name
+            for column in model.__table__.columns
+            if column.name not in skipped
+        ]
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "mysql":
+            stmt = mysql_insert(model)
+            return stmt.on_duplicate_key_update(
+                {name: stmt.inserted[name] for name in update_columns}
+                | {name: func.now() for name in touch}
+            )
+        if dialect_name == "sqlite":
+            stmt = sqlite_insert(model)
+            return stmt.on_conflict_do_update(
+                index_elements=[conflict_column],
+                set_={name: stmt.excluded[name] for name in update_columns}
+                | {name: func.now() for name in touch},
             )
-            self.db.add(record)
-            records.append(record)
+        raise ValueError(f"不支持的数据库方言: {dialect_name}")
+
+    def _build_trade_insert(self, upsert: bool):
+        """
+        构建贸易记录的批量 INSERT 语句
+
+        Args:
+            upsert: 是否按 dedup_key 更新已存在的记录（数据列用新数据覆盖，updated_at 更新为当前时间）
+
+        Returns:
+            INSERT 语句
+        """
+        if not upsert:
+            return insert(models.TradeRecord)
+        # 已存在的记录总会更新 updated_at，MySQL 的影响行数可以区分新增和更新
+        # （仅同一秒内再次写入完全相同的数据时计 1，统计为新增）
+        return self._build_upsert(
+            models.TradeRecord, "dedup_key", touch=("updated_at",)
+        )
+
+    async def bulk_insert_trade_records(
+        self,
+        rows: List[Dict[str, Any]],
+        chunk_size: int = 2000,
+        auto_commit: bool = True,
+        upsert: bool = True,
+    ) -> Dict[str, int]:
+        """
+        使用 Core 批量 INSERT 导入贸易记录（不创建 ORM 对象，不 refresh）
+
+        每 chunk_size 行发送一次 executemany（MySQL 驱动会改写为多行 INSERT）。
+        默认按 dedup_key 幂等写入，重复导入同一批数据不会产生重复行。
+
+        upsert 时分别统计新增和更新的行数：MySQL 根据影响行数计算
+        （ON DUPLICATE KEY UPDATE 新增的行计 1，更新的行计 2），每块只需一条语句；
+        SQLite 的影响行数和 RETURNING 都无法区分两者，每块先按 dedup_key 查询已存在的记录。
+
+        Args:
+            rows: 行数据列表（由 build_trade_record_row 生成）
+            chunk_size: 每次 INSERT 的行数
+            auto_commit: 是否在全部插入后提交，默认 True
+            upsert: 是否按去重键更新已存在的记录（False 时直接插入，重复键会报错）
+
+        Returns:
+            统计信息 {"inserted": 新增行数, "updated": 按去重键更新的已有行数}
+        """
+        chunk_size = max(1, chunk_size)
+        stmt = self._build_trade_insert(upsert)
+        count_by_rowcount = upsert and self.db.get_bind().dialect.name == "mysql"
+        # 在会话的连接上执行 Core 语句，才能拿到影响行数
+        connection = await self.db.connection()
+        stats = {"inserted": 0, "updated": 0}
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            existing = 0
+            if upsert:
+                # 同一批次内的重复键只保留最后一条，避免同一语句中多次更新同一行
+                chunk = list({row["dedup_key"]: row for row in chunk}.values())
+            if upsert and not count_by_rowcount:
+                keys = [row["dedup_key"] for row in chunk if row["dedup_key"]]
+                if keys:
+                    result = await connection.execute(
+                        select(func.count())
+                        .select_from(models.TradeRecord)
+                        .where(models.TradeRecord.dedup_key.in_(keys))
+                    )
+                    existing = result.scalar_one()
+            result = await connection.execute(stmt, chunk)
+            if count_by_rowcount:
+                existing = min(len(chunk), max(0, result.rowcount - len(chunk)))
+            stats["inserted"] += len(chunk) - existing
+            stats["updated"] += existing
 
-        # 批量提交
         if auto_commit:
             await self.db.commit()
-            # 刷新所有对象
-            for record in records:
-                await self.db.refresh(record)
+
+        return stats
+
+    async def compact_trade_records(self, chunk_size: int = 5000) -> Dict[str, int]:
+        """
+        压缩 trade_records：为历史记录回填 dedup_key，并删除重复记录
+
+        按主键顺序分块扫描 dedup_key 为空的记录，每块单独提交：
+        去重键已存在（或在本块中已出现）的记录被删除，其余记录回填去重键。
+        已有去重键的记录优先保留，其次保留最早导入的记录（主键最小）。
+
+        Args:
+            chunk_size: 每块处理的记录数
+
+        Returns:
+            统计信息 {"scanned": 扫描数, "updated": 回填数, "deleted": 删除数}
+        """
+        columns = [
+            column
+            for column in models.TradeRecord.__table__.columns
+            if column.name not in self.TRADE_DEDUP_EXCLUDED_FIELDS
+        ]
+        stats = {"scanned": 0, "updated": 0, "deleted": 0}
+        last_id = 0
+
+        while True:
+            result = await self.db.execute(
+                select(models.TradeRecord.id, *columns)
+                .where(
+                    models.TradeRecord.id > last_id,
+                    models.TradeRecord.dedup_key.is_(None),
+                )
+                .order_by(models.TradeRecord.id)
+                .limit(chunk_size)
+            )
+            rows = result.mappings().all()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            stats["scanned"] += len(rows)
+
+            keyed = [
+                (
+                    row["id"],
+                    self.build_trade_dedup_key(
+                        {column.name: row[column.name] for column in columns}
+                    ),
+                )
+                for row in rows
+            ]
+            existing_result = await self.db.execute(
+                select(models.TradeRecord.dedup_key).where(
+                    models.TradeRecord.dedup_key.in_({key for _, key in keyed})
+                )
+            )
+            seen = set(existing_result.scalars().all())
+
+            to_update = []
+            to_delete = []
+            for record_id, key in keyed:
+                if key in seen:
+                    to_delete.append(record_id)
+                else:
+                    seen.add(key)
+                    to_update.append({"record_id": record_id, "key": key})
+
+            if to_delete:
+                await self.db.execute(
+                    delete(models.TradeRecord).where(
+                        models.TradeRecord.id.in_(to_delete)
+                    )
+                )
+            if to_update:
+                await self.db.execute(
+                    update(models.TradeRecord.__table__)
+                    .where(models.TradeRecord.id == bindparam("record_id"))
+                    .values(dedup_key=bindparam("key")),
+                    to_update,
+                )
+            await self.db.commit()
+
+            stats["updated"] += len(to_update)
+            stats["deleted"] += len(to_delete)
+            logger.info(
+                f"trade_records 压缩进度: 扫描 {stats['scanned']}, "
+                f"回填 {stats['updated']}, 删除 {stats['deleted']}"
+            )
+
+        return stats
+
+    async def get_importer_trade_aggregates(
+        self, hs_code_prefixes: Optional[List[str]] = None
+    ) -> List[Any]:
+        """
+        按 (importer_en, importer) 聚合贸易记录（在数据库中完成聚合）
+
+        Args:
+            hs_code_prefixes: 目标产品的 HS 编码前缀列表，用于统计匹配的出货次数
+
+        Returns:
+            聚合行列表，每行包含 importer_en、importer、shipments、total_usd、
+            last_trade_date、hs_matched
+        """
+        if hs_code_prefixes:
+            hs_matched = func.sum(
+                case(
+                    (
+                        or_(
+                            *[
+                                models.TradeRecord.hs_code.like(f"{prefix}%")
+                                for prefix in hs_code_prefixes
+                            ]
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                )
+            )
         else:
-            await self.db.flush()
+            hs_matched = func.sum(0)
 
-        return records
+        result = await self.db.execute(
+            select(
+                models.TradeRecord.importer_en,
+                models.TradeRecord.importer,
+                func.count().label("shipments"),
+                func.coalesce(func.sum(models.TradeRecord.sum_of_usd), 0).label(
+                    "total_usd"
+                ),
+                func.max(models.TradeRecord.trade_date).label("last_trade_date"),
+                hs_matched.label("hs_matched"),
+            )
+            .where(
+                models.TradeRecord.importer.isnot(None),
+                models.TradeRecord.importer != "",
+            )
+            .group_by(models.TradeRecord.importer_en, models.TradeRecord.importer)
+        )
+        return list(result.all())
 
     async def get_processed_file(
         self, file_path: str
@@ -449,26 +1084,243 @@ class Repository:
         )
         return result.scalar_one_or_none()
 
+    # ==================== 进口商贸易汇总 ====================
+
+    async def get_distinct_importers(self) -> List[str]:
+        """
+        获取 trade_records 中所有不同的进口商名称
+
+        Returns:
+            进口商名称列表
+        """
+        result = await self.db.execute(
+            select(models.TradeRecord.importer)
+            .where(
+                models.TradeRecord.importer.isnot(None),
+                models.TradeRecord.importer != "",
+            )
+            .distinct()
+        )
+        return list(result.scalars().all())
+
+    async def get_importer_trade_totals(self, importer_names: List[str]) -> List[Any]:
+        """
+        按进口商名称聚合出货次数、金额、重量和交易日期范围
+
+        Args:
+            importer_names: 进口商名称列表（trade_records.importer 原始值）
+
+        Returns:
+            聚合行列表，每行包含 importer、importer_en、shipments、total_usd、
+            total_weight、first_trade_date、last_trade_date
+        """
+        if not importer_names:
+            return []
+        result = await self.db.execute(
+            select(
+                models.TradeRecord.importer,
+                func.max(models.TradeRecord.importer_en).label("importer_en"),
+                func.count().label("shipments"),
+                func.coalesce(func.sum(models.TradeRecord.sum_of_usd), 0).label(
+                    "total_usd"
+                ),
+                func.coalesce(func.sum(models.TradeRecord.weight), 0).label(
+                    "total_weight"
+                ),
+                func.min(models.TradeRecord.trade_date).label("first_trade_date"),
+                func.max(models.TradeRecord.trade_date).label("last_trade_date"),
+            )
+            .where(models.TradeRecord.importer.in_(importer_names))
+            .group_by(models.TradeRecord.importer)
+        )
+        return list(result.all())
+
+    async def get_importer_value_counts(
+        self, importer_names: List[str], column_name: str, max_length: int = 255
+    ) -> List[Any]:
+        """
+        按进口商统计某一列各取值的出货次数和金额（如 hs_code、exporter、goods_desc）
+
+        Args:
+            importer_names: 进口商名称列表
+            column_name: trade_records 列名
+            max_length: 取值截断长度（TEXT 列按前缀分组）
+
+        Returns:
+            聚合行列表，每行包含 importer、value、shipments、total_usd
+        """
+        if not importer_names:
+            return []
+        value = func.substr(getattr(models.TradeRecord, column_name), 1, max_length)
+        result = await self.db.execute(
+            select(
+                models.TradeRecord.importer,
+                value.label("value"),
+                func.count().label("shipments"),
+                func.coalesce(func.sum(models.TradeRecord.sum_of_usd), 0).label(
+                    "total_usd"
+                ),
+            )
+            .where(
+                models.TradeRecord.importer.in_(importer_names),
+                getattr(models.TradeRecord, column_name).isnot(None),
+                getattr(models.TradeRecord, column_name) != "",
+            )
+            .group_by(models.TradeRecord.importer, value)
+        )
+        return list(result.all())
+
+    @staticmethod
+    def importer_summary_key(importer_name: Optional[str]) -> str:
+        """
+        生成进口商贸易汇总的键（规范化名称）
+
+        规范化名称超过 importer_key 列长度时，截断并附加完整名称的哈希，
+        不同的长名称不会因截断而冲突。
+
+        Args:
+            importer_name: 进口商名称（任意写法）
+
+        Returns:
+            汇总键，名称为空时返回空字符串
+        """
+        key = normalize_company_name(importer_name)
+        max_length = models.ImporterTradeSummary.importer_key.type.length
+        if len(key) <= max_length:
+            return key
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return f"{key[: max_length - len(digest) - 1]}#{digest}"
+
+    async def upsert_importer_summaries(self, summaries: List[Dict[str, Any]]) -> int:
+        """
+        批量写入进口商贸易汇总（按 importer_key 更新已存在的记录）
+
+        Args:
+            summaries: 汇总行数据列表
+
+        Returns:
+            写入的记录数
+        """
+        if not summaries:
+            return 0
+        stmt = self._build_upsert(models.ImporterTradeSummary, "importer_key")
+        await self.db.execute(stmt, summaries)
+        await self.db.commit()
+        return len(summaries)
+
+    async def get_importer_summaries(
+        self, importer_keys: List[str]
+    ) -> List[models.ImporterTradeSummary]:
+        """
+        按规范化名称批量获取进口商贸易汇总
+
+        Args:
+            importer_keys: 规范化名称列表
+
+        Returns:
+            ImporterTradeSummary 列表
+        """
+        if not importer_keys:
+            return []
+        result = await self.db.execute(
+            select(models.ImporterTradeSummary).where(
+                models.ImporterTradeSummary.importer_key.in_(importer_keys)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_importer_summary(
+        self, importer_name: str
+    ) -> Optional[models.ImporterTradeSummary]:
+        """
+        获取进口商的贸易汇总（名称任意写法，内部规范化后查询）
+
+        Args:
+            importer_name: 进口商名称
+
+        Returns:
+            ImporterTradeSummary 实例，如果不存在则返回 None
+        """
+        importer_key = self.importer_summary_key(importer_name)
+        if not importer_key:
+            return None
+        result = await self.db.execute(
+            select(models.ImporterTradeSummary).where(
+                models.ImporterTradeSummary.importer_key == importer_key
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_top_importer_summaries(
+        self, limit: int = 100, min_usd: Optional[float] = None
+    ) -> List[models.ImporterTradeSummary]:
+        """
+        按美元总额降序获取进口商贸易汇总
+
+        Args:
+            limit: 返回数量
+            min_usd: 美元总额下限
+
+        Returns:
+            ImporterTradeSummary 列表
+        """
+        query = select(models.ImporterTradeSummary)
+        if min_usd is not None:
+            query = query.where(models.ImporterTradeSummary.total_usd >= min_usd)
+        result = await self.db.execute(
+            query.order_by(models.ImporterTradeSummary.total_usd.desc()).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_all_processed_files(self) -> List[models.ProcessedFile]:
+        """
+        一次性获取全部已处理文件记录（用于增量导入时在内存中判断文件变化）
+
+        Returns:
+            ProcessedFile 列表
+        """
+        result = await self.db.execute(select(models.ProcessedFile))
+        return list(result.scalars().all())
+
     async def create_processed_file(
-        self, file_path: str, file_size: int, records_count: int
+        self,
+        file_path: str,
+        file_size: int,
+        records_count: int,
+        file_mtime_ns: Optional[int] = None,
+        content_hash: Optional[str] = None,
     ) -> models.ProcessedFile:
         """
         创建已处理文件记录（异步版本）
 
+        文件已有记录时（如 --force 重新导入）更新该记录，而不是插入重复路径。
+
         Args:
             file_path: 文件路径
             file_size: 文件大小（字节）
             records_count: 导入的记录数
+            file_mtime_ns: 文件修改时间（纳秒时间戳），可选
+            content_hash: 文件内容哈希（SHA-256），可选
 
         Returns:
-            创建的 ProcessedFile 实例
+            创建或更新的 ProcessedFile 实例
         """
-        processed_file = models.ProcessedFile(
-            file_path=file_path,
-            file_size=file_size,
-            records_count=records_count,
-        )
-        self.db.add(processed_file)
+        processed_file = await self.get_processed_file(file_path)
+        if processed_file:
+            processed_file.file_size = file_size
+            processed_file.records_count = records_count
+            processed_file.file_mtime_ns = file_mtime_ns
+            processed_file.content_hash = content_hash
+            processed_file.processed_at = datetime.now()
+        else:
+            processed_file = models.ProcessedFile(
+                file_path=file_path,
+                file_size=file_size,
+                records_count=records_count,
+                file_mtime_ns=file_mtime_ns,
+                content_hash=content_hash,
+            )
+            self.db.add(processed_file)
         await self.db.commit()
         await self.db.refresh(processed_file)
         return processed_file
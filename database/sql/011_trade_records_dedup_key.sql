@@ -0,0 +1,13 @@
+-- 为贸易记录表添加去重键
+-- 创建时间: 2026-10-19
+-- 说明: dedup_key 为 trade_id（缺失时为记录内容哈希），用于幂等导入（INSERT ... ON DUPLICATE KEY UPDATE）
+
+-- 添加 dedup_key 字段（历史记录为 NULL，唯一索引允许多个 NULL）
+ALTER TABLE trade_records
+ADD COLUMN dedup_key VARCHAR(64) NULL COMMENT '去重键(trade_id，缺失时为内容哈希)' AFTER trade_id;
+
+-- 添加唯一索引
+CREATE UNIQUE INDEX uk_dedup_key ON trade_records(dedup_key);
+
+-- 注意: 添加字段后执行一次压缩，为历史记录回填 dedup_key 并删除重复记录：
+-- python scripts/make_t_json.py --compact
@@ -0,0 +1,12 @@
+-- 为已处理文件记录表添加文件指纹字段
+-- 创建时间: 2026-10-19
+-- 说明: 增量导入按 大小 + 修改时间 + 内容哈希 判断文件是否变化，识别重命名或重复下载的文件
+
+ALTER TABLE processed_files
+ADD COLUMN file_mtime_ns BIGINT NULL COMMENT '文件修改时间(纳秒时间戳)' AFTER file_size,
+ADD COLUMN content_hash VARCHAR(64) NULL COMMENT '文件内容哈希(SHA-256)' AFTER file_mtime_ns;
+
+-- 添加索引以便按内容哈希查找
+CREATE INDEX idx_content_hash ON processed_files(content_hash);
+
+-- 注意: 历史记录的 file_mtime_ns 和 content_hash 为 NULL，增量导入时仍只按路径判断
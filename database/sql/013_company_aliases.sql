@@ -0,0 +1,13 @@
+-- 公司别名映射表结构
+-- 创建时间: 2026-10-19
+-- 说明: 批量 FindKP 前将进口商名称变体（规范化后）映射到规范公司，避免重复搜索同一公司
+
+CREATE TABLE IF NOT EXISTS company_aliases (
+    id INT PRIMARY KEY AUTO_INCREMENT COMMENT '主键ID',
+    alias_key VARCHAR(255) NOT NULL COMMENT '规范化名称',
+    canonical_name_en VARCHAR(512) NOT NULL COMMENT '规范英文名称',
+    canonical_name_local VARCHAR(512) COMMENT '规范本地名称',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+
+    UNIQUE KEY uk_alias_key (alias_key)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='公司别名映射表';
@@ -0,0 +1,26 @@
+-- 进口商贸易汇总表结构
+-- 创建时间: 2026-10-19
+-- 说明: 按规范化进口商名称预聚合 trade_records，每导入一个文件刷新其涉及的进口商
+--       首次启用后执行一次全量重建: python scripts/make_t_json.py --rebuild-summaries
+
+CREATE TABLE IF NOT EXISTS importer_trade_summaries (
+    id INT PRIMARY KEY AUTO_INCREMENT COMMENT '主键ID',
+    importer_key VARCHAR(255) NOT NULL COMMENT '规范化进口商名称',
+    importer VARCHAR(512) COMMENT '进口商名称（出货最多的写法）',
+    importer_en VARCHAR(512) COMMENT '进口商英文名称',
+    importer_names JSON COMMENT '进口商名称的所有写法(JSON数组)',
+    shipments INT DEFAULT 0 COMMENT '出货次数',
+    total_usd DECIMAL(18, 2) DEFAULT 0 COMMENT '美元总额',
+    total_weight DECIMAL(18, 4) DEFAULT 0 COMMENT '总重量',
+    top_hs_codes JSON COMMENT '主要 HS 编码(JSON数组)',
+    top_goods JSON COMMENT '主要商品描述(JSON数组)',
+    top_exporters JSON COMMENT '主要出口商(JSON数组)',
+    first_trade_date DATETIME COMMENT '首次交易日期',
+    last_trade_date DATETIME COMMENT '最近交易日期',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    UNIQUE KEY uk_importer_key (importer_key),
+    INDEX idx_shipments (shipments),
+    INDEX idx_total_usd (total_usd),
+    INDEX idx_last_trade_date (last_trade_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='进口商贸易汇总表';
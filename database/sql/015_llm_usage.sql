@@ -0,0 +1,21 @@
+-- LLM 调用用量表结构
+-- 创建时间: 2026-10-19
+-- 说明: 每次 LLM 调用记录一行输入/输出 token 数和估算成本，
+--       报告按任务类型、模型、公司聚合: smart-lead llm-usage / GET /llm/usage
+
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id INT PRIMARY KEY AUTO_INCREMENT COMMENT '主键ID',
+    task_type VARCHAR(64) NOT NULL COMMENT '任务类型',
+    model VARCHAR(128) NOT NULL COMMENT '模型名称',
+    company_id INT COMMENT '关联公司ID',
+    contact_id INT COMMENT '关联联系人ID',
+    input_tokens INT DEFAULT 0 COMMENT '输入 token 数',
+    output_tokens INT DEFAULT 0 COMMENT '输出 token 数',
+    usage_source VARCHAR(16) NOT NULL COMMENT '用量来源（provider=接口返回，estimated=本地估算）',
+    cost_usd DECIMAL(12, 6) DEFAULT 0 COMMENT '估算成本（美元）',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+
+    INDEX idx_company_id (company_id),
+    INDEX idx_task_model (task_type, model),
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='LLM 调用用量表';
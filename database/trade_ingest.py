@@ -0,0 +1,872 @@
+"""贸易数据导入引擎
+
+- 流式解析 JSON 文件中的 results.content 数组（逐条解析，不整体 json.load）
+- 在进程池中并行解析文件、构建行数据，按 chunk_size 分批传回主进程，边解析边写入
+- 使用 Core 批量 INSERT 分块写入 trade_records，不创建 ORM 对象、不 refresh
+- 统计并报告导入速度（rows/sec）
+- 增量导入：一次性加载 processed_files，按大小/修改时间/内容哈希识别新文件、
+  变更文件和重命名（重复下载）的文件
+- 目录监听：轮询目录，文件写入稳定（防抖）后自动导入
+- 每个文件导入后刷新其涉及进口商的贸易汇总（importer_trade_summaries）
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from logs import logger
+from .repository import Repository
+from .trade_summary import ImporterSummaryBuilder
+
+# results.content 在文件中的路径
+CONTENT_PATH = ("results", "content")
+
+_WHITESPACE = " \t\r\n"
+
+# 每个文件在队列中最多缓存的分批数；写入跟不上时解析进程在队列满时等待
+CHUNK_QUEUE_SIZE = 2
+# 等待分批时检查解析任务是否异常退出的间隔（秒）
+CHUNK_POLL_INTERVAL = 1.0
+
+
+class StreamingContentReader:
+    """
+    流式读取 JSON 文件中指定路径下的数组元素
+
+    只在定位数组时逐字符扫描文件头部；进入目标数组后，
+    使用 json.JSONDecoder.raw_decode 逐条解析元素，内存占用与单条记录大小相关，
+    而不是整个文件大小。
+    """
+
+    def __init__(
+        self,
+        fp: TextIO,
+        path: Sequence[str] = CONTENT_PATH,
+        read_size: int = 1 << 20,
+    ):
+        """
+        初始化读取器
+
+        Args:
+            fp: 以文本模式打开的文件对象
+            path: 目标数组所在的键路径
+            read_size: 每次读取的字符数
+        """
+        self.fp = fp
+        self.path = list(path)
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """读取更多数据到缓冲区，返回是否读到了新数据"""
+        if self.eof:
+            return False
+        data = self.fp.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def _peek(self) -> Optional[str]:
+        """返回下一个非空白字符（不消费），文件结束时返回 None"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return None
+
+    def _decode_value(self) -> Any:
+        """从当前位置解析一个完整的 JSON 值，数据不完整时继续读取"""
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字可能在缓冲区边界被截断（如 "12" + "34"），需要确认后面还有字符
+            if end >= len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _seek_array(self) -> bool:
+        """
+        定位到目标数组的 "[" 之后
+
+        Returns:
+            是否找到目标数组
+        """
+        # 栈中每个元素为 [容器类型, 当前键]
+        stack: List[List[Optional[str]]] = []
+        expect_key = False
+
+        while True:
+            ch = self._peek()
+            if ch is None:
+                return False
+
+            if ch == '"':
+                text = self._decode_value()
+                if expect_key:
+                    stack[-1][1] = text
+                    expect_key = False
+                continue
+
+            self.pos += 1
+            if ch in "{[":
+                keys = [frame[1] for frame in stack if frame[0] == "{"]
+                if ch == "[" and keys == self.path and stack and stack[-1][0] == "{":
+                    return True
+                stack.append([ch, None])
+                expect_key = ch == "{"
+            elif ch in "}]":
+                if stack:
+                    stack.pop()
+            elif ch == ",":
+                expect_key = bool(stack) and stack[-1][0] == "{"
+
+    def __iter__(self) -> Iterator[Any]:
+        """逐条返回目标数组中的元素"""
+        if not self._seek_array():
+            return
+
+        while True:
+            ch = self._peek()
+            if ch is None:
+                raise json.JSONDecodeError("数组未结束", self.buffer, self.pos)
+            if ch == "]":
+                self.pos += 1
+                return
+            if ch == ",":
+                self.pos += 1
+                continue
+            yield self._decode_value()
+
+
+def iter_trade_items(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    流式遍历文件中 results.content 的每一条贸易数据
+
+    Args:
+        file_path: JSON 文件路径
+
+    Yields:
+        贸易数据字典（非字典元素会被跳过）
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        for item in StreamingContentReader(f):
+            if isinstance(item, dict):
+                yield item
+
+
+class TradeFileParseError(Exception):
+    """文件解析失败（JSON 格式错误或无法读取）"""
+
+
+def _put_chunk(chunks: Any, stop: Any, rows: Optional[List[Dict[str, Any]]]) -> bool:
+    """
+    把一批行数据放入队列，队列满时等待，直到主进程取走或要求停止
+
+    Returns:
+        是否放入成功（主进程要求停止时为 False）
+    """
+    while not stop.is_set():
+        try:
+            chunks.put(rows, timeout=CHUNK_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def parse_trade_file(
+    file_path: str, chunk_size: int, chunks: Any, stop: Any
+) -> Optional[int]:
+    """
+    流式解析单个文件，按 chunk_size 分批放入队列（在进程池中执行）
+
+    队列有容量上限，主进程写入较慢时解析暂停，两个进程中都只保留少量分批。
+    结束时（无论成功与否）放入 None 作为结束标记。
+
+    Args:
+        file_path: JSON 文件路径
+        chunk_size: 每批行数
+        chunks: 分批队列
+        stop: 停止事件（主进程放弃该文件时设置）
+
+    Returns:
+        解析的行数，解析失败或被停止时为 None
+    """
+    try:
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        for item in iter_trade_items(file_path):
+            batch.append(Repository.build_trade_record_row(item, file_path))
+            if len(batch) >= chunk_size:
+                if not _put_chunk(chunks, stop, batch):
+                    return None
+                count += len(batch)
+                batch = []
+        if batch:
+            if not _put_chunk(chunks, stop, batch):
+                return None
+            count += len(batch)
+        return count
+    except json.JSONDecodeError as e:
+        logger.error(f"文件 {file_path} JSON 解析失败: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"读取文件 {file_path} 失败: {e}")
+        return None
+    finally:
+        _put_chunk(chunks, stop, None)
+
+
+class IngestStats:
+    """导入统计"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.files_success = 0
+        self.files_failed = 0
+        self.rows = 0  # 写入（新增 + 更新）的行数
+        self.rows_inserted = 0
+        self.rows_updated = 0
+        self.imported: Dict[str, int] = {}  # 导入成功的文件路径 -> 写入行数
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """获取统计摘要"""
+        return {
+            "files_success": self.files_success,
+            "files_failed": self.files_failed,
+            "rows": self.rows,
+            "rows_inserted": self.rows_inserted,
+            "rows_updated": self.rows_updated,
+            "elapsed": round(self.elapsed, 2),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+class TradeIngestEngine:
+    """
+    贸易数据导入引擎
+
+    文件在进程池中并行解析，按提交顺序依次写入数据库（写入串行进行，每个文件一个事务）。
+    解析进程每解析 chunk_size 行就通过有容量上限的队列传回一批，主进程边接收边写入，
+    两个进程中的内存占用都与分批大小相关，而不是文件大小。
+    同时处理的文件不超过 workers 个，一个文件写入完成后才提交下一个。
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        workers: int = 4,
+        chunk_size: int = 2000,
+        refresh_summaries: bool = True,
+    ):
+        """
+        初始化导入引擎
+
+        Args:
+            session_factory: 异步会话工厂
+            workers: 解析进程数（<=1 时在当前进程的线程中解析）
+            chunk_size: 每次批量 INSERT 的行数
+            refresh_summaries: 每个文件导入后是否刷新涉及进口商的贸易汇总
+        """
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.summary_builder = ImporterSummaryBuilder() if refresh_summaries else None
+
+    @staticmethod
+    async def _iter_chunks(
+        file_path: str, chunks: Any, future: asyncio.Future
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        逐批接收解析任务放入队列的行数据
+
+        Raises:
+            TradeFileParseError: 文件解析失败
+        """
+        while True:
+            try:
+                rows = await asyncio.to_thread(chunks.get, True, CHUNK_POLL_INTERVAL)
+            except queue.Empty:
+                if future.done():
+                    # 解析任务异常退出（如进程崩溃），没有放入结束标记
+                    future.result()
+                    raise TradeFileParseError(f"文件 {file_path} 解析任务意外结束")
+                continue
+            if rows is None:
+                break
+            yield rows
+
+        if await future is None:
+            raise TradeFileParseError(f"文件 {file_path} 解析失败")
+
+    async def _write_file(
+        self,
+        session: AsyncSession,
+        file_path: str,
+        chunks: AsyncIterator[List[Dict[str, Any]]],
+        fingerprint: Optional["FileFingerprint"] = None,
+    ) -> Dict[str, int]:
+        """
+        逐批写入单个文件的行数据并记录已处理文件（同一事务，全部写入后提交）
+
+        Args:
+            session: 异步数据库会话
+            file_path: 文件路径
+            chunks: 分批行数据
+            fingerprint: 文件指纹（提供时一并记录修改时间和内容哈希）
+
+        Returns:
+            写入统计 {"inserted": 新增行数, "updated": 更新行数}
+        """
+        repository = Repository(session)
+        started = time.perf_counter()
+        written = {"inserted": 0, "updated": 0}
+        importers: Set[str] = set()
+        async for rows in chunks:
+            chunk_written = await repository.bulk_insert_trade_records(
+                rows, chunk_size=self.chunk_size, auto_commit=False
+            )
+            written["inserted"] += chunk_written["inserted"]
+            written["updated"] += chunk_written["updated"]
+            importers.update(row["importer"] for row in rows if row.get("importer"))
+        count = written["inserted"] + written["updated"]
+        if count == 0:
+            logger.warning(f"文件 {file_path} 没有数据")
+        if fingerprint is None:
+            fingerprint = FileFingerprint.from_path(file_path)
+        await repository.create_processed_file(
+            file_path=file_path,
+            file_size=fingerprint.size,
+            records_count=count,
+            file_mtime_ns=fingerprint.mtime_ns,
+            content_hash=fingerprint.content_hash,
+        )
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"文件 {file_path} 导入成功: {count} 条记录"
+            f"（新增 {written['inserted']}, 更新 {written['updated']}）, "
+            f"耗时 {elapsed:.2f}s ({rate:.0f} rows/sec)"
+        )
+
+        if self.summary_builder is not None:
+            try:
+                await self.summary_builder.refresh(session, importers)
+            except Exception as e:
+                # 汇总刷新失败不影响已提交的导入，可通过 --rebuild-summaries 修复
+                await session.rollback()
+                logger.error(f"文件 {file_path} 的进口商汇总刷新失败: {e}")
+        return written
+
+    async def run(
+        self,
+        file_paths: List[str],
+        fingerprints: Optional[Dict[str, "FileFingerprint"]] = None,
+    ) -> IngestStats:
+        """
+        并行解析并导入文件
+
+        Args:
+            file_paths: 待导入的文件路径列表（调用方负责过滤已处理文件）
+            fingerprints: 文件路径 -> 文件指纹（可选）
+
+        Returns:
+            导入统计
+        """
+        stats = IngestStats()
+        if not file_paths:
+            return stats
+
+        loop = asyncio.get_running_loop()
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(file_paths))
+            )
+            # 进程池中的任务只能通过 Manager 代理对象共享队列和事件
+            manager = multiprocessing.Manager()
+            make_queue, make_event = manager.Queue, manager.Event
+        else:
+            executor = manager = None
+            make_queue, make_event = queue.Queue, threading.Event
+
+        pending = iter(file_paths)
+        # 按提交顺序排列的 (文件路径, 分批队列, 停止事件, 解析任务)
+        in_flight = deque()
+
+        def submit_next() -> None:
+            file_path = next(pending, None)
+            if file_path is not None:
+                chunks, stop = make_queue(CHUNK_QUEUE_SIZE), make_event()
+                future = loop.run_in_executor(
+                    executor, parse_trade_file, file_path, self.chunk_size, chunks, stop
+                )
+                in_flight.append((file_path, chunks, stop, future))
+
+        try:
+            for _ in range(self.workers):
+                submit_next()
+
+            async with self.session_factory() as session:
+                while in_flight:
+                    # 写入完成后才移出队列，中途取消时 finally 仍能停止它的解析任务
+                    file_path, chunks, stop, future = in_flight[0]
+                    try:
+                        written = await self._write_file(
+                            session,
+                            file_path,
+                            self._iter_chunks(file_path, chunks, future),
+                            (fingerprints or {}).get(file_path),
+                        )
+                        count = written["inserted"] + written["updated"]
+                        stats.rows += count
+                        stats.rows_inserted += written["inserted"]
+                        stats.rows_updated += written["updated"]
+                        stats.imported[file_path] = count
+                        stats.files_success += 1
+                    except TradeFileParseError as e:
+                        await session.rollback()
+                        logger.error(f"{e}，跳过")
+                        stats.files_failed += 1
+                    except Exception as e:
+                        await session.rollback()
+                        logger.error(f"文件 {file_path} 导入失败: {e}", exc_info=True)
+                        stats.files_failed += 1
+                        # 放弃该文件：停止解析，解析任务结束后才能复用进程
+                        stop.set()
+                        await asyncio.gather(future, return_exceptions=True)
+
+                    # 写入当前文件完成后提交下一个文件，其余文件仍在并行解析
+                    in_flight.popleft()
+                    submit_next()
+                    logger.info(
+                        f"累计导入 {stats.rows} 条记录"
+                        f"（新增 {stats.rows_inserted}, "
+                        f"更新 {stats.rows_updated}） "
+                        f"({stats.rows_per_sec:.0f} rows/sec)"
+                    )
+        finally:
+            for _, _, stop, _ in in_flight:
+                stop.set()
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if manager is not None:
+                manager.shutdown()
+
+        return stats
+
+
+def compute_file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    分块计算文件内容的 SHA-256 哈希
+
+    Args:
+        file_path: 文件路径
+        block_size: 每次读取的字节数
+
+    Returns:
+        十六进制哈希字符串
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileFingerprint:
+    """文件指纹：大小、修改时间和（按需计算的）内容哈希"""
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        mtime_ns: int,
+        content_hash: Optional[str] = None,
+    ):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_path(cls, path: str) -> "FileFingerprint":
+        """根据文件状态创建指纹（不计算哈希）"""
+        stat = os.stat(path)
+        return cls(path, stat.st_size, stat.st_mtime_ns)
+
+
+class ProcessedFileIndex:
+    """
+    已处理文件的内存索引
+
+    启动时一次性加载 processed_files，之后在内存中判断文件状态：
+    - unchanged: 路径已处理且大小、修改时间未变（不计算哈希）；
+      历史记录没有修改时间和哈希时，按原来的规则只凭路径判断
+    - touched: 修改时间变化但内容哈希未变
+    - duplicate: 内容与另一个已处理文件相同（重命名或重复下载）
+    - changed: 路径已处理但内容已变化
+    - new: 新文件
+    """
+
+    def __init__(self, processed_files: List[Any]):
+        """
+        初始化索引
+
+        Args:
+            processed_files: ProcessedFile 列表
+        """
+        self.by_path: Dict[str, Any] = {}
+        self.by_hash: Dict[str, str] = {}
+        for processed_file in processed_files:
+            self._remember(
+                processed_file.file_path,
+                processed_file.file_size,
+                processed_file.file_mtime_ns,
+                processed_file.content_hash,
+                processed_file.records_count,
+            )
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "ProcessedFileIndex":
+        """从数据库一次性加载全部已处理文件记录"""
+        processed_files = await Repository(session).get_all_processed_files()
+        logger.info(f"已加载 {len(processed_files)} 条已处理文件记录")
+        return cls(processed_files)
+
+    def _remember(
+        self,
+        path: str,
+        size: Optional[int],
+        mtime_ns: Optional[int],
+        content_hash: Optional[str],
+        records_count: Optional[int],
+    ) -> None:
+        self.by_path[path] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "content_hash": content_hash,
+            "records_count": records_count or 0,
+        }
+        if content_hash:
+            self.by_hash.setdefault(content_hash, path)
+
+    def add(self, fingerprint: FileFingerprint, records_count: int) -> None:
+        """记录一个已处理文件"""
+        self._remember(
+            fingerprint.path,
+            fingerprint.size,
+            fingerprint.mtime_ns,
+            fingerprint.content_hash,
+            records_count,
+        )
+
+    def records_count(self, path: str) -> int:
+        """获取已处理文件导入的记录数"""
+        return self.by_path.get(path, {}).get("records_count", 0)
+
+    async def classify(self, path: str) -> Tuple[str, FileFingerprint]:
+        """
+        判断文件状态
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            (状态, 文件指纹)，需要时指纹中包含内容哈希
+        """
+        fingerprint = FileFingerprint.from_path(path)
+        known = self.by_path.get(path)
+
+        if known:
+            if known["mtime_ns"] is None and known["content_hash"] is None:
+                return "unchanged", fingerprint
+            if (
+                known["size"] == fingerprint.size
+                and known["mtime_ns"] == fingerprint.mtime_ns
+            ):
+                fingerprint.content_hash = known["content_hash"]
+                return "unchanged", fingerprint
+
+        fingerprint.content_hash = await asyncio.to_thread(compute_file_hash, path)
+
+        if known and known["content_hash"] == fingerprint.content_hash:
+            return "touched", fingerprint
+        duplicate_of = self.by_hash.get(fingerprint.content_hash)
+        if duplicate_of and duplicate_of != path:
+            return "duplicate", fingerprint
+        return ("changed" if known else "new"), fingerprint
+
+
+class IncrementalImporter:
+    """增量导入器：基于内存中的已处理文件索引，只导入新文件和变更文件"""
+
+    def __init__(self, session_factory: sessionmaker, engine: TradeIngestEngine):
+        """
+        初始化增量导入器
+
+        Args:
+            session_factory: 异步会话工厂
+            engine: 导入引擎
+        """
+        self.session_factory = session_factory
+        self.engine = engine
+        self.index: Optional[ProcessedFileIndex] = None
+
+    async def load_index(self) -> ProcessedFileIndex:
+        """加载已处理文件索引（只在首次调用时查询数据库）"""
+        if self.index is None:
+            async with self.session_factory() as session:
+                self.index = await ProcessedFileIndex.load(session)
+        return self.index
+
+    async def import_files(
+        self, file_paths: List[str], force: bool = False
+    ) -> Tuple[IngestStats, int]:
+        """
+        导入文件列表中的新文件和变更文件
+
+        Args:
+            file_paths: 文件路径列表
+            force: 是否强制重新导入（忽略已处理记录）
+
+        Returns:
+            (导入统计, 跳过的文件数)
+        """
+        index = await self.load_index()
+        fingerprints: Dict[str, FileFingerprint] = {}
+        # 本批待导入文件的内容哈希 -> 文件路径，同一批中内容相同的文件只导入一次
+        batch_hashes: Dict[str, str] = {}
+        batch_duplicates: List[Tuple[FileFingerprint, str]] = []
+        skipped = 0
+
+        async with self.session_factory() as session:
+            repository = Repository(session)
+            for file_path in file_paths:
+                try:
+                    status, fingerprint = await index.classify(file_path)
+                except OSError as e:
+                    # 文件在扫描后被移动或删除
+                    logger.warning(f"无法读取文件 {file_path}: {e}")
+                    continue
+
+                if force or status in ("new", "changed"):
+                    if fingerprint.content_hash is None:
+                        fingerprint.content_hash = await asyncio.to_thread(
+                            compute_file_hash, file_path
+                        )
+                    original = batch_hashes.setdefault(
+                        fingerprint.content_hash, file_path
+                    )
+                    if original != file_path:
+                        skipped += 1
+                        batch_duplicates.append((fingerprint, original))
+                        logger.info(
+                            f"文件 {file_path} 与本批文件 {original} 内容相同，跳过"
+                        )
+                        continue
+                    fingerprints[file_path] = fingerprint
+                    if status == "changed":
+                        logger.info(f"文件 {file_path} 内容已变化，重新导入")
+                    continue
+
+                skipped += 1
+                if status == "unchanged":
+                    logger.debug(f"文件 {file_path} 已处理过，跳过")
+                    continue
+
+                # touched / duplicate：内容已导入过，只更新已处理记录
+                if status == "touched":
+                    records_count = index.records_count(file_path)
+                    logger.info(f"文件 {file_path} 仅修改时间变化，跳过")
+                else:
+                    records_count = 0
+                    logger.info(
+                        f"文件 {file_path} 与已处理文件 "
+                        f"{index.by_hash[fingerprint.content_hash]} 内容相同，跳过"
+                    )
+                await repository.create_processed_file(
+                    file_path=file_path,
+                    file_size=fingerprint.size,
+                    records_count=records_count,
+                    file_mtime_ns=fingerprint.mtime_ns,
+                    content_hash=fingerprint.content_hash,
+                )
+                index.add(fingerprint, records_count)
+
+        stats = await self.engine.run(list(fingerprints), fingerprints)
+        for file_path, count in stats.imported.items():
+            index.add(fingerprints[file_path], count)
+
+        # 原文件导入成功后才把同批的重复文件记为已处理，失败时下次一起重试
+        batch_duplicates = [
+            (fingerprint, original)
+            for fingerprint, original in batch_duplicates
+            if original in stats.imported
+        ]
+        if batch_duplicates:
+            async with self.session_factory() as session:
+                repository = Repository(session)
+                for fingerprint, _ in batch_duplicates:
+                    await repository.create_processed_file(
+                        file_path=fingerprint.path,
+                        file_size=fingerprint.size,
+                        records_count=0,
+                        file_mtime_ns=fingerprint.mtime_ns,
+                        content_hash=fingerprint.content_hash,
+                    )
+                    index.add(fingerprint, 0)
+
+        return stats, skipped
+
+
+class TradeDirectoryWatcher:
+    """
+    目录监听器：轮询目录中的 .json 文件，文件写入稳定后自动增量导入
+
+    防抖规则：文件在连续两次轮询中大小和修改时间都未变化，
+    且距最后修改已超过 debounce 秒，才认为下载完成。
+    """
+
+    def __init__(
+        self,
+        importer: IncrementalImporter,
+        directory: str,
+        interval: float = 30.0,
+        debounce: float = 10.0,
+    ):
+        """
+        初始化监听器
+
+        Args:
+            importer: 增量导入器
+            directory: 监听的目录
+            interval: 轮询间隔（秒）
+            debounce: 文件最后修改后的静默时间（秒）
+        """
+        self.importer = importer
+        self.directory = directory
+        self.interval = max(0.1, interval)
+        self.debounce = max(0.0, debounce)
+        self._last_seen: Dict[str, Tuple[int, int]] = {}
+        # 导入失败的文件状态，文件再次变化前不重试
+        self._failed: Dict[str, Tuple[int, int]] = {}
+
+    def _stable_files(self) -> List[str]:
+        """扫描目录，返回写入已稳定的文件"""
+        stable = []
+        seen: Dict[str, Tuple[int, int]] = {}
+        now_ns = time.time_ns()
+
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if not entry.is_file() or not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            state = (stat.st_size, stat.st_mtime_ns)
+            seen[entry.path] = state
+            if (
+                self._last_seen.get(entry.path) == state
+                and now_ns - stat.st_mtime_ns >= self.debounce * 1e9
+            ):
+                stable.append(entry.path)
+
+        self._last_seen = seen
+        return stable
+
+    async def poll_once(self) -> Optional[IngestStats]:
+        """
+        执行一次轮询，导入稳定的新文件和变更文件
+
+        Returns:
+            有待检查的候选文件时返回导入统计，否则返回 None
+        """
+        index = await self.importer.load_index()
+        candidates = []
+        for path in self._stable_files():
+            known = index.by_path.get(path)
+            state = self._last_seen[path]
+            if known and (known["size"], known["mtime_ns"]) == state:
+                continue
+            if known and known["mtime_ns"] is None and known["content_hash"] is None:
+                continue
+            if self._failed.get(path) == state:
+                continue
+            candidates.append(path)
+
+        if not candidates:
+            return None
+
+        stats, _ = await self.importer.import_files(candidates)
+        for path in candidates:
+            known = index.by_path.get(path)
+            if not known or (known["size"], known["mtime_ns"]) != self._last_seen[path]:
+                self._failed[path] = self._last_seen[path]
+        if stats.imported or stats.files_failed:
+            logger.info(
+                f"监听导入: 成功 {stats.files_success} 个文件, "
+                f"失败 {stats.files_failed} 个文件, 共 {stats.rows} 条记录"
+                f"（新增 {stats.rows_inserted}, 更新 {stats.rows_updated}） "
+                f"({stats.rows_per_sec:.0f} rows/sec)"
+            )
+        return stats
+
+    async def run(self) -> None:
+        """持续轮询目录，直到任务被取消"""
+        logger.info(
+            f"开始监听目录: {self.directory}"
+            f"（轮询间隔 {self.interval}s，防抖 {self.debounce}s）"
+        )
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"监听导入失败: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,178 @@
+"""进口商贸易汇总维护
+
+importer_trade_summaries 按规范化进口商名称（见 Repository.importer_summary_key）
+预聚合 trade_records：出货次数、美元总额/重量、主要 HS 编码、商品描述和出口商、首次/最近交易日期。
+
+每导入一个文件，只重新聚合该文件涉及的进口商（包括这些进口商在汇总中记录的其他写法），
+不做全表扫描；聚合在数据库中按进口商名称分组完成，结果可重复计算（幂等）。
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logs import logger
+from .repository import Repository
+
+# 每类主要取值保留的数量
+TOP_N = 10
+# 单次 IN 查询的进口商名称数量
+NAMES_PER_QUERY = 500
+
+
+def _top_values(counts: Dict[str, List[float]], limit: int = TOP_N) -> List[Dict]:
+    """按出货次数（其次金额）取前 N 个取值"""
+    ranked = sorted(counts.items(), key=lambda item: (-item[1][0], -item[1][1]))
+    return [
+        {"value": value, "shipments": int(shipments), "total_usd": round(usd, 2)}
+        for value, (shipments, usd) in ranked[:limit]
+    ]
+
+
+class ImporterSummaryBuilder:
+    """进口商贸易汇总构建器"""
+
+    # 汇总字段 -> trade_records 列名
+    VALUE_COLUMNS = {
+        "top_hs_codes": "hs_code",
+        "top_goods": "goods_desc",
+        "top_exporters": "exporter",
+    }
+
+    async def refresh(
+        self, session: AsyncSession, importer_names: Iterable[str]
+    ) -> int:
+        """
+        重新聚合指定进口商的贸易汇总
+
+        Args:
+            session: 异步数据库会话
+            importer_names: 进口商名称（trade_records.importer 原始值）
+
+        Returns:
+            更新的汇总记录数
+        """
+        repository = Repository(session)
+
+        names_by_key: Dict[str, Set[str]] = defaultdict(set)
+        for name in importer_names:
+            key = Repository.importer_summary_key(name)
+            if key:
+                names_by_key[key].add(name)
+        if not names_by_key:
+            return 0
+
+        # 同一规范化名称的其他写法也需要参与聚合
+        for summary in await repository.get_importer_summaries(list(names_by_key)):
+            names_by_key[summary.importer_key].update(summary.importer_names or [])
+
+        key_by_name = {
+            name: key for key, names in names_by_key.items() for name in names
+        }
+        all_names = sorted(key_by_name)
+
+        totals: List[Any] = []
+        value_counts: Dict[str, List[Any]] = {field: [] for field in self.VALUE_COLUMNS}
+        for start in range(0, len(all_names), NAMES_PER_QUERY):
+            names = all_names[start : start + NAMES_PER_QUERY]
+            totals.extend(await repository.get_importer_trade_totals(names))
+            for field, column_name in self.VALUE_COLUMNS.items():
+                value_counts[field].extend(
+                    await repository.get_importer_value_counts(names, column_name)
+                )
+
+        summaries = self._build_summaries(totals, value_counts, key_by_name)
+        count = await repository.upsert_importer_summaries(summaries)
+        logger.info(f"已刷新 {count} 个进口商贸易汇总")
+        return count
+
+    def _build_summaries(
+        self,
+        totals: List[Any],
+        value_counts: Dict[str, List[Any]],
+        key_by_name: Dict[str, str],
+    ) -> List[Dict[str, Any]]:
+        """按规范化名称合并各写法的聚合结果"""
+        summaries: Dict[str, Dict[str, Any]] = {}
+        name_shipments: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+        for row in totals:
+            key = key_by_name[row.importer]
+            summary = summaries.setdefault(
+                key,
+                {
+                    "importer_key": key,
+                    "importer_en": None,
+                    "shipments": 0,
+                    "total_usd": Decimal(0),
+                    "total_weight": Decimal(0),
+                    "first_trade_date": None,
+                    "last_trade_date": None,
+                },
+            )
+            summary["shipments"] += row.shipments
+            summary["total_usd"] += Decimal(str(row.total_usd or 0))
+            summary["total_weight"] += Decimal(str(row.total_weight or 0))
+            if row.importer_en and not summary["importer_en"]:
+                summary["importer_en"] = row.importer_en
+            if row.first_trade_date and (
+                summary["first_trade_date"] is None
+                or row.first_trade_date < summary["first_trade_date"]
+            ):
+                summary["first_trade_date"] = row.first_trade_date
+            if row.last_trade_date and (
+                summary["last_trade_date"] is None
+                or row.last_trade_date > summary["last_trade_date"]
+            ):
+                summary["last_trade_date"] = row.last_trade_date
+            name_shipments[key][row.importer] = row.shipments
+
+        for field, rows in value_counts.items():
+            counts: Dict[str, Dict[str, List[float]]] = defaultdict(dict)
+            for row in rows:
+                key = key_by_name[row.importer]
+                entry = counts[key].setdefault(row.value, [0, 0.0])
+                entry[0] += row.shipments
+                entry[1] += float(row.total_usd or 0)
+            for key, summary in summaries.items():
+                summary[field] = _top_values(counts.get(key, {}))
+
+        for key, summary in summaries.items():
+            names = name_shipments[key]
+            # 出货最多的写法作为展示名称
+            summary["importer"] = max(names, key=lambda name: (names[name], name))
+            summary["importer_names"] = sorted(names)
+
+        return list(summaries.values())
+
+    async def rebuild_all(self, session: AsyncSession, batch_size: int = 2000) -> int:
+        """
+        全量重建汇总（首次启用或数据修复时使用）
+
+        Args:
+            session: 异步数据库会话
+            batch_size: 每批处理的进口商名称数量
+
+        Returns:
+            更新的汇总记录数
+        """
+        repository = Repository(session)
+        names_by_key: Dict[str, List[str]] = defaultdict(list)
+        for name in await repository.get_distinct_importers():
+            key = Repository.importer_summary_key(name)
+            if key:
+                names_by_key[key].append(name)
+
+        # 按规范化名称分批，保证同一进口商的所有写法在同一批中聚合
+        total = 0
+        batch: List[str] = []
+        for names in names_by_key.values():
+            batch.extend(names)
+            if len(batch) >= batch_size:
+                total += await self.refresh(session, batch)
+                batch = []
+        if batch:
+            total += await self.refresh(session, batch)
+        return total
@@ -42,6 +42,24 @@ CREATE TABLE `companies` (
 ) ENGINE=InnoDB AUTO_INCREMENT=148 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `company_aliases`
+--
+
+DROP TABLE IF EXISTS `company_aliases`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `company_aliases` (
+  `id` int NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+  `alias_key` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '规范化名称',
+  `canonical_name_en` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '规范英文名称',
+  `canonical_name_local` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '规范本地名称',
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uk_alias_key` (`alias_key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='公司别名映射表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `contacts`
 --
@@ -138,6 +156,61 @@ CREATE TABLE `emails` (
 ) ENGINE=InnoDB AUTO_INCREMENT=13 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='邮件记录表';
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `importer_trade_summaries`
+--
+
+DROP TABLE IF EXISTS `importer_trade_summaries`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `importer_trade_summaries` (
+  `id` int NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+  `importer_key` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '规范化进口商名称',
+  `importer` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '进口商名称（出货最多的写法）',
+  `importer_en` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '进口商英文名称',
+  `importer_names` json DEFAULT NULL COMMENT '进口商名称的所有写法(JSON数组)',
+  `shipments` int DEFAULT '0' COMMENT '出货次数',
+  `total_usd` decimal(18,2) DEFAULT '0.00' COMMENT '美元总额',
+  `total_weight` decimal(18,4) DEFAULT '0.0000' COMMENT '总重量',
+  `top_hs_codes` json DEFAULT NULL COMMENT '主要 HS 编码(JSON数组)',
+  `top_goods` json DEFAULT NULL COMMENT '主要商品描述(JSON数组)',
+  `top_exporters` json DEFAULT NULL COMMENT '主要出口商(JSON数组)',
+  `first_trade_date` datetime DEFAULT NULL COMMENT '首次交易日期',
+  `last_trade_date` datetime DEFAULT NULL COMMENT '最近交易日期',
+  `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uk_importer_key` (`importer_key`),
+  KEY `idx_shipments` (`shipments`),
+  KEY `idx_total_usd` (`total_usd`),
+  KEY `idx_last_trade_date` (`last_trade_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='进口商贸易汇总表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `llm_usage`
+--
+
+DROP TABLE IF EXISTS `llm_usage`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `llm_usage` (
+  `id` int NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+  `task_type` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '任务类型',
+  `model` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '模型名称',
+  `company_id` int DEFAULT NULL COMMENT '关联公司ID',
+  `contact_id` int DEFAULT NULL COMMENT '关联联系人ID',
+  `input_tokens` int DEFAULT '0' COMMENT '输入 token 数',
+  `output_tokens` int DEFAULT '0' COMMENT '输出 token 数',
+  `usage_source` varchar(16) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '用量来源（provider=接口返回，estimated=本地估算）',
+  `cost_usd` decimal(12,6) DEFAULT '0.000000' COMMENT '估算成本（美元）',
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  PRIMARY KEY (`id`),
+  KEY `idx_company_id` (`company_id`),
+  KEY `idx_task_model` (`task_type`,`model`),
+  KEY `idx_created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='LLM 调用用量表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `oauth2_callbacks`
 --
@@ -194,12 +267,15 @@ CREATE TABLE `processed_files` (
   `id` int NOT NULL AUTO_INCREMENT COMMENT '主键ID',
   `file_path` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL COMMENT '文件路径',
   `file_size` bigint DEFAULT NULL COMMENT '文件大小(字节)',
+  `file_mtime_ns` bigint DEFAULT NULL COMMENT '文件修改时间(纳秒时间戳)',
+  `content_hash` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '文件内容哈希(SHA-256)',
   `processed_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '处理时间',
   `records_count` int DEFAULT '0' COMMENT '导入的记录数',
   PRIMARY KEY (`id`),
   UNIQUE KEY `file_path` (`file_path`),
   KEY `idx_file_path` (`file_path`(255)),
-  KEY `idx_processed_at` (`processed_at`)
+  KEY `idx_processed_at` (`processed_at`),
+  KEY `idx_content_hash` (`content_hash`)
 ) ENGINE=InnoDB AUTO_INCREMENT=11 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='已处理文件记录表';
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -256,6 +332,7 @@ DROP TABLE IF EXISTS `trade_records`;
 CREATE TABLE `trade_records` (
   `id` int NOT NULL AUTO_INCREMENT COMMENT '主键ID',
   `trade_id` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '贸易ID',
+  `dedup_key` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '去重键(trade_id，缺失时为内容哈希)',
   `trade_date` datetime DEFAULT NULL COMMENT '贸易日期',
   `importer` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '进口商名称',
   `importer_country_code` varchar(10) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '进口商国家代码',
@@ -296,6 +373,7 @@ CREATE TABLE `trade_records` (
   `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
   `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
   PRIMARY KEY (`id`),
+  UNIQUE KEY `uk_dedup_key` (`dedup_key`),
   KEY `idx_trade_id` (`trade_id`),
   KEY `idx_trade_date` (`trade_date`),
   KEY `idx_importer` (`importer`(255)),
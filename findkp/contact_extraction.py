@@ -0,0 +1,316 @@
+"""联系人提取工具
+
+- 搜索结果过多时，将结果按 token 预算切分为多个分块（map），
+  分别交给 LLM 提取联系人后，再按确定性规则合并去重（reduce）
+- 记录快速模型 -> 强模型级联提取的统计信息
+"""
+
+import json
+from typing import List, Dict, Any, Optional, Set
+
+from llm.usage import estimate_tokens_heuristic
+from logs import logger
+
+
+class ResultChunker:
+    """搜索结果分块器，按估算 token 数将结果切分为多个分块"""
+
+    def __init__(self, max_tokens: int = 3000):
+        """
+        初始化分块器
+
+        Args:
+            max_tokens: 每个分块的 token 上限（估算值）
+        """
+        self.max_tokens = max(1, max_tokens)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        估算文本的 token 数
+
+        不依赖具体模型的分词器：ASCII 字符按约 4 个字符 1 个 token 计算，
+        非 ASCII 字符（中文、越南语变音字符等）按 1 个字符 1 个 token 计算。
+
+        Args:
+            text: 文本内容
+
+        Returns:
+            估算的 token 数
+        """
+        return estimate_tokens_heuristic(text)
+
+    def split(self, results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        将搜索结果切分为多个分块，保持原始顺序
+
+        单条结果超过上限时独占一个分块（不截断内容）。
+
+        Args:
+            results: 搜索结果列表，每个元素包含 title/link/snippet
+
+        Returns:
+            分块列表
+        """
+        chunks: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+
+        for result in results:
+            tokens = self.estimate_tokens(json.dumps(result, ensure_ascii=False))
+            if current and current_tokens + tokens > self.max_tokens:
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+            current.append(result)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+
+class ContactMerger:
+    """联系人合并器，对多个分块的提取结果进行确定性合并去重"""
+
+    # 合并时需要补全的字段
+    FIELDS = ["full_name", "email", "role", "linkedin_url", "twitter_url"]
+
+    # 多人共用的通用邮箱前缀（去掉 . _ - 后比较），只在没有其他键时才作为去重键
+    SHARED_MAILBOXES = {
+        "admin",
+        "business",
+        "contact",
+        "customercare",
+        "customerservice",
+        "enquiry",
+        "export",
+        "general",
+        "hello",
+        "help",
+        "import",
+        "info",
+        "inquiry",
+        "marketing",
+        "office",
+        "procurement",
+        "purchasing",
+        "sales",
+        "service",
+        "support",
+    }
+
+    @staticmethod
+    def _normalize_linkedin(url: Optional[str]) -> Optional[str]:
+        """规范化 LinkedIn URL（去掉协议、www 前缀、查询参数和末尾斜杠）"""
+        if not url:
+            return None
+        normalized = url.strip().lower().split("?")[0].rstrip("/")
+        for prefix in ("https://", "http://"):
+            if normalized.startswith(prefix):
+                normalized = normalized[len(prefix) :]
+        for prefix in ("www.", "vn.", "m."):
+            if normalized.startswith(prefix):
+                normalized = normalized[len(prefix) :]
+        return normalized or None
+
+    def _keys(self, contact: Dict[str, Any]) -> List[str]:
+        """
+        生成联系人的去重键（email / linkedin / name）
+
+        通用邮箱（info@、sales@ 等）和 LinkedIn 公司主页可能由多人共用，
+        不能证明是同一个人：公司主页不作为键，通用邮箱只在没有其他键时使用。
+
+        Args:
+            contact: 联系人字典
+
+        Returns:
+            去重键列表
+        """
+        keys = []
+        shared_email = None
+        email = (contact.get("email") or "").strip().lower()
+        if email:
+            local_part = email.split("@")[0].translate(str.maketrans("", "", "._-"))
+            if local_part in self.SHARED_MAILBOXES:
+                shared_email = f"email:{email}"
+            else:
+                keys.append(f"email:{email}")
+        linkedin = self._normalize_linkedin(contact.get("linkedin_url"))
+        if linkedin and "/in/" in linkedin:
+            keys.append(f"linkedin:{linkedin}")
+        name = " ".join((contact.get("full_name") or "").lower().split())
+        if name:
+            keys.append(f"name:{name}")
+        if not keys and shared_email:
+            keys.append(shared_email)
+        return keys
+
+    def _fill(self, existing: Dict[str, Any], contact: Dict[str, Any]) -> None:
+        """用 contact 补全 existing 缺失的字段，confidence_score 取最大值"""
+        for field in self.FIELDS:
+            if not existing.get(field) and contact.get(field):
+                existing[field] = contact.get(field)
+        existing["confidence_score"] = max(
+            existing["confidence_score"],
+            float(contact.get("confidence_score") or 0.0),
+        )
+
+    def _union(
+        self,
+        merged: List[Optional[Dict[str, Any]]],
+        key_index: Dict[str, int],
+        indices: Set[int],
+    ) -> int:
+        """
+        把多条记录并入最早出现的一条，被并入记录的键全部改指向保留的记录
+
+        Args:
+            merged: 合并结果（被并入的记录置为 None）
+            key_index: 去重键 -> 记录下标
+            indices: 需要合并的记录下标
+
+        Returns:
+            保留的记录下标
+        """
+        index = min(indices)
+        absorbed = indices - {index}
+        for other in sorted(absorbed):
+            self._fill(merged[index], merged[other])
+            merged[other] = None
+        if absorbed:
+            for key, value in key_index.items():
+                if value in absorbed:
+                    key_index[key] = index
+        return index
+
+    def merge(self, contact_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        合并多个分块的联系人列表
+
+        规则：
+        1. email、linkedin_url、full_name 任一键相同即视为同一联系人（可传递：
+           一条记录同时命中多个已有联系人时，这些联系人合并为一个）
+        2. 缺失字段由后出现的记录补全，已有字段不覆盖
+        3. confidence_score 取最大值
+        4. 输出顺序为联系人首次出现的顺序（与分块顺序一致）
+
+        Args:
+            contact_lists: 每个分块提取出的联系人列表
+
+        Returns:
+            合并后的联系人列表
+        """
+        merged: List[Optional[Dict[str, Any]]] = []
+        key_index: Dict[str, int] = {}
+
+        for contacts in contact_lists:
+            for contact in contacts or []:
+                if not isinstance(contact, dict):
+                    continue
+
+                keys = self._keys(contact)
+                if not keys:
+                    continue
+
+                indices = {key_index[k] for k in keys if k in key_index}
+                if not indices:
+                    index = len(merged)
+                    merged.append(
+                        {
+                            **{field: contact.get(field) for field in self.FIELDS},
+                            "confidence_score": float(
+                                contact.get("confidence_score") or 0.0
+                            ),
+                        }
+                    )
+                else:
+                    index = self._union(merged, key_index, indices)
+                    self._fill(merged[index], contact)
+
+                # 补全后的记录可能产生新的键；新键已指向其他记录时继续合并
+                while True:
+                    indices = {
+                        key_index.setdefault(key, index)
+                        for key in self._keys(merged[index])
+                    }
+                    if indices == {index}:
+                        break
+                    index = self._union(merged, key_index, indices | {index})
+
+        result = [contact for contact in merged if contact is not None]
+        logger.debug(
+            f"联系人合并完成: {sum(len(c or []) for c in contact_lists)} -> {len(result)}"
+        )
+        return result
+
+
+class CascadeStats:
+    """联系人提取级联统计：升级比例和节省的延迟"""
+
+    def __init__(self):
+        self.calls = 0
+        self.escalated = 0
+        self.fast_latency_total = 0.0
+        self.strong_latency_total = 0.0
+        self.reasons: Dict[str, int] = {}
+
+    def record(
+        self,
+        fast_latency: float,
+        strong_latency: Optional[float] = None,
+        reason: Optional[str] = None,
+    ) -> None:
+        """
+        记录一次级联提取
+
+        Args:
+            fast_latency: 快速模型耗时（秒）
+            strong_latency: 强模型耗时（秒），未升级时为 None
+            reason: 升级原因，未升级时为 None
+        """
+        self.calls += 1
+        self.fast_latency_total += fast_latency
+        if strong_latency is not None:
+            self.escalated += 1
+            self.strong_latency_total += strong_latency
+            if reason:
+                self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        获取统计摘要
+
+        节省的延迟按「未升级的调用数 ×（强模型平均耗时 - 快速模型平均耗时）
+        - 升级的调用数 × 快速模型平均耗时」估算（升级的调用先付出了快速模型的耗时），
+        为负数表示级联比直接使用强模型更慢；尚无升级样本时无法估算，返回 None。
+
+        Returns:
+            统计摘要字典
+        """
+        avg_fast = self.fast_latency_total / self.calls if self.calls else 0.0
+        avg_strong = (
+            self.strong_latency_total / self.escalated if self.escalated else None
+        )
+        latency_saved = None
+        if avg_strong is not None:
+            latency_saved = round(
+                (self.calls - self.escalated) * (avg_strong - avg_fast)
+                - self.escalated * avg_fast,
+                3,
+            )
+
+        return {
+            "calls": self.calls,
+            "escalated": self.escalated,
+            "escalation_rate": (
+                round(self.escalated / self.calls, 4) if self.calls else 0.0
+            ),
+            "avg_fast_latency": round(avg_fast, 3),
+            "avg_strong_latency": (
+                round(avg_strong, 3) if avg_strong is not None else None
+            ),
+            "estimated_latency_saved": latency_saved,
+            "reasons": dict(self.reasons),
+        }
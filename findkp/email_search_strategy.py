@@ -3,7 +3,7 @@
 负责生成基于域名的邮箱搜索查询，实现海外公司邮箱搜索策略。
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
 from logs import logger
 
@@ -240,3 +240,52 @@ class EmailSearchStrategy:
             f"生成了 {len(queries)} 个{department}部门邮箱搜索查询（域名: {domain}）"
         )
         return queries
+
+    def generate_department_search_plan(
+        self,
+        domain: str,
+        company_name_en: str,
+        departments: List[str],
+        country: Optional[str],
+        stages: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        为多个部门统一规划邮箱搜索查询
+
+        不同部门的 A1-A3、B2 等查询完全相同，只有岗位相关的查询不同。
+        统一规划后只需发送一次去重后的批量查询，再将结果按查询分发给各部门。
+
+        Args:
+            domain: 公司域名（如 "example.com"）
+            company_name_en: 公司英文名称
+            departments: 部门名称列表（如 ["采购", "销售"]）
+            country: 国家名称（可选）
+            stages: 控制执行哪些阶段，默认全部执行
+
+        Returns:
+            (去重后的查询参数列表, {部门: 该部门使用的查询字符串列表}) 元组
+        """
+        union_queries: List[Dict[str, Any]] = []
+        seen_queries = set()
+        department_query_keys: Dict[str, List[str]] = {}
+
+        for department in departments:
+            queries = self.generate_email_search_queries(
+                domain=domain,
+                company_name_en=company_name_en,
+                department=department,
+                country=country,
+                stages=stages,
+            )
+            department_query_keys[department] = [query["q"] for query in queries]
+            for query in queries:
+                if query["q"] not in seen_queries:
+                    seen_queries.add(query["q"])
+                    union_queries.append(query)
+
+        total = sum(len(keys) for keys in department_query_keys.values())
+        logger.info(
+            f"统一规划 {len(departments)} 个部门的邮箱搜索查询: "
+            f"{total} 个查询去重后为 {len(union_queries)} 个（域名: {domain}）"
+        )
+        return union_queries, department_query_keys
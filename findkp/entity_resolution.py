@@ -0,0 +1,342 @@
+"""进口商实体消歧
+
+海关数据中同一家公司有多种写法（"CONG TY TNHH ABC"、"ABC CO., LTD"、带或不带越南语声调等），
+在执行 FindKP 前将这些变体合并为一个规范公司：
+
+1. 名称规范化：去除声调、统一大小写和标点、去除公司法律形式后缀、词序排序
+2. 分块（blocking）：只比较至少共享一个区分词的名称，避免全量两两比较
+3. 按词比较：去除通用业务词（"thuong mai"、"trading" 等）后的区分词必须完全相同，
+   通用词的差异按较低权重计入相似度，相似度达到阈值即视为同一公司
+
+只有规范化名称相同（或同一条记录的英文名和本地名）的合并会持久化为别名映射，
+相似度合并只在本次运行中生效。
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.company_names import company_name_tokens, normalize_company_name
+from logs import logger
+
+# 通用业务词（不能区分公司），长短语在前
+GENERIC_TERMS = [
+    "xuat nhap khau",
+    "thuong mai",
+    "dich vu",
+    "san xuat",
+    "xuat khau",
+    "nhap khau",
+    "dau tu",
+    "phat trien",
+    "ky thuat",
+    "cong nghe",
+    "tap doan",
+    "import export",
+    "vietnam",
+    "trading",
+    "services",
+    "service",
+    "import",
+    "export",
+    "international",
+    "group",
+    "industrial",
+    "industry",
+    "technology",
+    "manufacturing",
+    "logistics",
+    "xnk",
+    "tm",
+    "dv",
+    "sx",
+]
+
+# 通用词在相似度中的权重（区分词为 1）
+GENERIC_WEIGHT = 0.1
+
+_GENERIC_TERMS_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in GENERIC_TERMS) + r")\b"
+)
+
+
+def distinctive_tokens(name: Optional[str]) -> FrozenSet[str]:
+    """
+    名称的区分词（去除法律形式词和通用业务词后剩下的词）
+
+    Example:
+        >>> sorted(distinctive_tokens("CONG TY TNHH THUONG MAI DICH VU AN PHAT"))
+        ['an', 'phat']
+    """
+    text = " ".join(company_name_tokens(name))
+    return frozenset(_GENERIC_TERMS_PATTERN.sub(" ", text).split())
+
+
+def name_similarity(name_a: str, name_b: str) -> float:
+    """
+    按词计算两个公司名称的相似度（0-1）
+
+    区分词不完全相同（或都没有区分词）时为 0；
+    否则为加权 Jaccard 相似度，通用词按 GENERIC_WEIGHT 计权。
+
+    Args:
+        name_a: 公司名称（原始名称或规范化名称）
+        name_b: 公司名称
+
+    Returns:
+        相似度
+
+    Example:
+        >>> name_similarity(
+        ...     "CONG TY TNHH THUONG MAI DICH VU AN PHAT",
+        ...     "CONG TY TNHH THUONG MAI DICH VU AN PHUC",
+        ... )
+        0.0
+        >>> name_similarity("CONG TY TNHH ABC VIET NAM", "CONG TY TNHH ABD VIET NAM")
+        0.0
+        >>> round(
+        ...     name_similarity("CONG TY TNHH ABC VIET NAM", "ABC TRADING VIETNAM CO., LTD"),
+        ...     3,
+        ... )
+        0.917
+    """
+    distinctive = distinctive_tokens(name_a)
+    if not distinctive or distinctive != distinctive_tokens(name_b):
+        return 0.0
+
+    tokens_a = set(company_name_tokens(name_a))
+    tokens_b = set(company_name_tokens(name_b))
+    generic_common = len((tokens_a & tokens_b) - distinctive)
+    generic_all = len((tokens_a | tokens_b) - distinctive)
+    return (len(distinctive) + GENERIC_WEIGHT * generic_common) / (
+        len(distinctive) + GENERIC_WEIGHT * generic_all
+    )
+
+
+class ImporterCluster:
+    """同一进口商的名称变体集合"""
+
+    def __init__(self, canonical_name_en: str, canonical_name_local: str):
+        self.canonical_name_en = canonical_name_en
+        self.canonical_name_local = canonical_name_local
+        self.variants: List[Tuple[str, str]] = []  # (name_en, name_local)
+        self.keys: List[str] = []  # 所有变体的规范化名称
+        # 与规范名称精确合并（规范化名称相同或已持久化）的规范化名称，可持久化为别名
+        self.exact_keys: List[str] = []
+
+    @property
+    def canonical(self) -> Tuple[str, str]:
+        return self.canonical_name_en, self.canonical_name_local
+
+
+class _UnionFind:
+    """并查集（先加入的根作为合并后的根）"""
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def add(self, key: str) -> None:
+        self.parent.setdefault(key, key)
+
+    def find(self, key: str) -> str:
+        parent = self.parent
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(self, key_a: str, key_b: str) -> None:
+        root_a, root_b = self.find(key_a), self.find(key_b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+
+class ImporterResolver:
+    """
+    进口商名称消歧器
+
+    使用并查集合并变体：规范化名称相同直接合并；
+    同一分块内区分词相同且相似度达到阈值的名称也合并（只在本次运行中生效）。
+    已持久化的别名映射作为种子节点参与合并，并优先作为规范名称。
+
+    Example:
+        >>> resolver = ImporterResolver()
+        >>> clusters = resolver.resolve(
+        ...     {
+        ...         ("CONG TY TNHH THUONG MAI DICH VU AN PHAT", ""): 3,
+        ...         ("CONG TY TNHH THUONG MAI DICH VU AN PHUC", ""): 2,
+        ...         ("CONG TY TNHH ABC VIET NAM", ""): 2,
+        ...         ("CONG TY TNHH ABD VIET NAM", ""): 1,
+        ...     }
+        ... )
+        >>> len(clusters)
+        4
+    """
+
+    # 词出现在超过该数量的名称中时不再作为分块键
+    MAX_BLOCK_SIZE = 200
+    # 分块键的最短长度
+    MIN_BLOCK_TOKEN_LENGTH = 2
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        known_aliases: Optional[Dict[str, Tuple[str, str]]] = None,
+    ):
+        """
+        初始化消歧器
+
+        Args:
+            threshold: 相似度阈值
+            known_aliases: 已持久化的别名映射 {规范化名称: (规范英文名, 规范本地名)}
+        """
+        self.threshold = threshold
+        self.known_aliases = known_aliases or {}
+
+    def _blocking_keys(self, name: str) -> List[str]:
+        """生成名称的分块键（区分词）"""
+        return [
+            token
+            for token in distinctive_tokens(name)
+            if len(token) >= self.MIN_BLOCK_TOKEN_LENGTH and not token.isdigit()
+        ]
+
+    def resolve(self, name_counts: Dict[Tuple[str, str], int]) -> List[ImporterCluster]:
+        """
+        将名称变体合并为规范公司
+
+        Args:
+            name_counts: {(name_en, name_local): 出现次数}
+
+        Returns:
+            规范公司列表（按合并后的总出现次数降序）
+        """
+        # 节点：每个规范化名称一个节点。exact 只包含精确合并，groups 还包含相似度合并
+        exact = _UnionFind()
+        groups_uf = _UnionFind()
+        # 每个规范化名称对应的一个原始名称（按原词序识别通用业务短语）
+        key_names: Dict[str, str] = {}
+
+        # 1. 每个变体的英文名和本地名的规范化结果属于同一公司
+        variant_keys: Dict[Tuple[str, str], List[str]] = {}
+        for name_en, name_local in name_counts:
+            keys = []
+            for name in (name_en, name_local):
+                key = normalize_company_name(name)
+                if key and key not in keys:
+                    keys.append(key)
+                    key_names.setdefault(key, name)
+            variant_keys[(name_en, name_local)] = keys
+            for uf in (exact, groups_uf):
+                for key in keys:
+                    uf.add(key)
+                for key in keys[1:]:
+                    uf.union(keys[0], key)
+
+        for key in self.known_aliases:
+            exact.add(key)
+            groups_uf.add(key)
+            key_names.setdefault(key, key)
+
+        # 已持久化的别名：映射到同一规范公司的别名合并
+        canonical_keys: Dict[Tuple[str, str], str] = {}
+        for key, canonical in self.known_aliases.items():
+            if canonical in canonical_keys:
+                exact.union(canonical_keys[canonical], key)
+                groups_uf.union(canonical_keys[canonical], key)
+            else:
+                canonical_keys[canonical] = key
+
+        # 2. 按区分词分块后在块内做相似度比较
+        blocks: Dict[str, List[str]] = defaultdict(list)
+        for key, name in key_names.items():
+            for block_key in self._blocking_keys(name):
+                blocks[block_key].append(key)
+
+        compared = set()
+        comparisons = 0
+        for block_key, keys in blocks.items():
+            if len(keys) > self.MAX_BLOCK_SIZE:
+                logger.debug(f"分块 '{block_key}' 过大（{len(keys)}），跳过")
+                continue
+            for i, key_a in enumerate(keys):
+                for key_b in keys[i + 1 :]:
+                    pair = (key_a, key_b) if key_a < key_b else (key_b, key_a)
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    comparisons += 1
+                    if (
+                        groups_uf.find(key_a) != groups_uf.find(key_b)
+                        and name_similarity(key_names[key_a], key_names[key_b])
+                        >= self.threshold
+                    ):
+                        groups_uf.union(key_a, key_b)
+
+        # 3. 生成规范公司
+        groups: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for variant, keys in variant_keys.items():
+            if keys:
+                groups[groups_uf.find(keys[0])].append(variant)
+
+        group_keys: Dict[str, List[str]] = defaultdict(list)
+        for key in groups_uf.parent:
+            group_keys[groups_uf.find(key)].append(key)
+
+        clusters = []
+        for root, variants in groups.items():
+            keys = group_keys[root]
+            anchor = next((key for key in keys if key in self.known_aliases), None)
+            if anchor is not None:
+                canonical = self.known_aliases[anchor]
+            else:
+                # 出现次数最多的变体作为规范名称，次数相同时取较长的英文名
+                canonical = max(variants, key=lambda v: (name_counts[v], len(v[0]), v))
+                anchor = variant_keys[canonical][0]
+            cluster = ImporterCluster(*canonical)
+            cluster.variants = sorted(variants)
+            cluster.keys = sorted(keys)
+            cluster.exact_keys = sorted(
+                key for key in keys if exact.find(key) == exact.find(anchor)
+            )
+            clusters.append(cluster)
+
+        clusters.sort(
+            key=lambda c: (-sum(name_counts[v] for v in c.variants), c.canonical)
+        )
+        logger.info(
+            f"进口商消歧: {len(name_counts)} 个名称变体合并为 {len(clusters)} 个公司"
+            f"（相似度比较 {comparisons} 次）"
+        )
+        return clusters
+
+
+def build_alias_rows(
+    clusters: Iterable[ImporterCluster],
+    known_aliases: Dict[str, Tuple[str, str]],
+) -> List[Dict[str, str]]:
+    """
+    生成需要持久化的新别名映射
+
+    只持久化与规范名称精确合并的规范化名称；相似度合并的变体不持久化，
+    避免一次误合并永久阻止该进口商被单独处理。
+
+    Args:
+        clusters: 规范公司列表
+        known_aliases: 已持久化的别名映射
+
+    Returns:
+        别名行数据列表（alias_key、canonical_name_en、canonical_name_local）
+    """
+    rows = []
+    for cluster in clusters:
+        for key in cluster.exact_keys:
+            if key not in known_aliases:
+                rows.append(
+                    {
+                        "alias_key": key,
+                        "canonical_name_en": cluster.canonical_name_en,
+                        "canonical_name_local": cluster.canonical_name_local,
+                    }
+                )
+    return rows
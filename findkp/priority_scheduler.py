@@ -0,0 +1,190 @@
+"""批量 FindKP 价值优先调度
+
+根据 trade_records 的聚合数据为每个进口商计算价值分数，
+让有限的搜索/LLM 预算优先用于高价值客户：
+
+- 出货次数（shipments）：对数缩放后按最大值归一化
+- 美元总额（usd）：对数缩放后按最大值归一化
+- 最近交易（recency）：按距最后交易日期的天数指数衰减（半衰期可配置）
+- HS 编码匹配（hs_match）：匹配目标产品 HS 编码前缀的出货占比
+
+分数按列批量计算：先把聚合结果整理为列，再对每一列统一归一化。
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from logs import logger
+
+# 默认权重
+DEFAULT_WEIGHTS = {
+    "shipments": 0.25,
+    "usd": 0.4,
+    "recency": 0.2,
+    "hs_match": 0.15,
+}
+
+
+class ImporterScore:
+    """进口商聚合指标和价值分数"""
+
+    def __init__(
+        self,
+        name_en: str,
+        name_local: str,
+        shipments: int = 0,
+        total_usd: float = 0.0,
+        last_trade_date: Optional[datetime] = None,
+        hs_matched: int = 0,
+    ):
+        self.name_en = name_en
+        self.name_local = name_local
+        self.shipments = shipments
+        self.total_usd = total_usd
+        self.last_trade_date = last_trade_date
+        self.hs_matched = hs_matched
+        self.score = 0.0
+        self.components: Dict[str, float] = {}
+
+    def merge(
+        self,
+        shipments: int,
+        total_usd: float,
+        last_trade_date: Optional[datetime],
+        hs_matched: int,
+    ) -> None:
+        """合并另一个名称变体的聚合指标"""
+        self.shipments += shipments
+        self.total_usd += total_usd
+        self.hs_matched += hs_matched
+        if last_trade_date and (
+            self.last_trade_date is None or last_trade_date > self.last_trade_date
+        ):
+            self.last_trade_date = last_trade_date
+
+
+class PriorityScorer:
+    """进口商价值评分器"""
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        recency_half_life_days: float = 90.0,
+        hs_match_enabled: bool = True,
+        now: Optional[datetime] = None,
+    ):
+        """
+        初始化评分器
+
+        Args:
+            weights: 各指标权重（缺失的指标使用默认权重）
+            recency_half_life_days: 最近交易得分的半衰期（天）
+            hs_match_enabled: 是否计入 HS 编码匹配（未配置目标 HS 编码时应关闭）
+            now: 计算最近交易的参考时间，默认当前时间
+        """
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if not hs_match_enabled:
+            self.weights["hs_match"] = 0.0
+        self.recency_half_life_days = max(1.0, recency_half_life_days)
+        self.now = now or datetime.now()
+
+    @staticmethod
+    def _log_normalize(values: List[float]) -> List[float]:
+        """对数缩放后按最大值归一化到 0-1"""
+        scaled = [math.log1p(max(value, 0.0)) for value in values]
+        peak = max(scaled, default=0.0)
+        if peak <= 0:
+            return [0.0] * len(values)
+        return [value / peak for value in scaled]
+
+    def _recency(self, dates: List[Optional[datetime]]) -> List[float]:
+        """按距最后交易日期的天数指数衰减"""
+        scores = []
+        for date in dates:
+            if date is None:
+                scores.append(0.0)
+                continue
+            days = max((self.now - date.replace(tzinfo=None)).days, 0)
+            scores.append(0.5 ** (days / self.recency_half_life_days))
+        return scores
+
+    def score(self, importers: List[ImporterScore]) -> List[ImporterScore]:
+        """
+        批量计算价值分数，并按分数降序排序
+
+        Args:
+            importers: 进口商聚合指标列表
+
+        Returns:
+            按分数降序排序的列表（分数相同时按美元总额降序）
+        """
+        if not importers:
+            return []
+
+        columns = {
+            "shipments": self._log_normalize([i.shipments for i in importers]),
+            "usd": self._log_normalize([i.total_usd for i in importers]),
+            "recency": self._recency([i.last_trade_date for i in importers]),
+            "hs_match": [
+                i.hs_matched / i.shipments if i.shipments else 0.0 for i in importers
+            ],
+        }
+        total_weight = sum(self.weights.get(name, 0.0) for name in columns) or 1.0
+
+        for index, importer in enumerate(importers):
+            importer.components = {
+                name: round(values[index], 4) for name, values in columns.items()
+            }
+            importer.score = round(
+                sum(
+                    self.weights.get(name, 0.0) * values[index]
+                    for name, values in columns.items()
+                )
+                / total_weight,
+                4,
+            )
+
+        return sorted(importers, key=lambda i: (-i.score, -i.total_usd, i.name_en))
+
+
+def select_importers(
+    importers: Iterable[ImporterScore],
+    top: Optional[int] = None,
+    min_usd: Optional[float] = None,
+) -> List[ImporterScore]:
+    """
+    按 --min-usd 和 --top 过滤已排序的进口商
+
+    Args:
+        importers: 按分数降序排序的进口商
+        top: 只保留前 N 个
+        min_usd: 美元总额下限
+
+    Returns:
+        过滤后的进口商列表
+    """
+    selected = [
+        importer
+        for importer in importers
+        if min_usd is None or importer.total_usd >= min_usd
+    ]
+    if top is not None:
+        selected = selected[: max(top, 0)]
+    logger.info(f"价值优先调度: 选出 {len(selected)} 个进口商")
+    return selected
+
+
+def format_score(importer: ImporterScore) -> Dict[str, Any]:
+    """生成用于日志输出的分数摘要"""
+    return {
+        "score": importer.score,
+        "shipments": importer.shipments,
+        "total_usd": round(importer.total_usd, 2),
+        "last_trade_date": (
+            importer.last_trade_date.date().isoformat()
+            if importer.last_trade_date
+            else None
+        ),
+        "hs_matched": importer.hs_matched,
+    }
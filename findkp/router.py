@@ -1,6 +1,6 @@
 """FindKP API 路由"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.connection import get_db
 from schemas.contact import CompanyQuery, FindKPResponse
@@ -10,18 +10,33 @@ from logs import logger
 # 创建路由
 router = APIRouter(prefix="/findkp", tags=["FindKP"])
 
-# 创建服务实例
-service = FindKPService()
+
+def get_service(request: Request) -> FindKPService:
+    """
+    FastAPI 依赖项，返回应用共享的 FindKPService
+
+    服务在应用启动时由 lifespan 创建（见 main.py）；
+    未经过 lifespan 的应用（如单独挂载路由）在首次请求时创建。
+    """
+    service = getattr(request.app.state, "findkp_service", None)
+    if service is None:
+        service = request.app.state.findkp_service = FindKPService()
+    return service
 
 
 @router.post("/search", response_model=FindKPResponse)
-async def find_kp(request: CompanyQuery, db: AsyncSession = Depends(get_db)):
+async def find_kp(
+    request: CompanyQuery,
+    db: AsyncSession = Depends(get_db),
+    service: FindKPService = Depends(get_service),
+):
     """
     搜索公司的关键联系人(KP)
 
     Args:
         request: 包含公司名称的请求
         db: 异步数据库会话
+        service: FindKP 服务
 
     Returns:
         FindKPResponse: 包含公司信息和联系人列表
@@ -3,13 +3,26 @@
 import json
 import re
 import asyncio
+import time
 from typing import List, Dict, Optional, Any, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from llm import get_llm
+from llm import ReplayMissError, get_llm_for_task, llm_router
+from llm.usage import (
+    record_llm_usage,
+    reset_usage_company,
+    set_usage_company,
+    unwrap_structured,
+)
 from database.repository import Repository
 from database.models import CompanyStatus, Company
 from schemas.contact import KPInfo, ContactsResponse, CompanyInfoResponse
-from core.search import SerperSearchProvider, GoogleSearchProvider
+from core.metrics import record_cache, span, timed
+from core.search import (
+    BaseSearchProvider,
+    SerperSearchProvider,
+    GoogleSearchProvider,
+    ReplaySearchProvider,
+)
 from prompts.findkp.FINDKP_PROMPT import (
     EXTRACT_COMPANY_INFO_PROMPT,
     EXTRACT_CONTACTS_PROMPT,
@@ -17,6 +30,7 @@ from prompts.findkp.FINDKP_PROMPT import (
 from .search_strategy import SearchStrategy
 from .email_search_strategy import EmailSearchStrategy
 from .result_aggregator import ResultAggregator
+from .contact_extraction import ResultChunker, ContactMerger, CascadeStats
 from config import settings
 from logs import logger, log_llm_request, log_llm_response
 
@@ -28,15 +42,61 @@ class FindKPService:
     EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
 
     def __init__(self):
-        # 使用统一的 LLM 工厂函数（自动路由到 OpenRouter 或直接调用）
-        self.llm = get_llm()
-        # 初始化多个搜索提供者
-        self.serper_provider = SerperSearchProvider()
-        self.google_provider = GoogleSearchProvider()
+        # 按任务类型获取 LLM（提取类任务默认使用便宜/快速的模型）
+        self.company_info_llm = get_llm_for_task("extract_company_info")
+        self.contacts_llm = get_llm_for_task("extract_contacts")
+        # 联系人提取级联：快速模型结果不可靠时升级到强模型
+        self.strong_contacts_llm = None
+        if settings.FINDKP_CASCADE_ENABLED:
+            fast_model = llm_router.get_task_config("extract_contacts")["model"]
+            strong_model = llm_router.get_task_config("extract_contacts_strong")[
+                "model"
+            ]
+            if fast_model == strong_model:
+                # 未配置 LLM_EXTRACT_MODEL 时两者相同，升级只会用同一模型重复调用
+                logger.warning(
+                    f"联系人提取级联的快速模型与强模型相同（{fast_model}），已跳过级联；"
+                    "请配置 LLM_EXTRACT_MODEL 或 LLM_TASK_ROUTES"
+                )
+            else:
+                self.strong_contacts_llm = get_llm_for_task("extract_contacts_strong")
+        self.cascade_stats = CascadeStats()
+        # 初始化多个搜索提供者（配置了回放快照时全部使用离线回放，不访问网络）
+        if settings.SEARCH_REPLAY_SNAPSHOT:
+            self.serper_provider = ReplaySearchProvider.from_snapshot(
+                settings.SEARCH_REPLAY_SNAPSHOT,
+                latency=settings.SEARCH_REPLAY_LATENCY,
+                jitter=settings.SEARCH_REPLAY_JITTER,
+            )
+            self.google_provider = self.serper_provider
+        else:
+            self.serper_provider = SerperSearchProvider()
+            self.google_provider = GoogleSearchProvider()
         # 初始化搜索策略和结果聚合器
         self.search_strategy = SearchStrategy()
         self.email_search_strategy = EmailSearchStrategy()
         self.result_aggregator = ResultAggregator()
+        # 初始化联系人分块提取工具（map-reduce）
+        self.result_chunker = ResultChunker(settings.FINDKP_EXTRACT_CHUNK_TOKENS)
+        self.contact_merger = ContactMerger()
+
+    def _search_providers(self) -> List[BaseSearchProvider]:
+        """去重后的搜索提供者（回放模式下两个属性是同一个实例）"""
+        providers = [self.serper_provider]
+        if self.google_provider is not self.serper_provider:
+            providers.append(self.google_provider)
+        return providers
+
+    async def warmup(self) -> None:
+        """预先建立搜索提供者的 HTTP 连接（API 启动时调用）"""
+        await asyncio.gather(
+            *(provider.warmup() for provider in self._search_providers())
+        )
+
+    async def aclose(self) -> None:
+        """关闭搜索提供者的共享 HTTP 客户端"""
+        for provider in self._search_providers():
+            await provider.aclose()
 
     def _extract_json_from_text(self, text: str) -> Optional[str]:
         """
@@ -290,6 +350,7 @@ class FindKPService:
 
         return filtered
 
+    @timed("findkp", "public_emails")
     async def _extract_and_save_public_emails(
         self,
         company: Company,
@@ -329,7 +390,9 @@ class FindKPService:
         except Exception as e:
             logger.error(f"保存公共邮箱失败: {e}", exc_info=True)
 
-    async def extract_contacts_with_llm(self, prompt: str) -> Dict:
+    async def extract_contacts_with_llm(
+        self, prompt: str, llm: Optional[Any] = None
+    ) -> Dict:
         """
         使用 LLM 提取联系人信息（结构化输出版本）
 
@@ -338,16 +401,18 @@ class FindKPService:
 
         Args:
             prompt: 提示词
+            llm: 使用的 LLM 实例，默认使用联系人提取任务的 LLM
 
         Returns:
             包含 contacts 列表的字典格式
         """
+        llm = llm or self.contacts_llm
         try:
             # 记录 LLM 请求
             messages = [{"role": "user", "content": prompt}]
             model_name = (
-                getattr(self.llm, "model_name", None)
-                or getattr(self.llm, "model", None)
+                getattr(llm, "model_name", None)
+                or getattr(llm, "model", None)
                 or "unknown"
             )
             request_log_path = log_llm_request(
@@ -357,8 +422,10 @@ class FindKPService:
             )
 
             # 使用结构化输出，直接返回 Pydantic 模型
-            structured_llm = self.llm.with_structured_output(ContactsResponse)
-            result = await structured_llm.ainvoke(messages)
+            structured_llm = llm.with_structured_output(
+                ContactsResponse, include_raw=True
+            )
+            result, raw = unwrap_structured(await structured_llm.ainvoke(messages))
 
             # 记录 LLM 响应
             if hasattr(result, "model_dump"):
@@ -368,11 +435,15 @@ class FindKPService:
             else:
                 response_content = str(result)
 
+            usage = record_llm_usage(
+                "extract_contacts", model_name, messages, raw, response_content
+            )
             log_llm_response(
                 response_content=response_content,
                 request_log_path=request_log_path,
                 model=model_name,
                 task_type="extract_contacts",
+                usage=usage,
             )
 
             # result 已经是 ContactsResponse 实例，直接转换
@@ -401,12 +472,16 @@ class FindKPService:
                 logger.warning(f"LLM 返回了意外的类型: {type(result)}")
                 return {"contacts": []}
 
+        except ReplayMissError:
+            # 回放未命中必须失败，不能降级为空结果
+            raise
         except Exception as e:
             logger.error(f"LLM 结构化输出提取联系人失败: {e}", exc_info=True)
             # 降级到旧的 JSON 解析方法
             logger.info("降级到旧的 JSON 解析方法")
-            return await self.extract_with_llm(prompt)
+            return await self.extract_with_llm(prompt, llm=llm)
 
+    @timed("findkp", "llm_company_info")
     async def extract_company_info_with_llm(self, prompt: str) -> Dict:
         """
         使用 LLM 提取公司信息（结构化输出版本）
@@ -424,8 +499,8 @@ class FindKPService:
             # 记录 LLM 请求
             messages = [{"role": "user", "content": prompt}]
             model_name = (
-                getattr(self.llm, "model_name", None)
-                or getattr(self.llm, "model", None)
+                getattr(self.company_info_llm, "model_name", None)
+                or getattr(self.company_info_llm, "model", None)
                 or "unknown"
             )
             request_log_path = log_llm_request(
@@ -435,8 +510,10 @@ class FindKPService:
             )
 
             # 使用结构化输出，直接返回 Pydantic 模型
-            structured_llm = self.llm.with_structured_output(CompanyInfoResponse)
-            result = await structured_llm.ainvoke(messages)
+            structured_llm = self.company_info_llm.with_structured_output(
+                CompanyInfoResponse, include_raw=True
+            )
+            result, raw = unwrap_structured(await structured_llm.ainvoke(messages))
 
             # 记录 LLM 响应
             if hasattr(result, "model_dump"):
@@ -444,11 +521,15 @@ class FindKPService:
             else:
                 response_content = str(result)
 
+            usage = record_llm_usage(
+                "extract_company_info", model_name, messages, raw, response_content
+            )
             log_llm_response(
                 response_content=response_content,
                 request_log_path=request_log_path,
                 model=model_name,
                 task_type="extract_company_info",
+                usage=usage,
             )
 
             # result 已经是 CompanyInfoResponse 实例，直接转换
@@ -461,13 +542,15 @@ class FindKPService:
                 logger.warning(f"LLM 返回了意外的类型: {type(result)}")
                 return {}
 
+        except ReplayMissError:
+            raise
         except Exception as e:
             logger.error(f"LLM 结构化输出提取公司信息失败: {e}", exc_info=True)
             # 降级到旧的 JSON 解析方法
             logger.info("降级到旧的 JSON 解析方法")
-            return await self.extract_with_llm(prompt)
+            return await self.extract_with_llm(prompt, llm=self.company_info_llm)
 
-    async def extract_with_llm(self, prompt: str) -> Dict:
+    async def extract_with_llm(self, prompt: str, llm: Optional[Any] = None) -> Dict:
         """
         使用 LLM 提取结构化信息（异步版本）
 
@@ -479,16 +562,18 @@ class FindKPService:
 
         Args:
             prompt: 提示词
+            llm: 使用的 LLM 实例，默认使用联系人提取任务的 LLM
 
         Returns:
             提取的结构化数据（字典格式）
         """
+        llm = llm or self.contacts_llm
         try:
             # 记录 LLM 请求
             messages = [{"role": "user", "content": prompt}]
             model_name = (
-                getattr(self.llm, "model_name", None)
-                or getattr(self.llm, "model", None)
+                getattr(llm, "model_name", None)
+                or getattr(llm, "model", None)
                 or "unknown"
             )
             request_log_path = log_llm_request(
@@ -498,7 +583,7 @@ class FindKPService:
             )
 
             # 使用 LangChain V1 的异步调用方式
-            response = await self.llm.ainvoke(messages)
+            response = await llm.ainvoke(messages)
 
             # 检查响应是否有效
             if not response:
@@ -524,11 +609,13 @@ class FindKPService:
             content = response.content
 
             # 记录 LLM 响应
+            usage = record_llm_usage("extract_with_llm", model_name, messages, response)
             log_llm_response(
                 response_content=content,
                 request_log_path=request_log_path,
                 model=model_name,
                 task_type="extract_with_llm",
+                usage=usage,
             )
 
             # 检查内容是否为空
@@ -555,10 +642,178 @@ class FindKPService:
                 logger.warning(f"LLM 返回了意外的类型: {type(result)}")
                 return {}
 
+        except ReplayMissError:
+            raise
         except Exception as e:
             logger.error(f"LLM 提取信息失败: {e}", exc_info=True)
             return {}
 
+    def _get_escalation_reason(
+        self, contacts_result: Dict, results: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """
+        判断快速模型的联系人提取结果是否需要升级到强模型
+
+        升级条件：
+        1. 校验失败：contacts 不是列表、元素不是字典、邮箱格式无效或置信度越界
+        2. 置信度过低：最高置信度低于 FINDKP_CASCADE_MIN_CONFIDENCE
+        3. 与正则结果冲突：LLM 返回了搜索结果中不存在的邮箱，
+           或正则找到了个人邮箱但 LLM 未返回任何邮箱
+
+        Args:
+            contacts_result: 快速模型返回的 {"contacts": [...]} 字典
+            results: 本次提取使用的搜索结果
+
+        Returns:
+            升级原因，无需升级时返回 None
+        """
+        contacts = contacts_result.get("contacts") if contacts_result else None
+        if not isinstance(contacts, list):
+            return "invalid_output"
+
+        llm_emails = set()
+        max_confidence = 0.0
+        for contact in contacts:
+            if not isinstance(contact, dict):
+                return "invalid_output"
+            email = contact.get("email")
+            if email:
+                if not re.fullmatch(self.EMAIL_REGEX, email):
+                    return "invalid_email"
+                llm_emails.add(email.lower())
+            try:
+                confidence = float(contact.get("confidence_score") or 0.0)
+            except (TypeError, ValueError):
+                return "invalid_output"
+            if not 0.0 <= confidence <= 1.0:
+                return "invalid_output"
+            max_confidence = max(max_confidence, confidence)
+
+        if contacts and max_confidence < settings.FINDKP_CASCADE_MIN_CONFIDENCE:
+            return "low_confidence"
+
+        snippet_emails = {
+            e.lower() for e in self._extract_emails_from_snippets(results)
+        }
+        if llm_emails - snippet_emails:
+            return "email_not_in_results"
+
+        personal_emails = snippet_emails - {
+            e.lower() for e in self._filter_public_emails(list(snippet_emails))
+        }
+        if personal_emails and not llm_emails:
+            return "missed_regex_emails"
+
+        return None
+
+    async def _extract_contacts_with_cascade(
+        self, prompt: str, results: List[Dict[str, Any]]
+    ) -> Dict:
+        """
+        级联提取联系人：先使用快速模型，结果不可靠时升级到强模型
+
+        未启用级联（FINDKP_CASCADE_ENABLED=False）时直接使用快速模型。
+
+        Args:
+            prompt: 提示词
+            results: 提示词中包含的搜索结果（用于和正则提取的邮箱交叉校验）
+
+        Returns:
+            包含 contacts 列表的字典格式
+        """
+        if not self.strong_contacts_llm:
+            return await self.extract_contacts_with_llm(prompt)
+
+        start = time.perf_counter()
+        fast_result = await self.extract_contacts_with_llm(prompt)
+        fast_latency = time.perf_counter() - start
+
+        reason = self._get_escalation_reason(fast_result, results)
+        if reason is None:
+            self.cascade_stats.record(fast_latency)
+            return fast_result
+
+        logger.info(f"联系人提取升级到强模型，原因: {reason}")
+        start = time.perf_counter()
+        strong_result = await self.extract_contacts_with_llm(
+            prompt, llm=self.strong_contacts_llm
+        )
+        strong_latency = time.perf_counter() - start
+        self.cascade_stats.record(fast_latency, strong_latency, reason)
+        logger.debug(f"联系人提取级联统计: {self.cascade_stats.summary()}")
+
+        # 强模型未返回有效结果时保留快速模型的结果
+        if not isinstance(strong_result.get("contacts"), list):
+            return fast_result
+        return strong_result
+
+    @timed("findkp", "llm_contacts")
+    async def _extract_contacts_map_reduce(
+        self,
+        results: List[Dict[str, Any]],
+        department: str,
+        country_context: str,
+    ) -> Dict:
+        """
+        分块提取联系人（map-reduce）
+
+        搜索结果超过单个分块的 token 上限时，将结果切分为多个分块，
+        并发调用 LLM 提取联系人，再合并去重；否则直接单次提取。
+
+        Args:
+            results: 聚合后的搜索结果列表
+            department: 部门名称（"采购" 或 "销售"）
+            country_context: 国家上下文字符串
+
+        Returns:
+            包含 contacts 列表的字典格式
+        """
+
+        def build_prompt(chunk: List[Dict[str, Any]]) -> str:
+            return EXTRACT_CONTACTS_PROMPT.format(
+                department=department,
+                country_context=country_context,
+                search_results=json.dumps(chunk, ensure_ascii=False),
+            )
+
+        chunks = self.result_chunker.split(results)
+        if not settings.FINDKP_MAP_REDUCE_ENABLED or len(chunks) <= 1:
+            return await self._extract_contacts_with_cascade(
+                build_prompt(results), results
+            )
+
+        logger.info(
+            f"搜索结果较多（{len(results)} 条），分为 {len(chunks)} 个分块并发提取联系人"
+        )
+        semaphore = asyncio.Semaphore(max(1, settings.FINDKP_EXTRACT_MAX_CONCURRENCY))
+
+        async def extract_chunk(chunk: List[Dict[str, Any]]) -> Dict:
+            async with semaphore:
+                return await self._extract_contacts_with_cascade(
+                    build_prompt(chunk), chunk
+                )
+
+        chunk_results = await asyncio.gather(
+            *(extract_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        contact_lists = []
+        for idx, chunk_result in enumerate(chunk_results):
+            if isinstance(chunk_result, ReplayMissError):
+                raise chunk_result
+            if isinstance(chunk_result, Exception):
+                logger.error(f"分块 {idx} 提取联系人失败: {chunk_result}")
+                continue
+            contacts = chunk_result.get("contacts", [])
+            if isinstance(contacts, list):
+                contact_lists.append(contacts)
+
+        merged_contacts = self.contact_merger.merge(contact_lists)
+        logger.info(
+            f"分块提取完成: {len(chunks)} 个分块, 合并后 {len(merged_contacts)} 个联系人"
+        )
+        return {"contacts": merged_contacts}
+
     def _get_country_context(self, country: Optional[str]) -> str:
         """
         生成国家上下文信息，用于 Prompt
@@ -573,6 +828,7 @@ class FindKPService:
             return f"这是一家位于 {country} 的公司。"
         return ""
 
+    @timed("findkp", "search")
     async def _search_with_multiple_providers(
         self, queries: List[Dict[str, Any]], db: Optional[AsyncSession] = None
     ) -> Dict[str, List]:
@@ -644,6 +900,7 @@ class FindKPService:
         department: str,
         country_context: str,
         db: Optional[AsyncSession] = None,
+        results_map: Optional[Dict[str, List]] = None,
     ) -> Dict[str, List]:
         """
         搜索联系人（采购或销售），支持邮箱搜索策略
@@ -656,6 +913,8 @@ class FindKPService:
             department: 部门名称（"采购" 或 "销售"）
             country_context: 国家上下文字符串
             db: 可选的数据库会话
+            results_map: 已完成的搜索结果（多部门共享批量搜索时传入），
+                         传入时跳过搜索，直接聚合并提取联系人
 
         Returns:
             包含 contacts 和 results 的字典
@@ -667,24 +926,25 @@ class FindKPService:
                 + (f" [域名: {domain}]" if domain else "")
             )
 
-            # 如果 domain 存在，使用邮箱搜索策略（阶段1-4）
-            if domain:
-                logger.info(f"使用邮箱搜索策略（域名: {domain}）")
-                queries = self.email_search_strategy.generate_email_search_queries(
-                    domain=domain,
-                    company_name_en=company_name_en,
-                    department=department,
-                    country=country,
-                )
-            else:
-                # 回退到原有的联系人搜索策略
-                logger.info("使用原有联系人搜索策略（无域名）")
-                queries = self.search_strategy.generate_contact_queries(
-                    company_name_en, company_name_local, country, department
-                )
+            if results_map is None:
+                # 如果 domain 存在，使用邮箱搜索策略（阶段1-4）
+                if domain:
+                    logger.info(f"使用邮箱搜索策略（域名: {domain}）")
+                    queries = self.email_search_strategy.generate_email_search_queries(
+                        domain=domain,
+                        company_name_en=company_name_en,
+                        department=department,
+                        country=country,
+                    )
+                else:
+                    # 回退到原有的联系人搜索策略
+                    logger.info("使用原有联系人搜索策略（无域名）")
+                    queries = self.search_strategy.generate_contact_queries(
+                        company_name_en, company_name_local, country, department
+                    )
 
-            # 使用选择的搜索工具搜索（优先 Serper，失败则 Google）
-            results_map = await self._search_with_multiple_providers(queries, db=db)
+                # 使用选择的搜索工具搜索（优先 Serper，失败则 Google）
+                results_map = await self._search_with_multiple_providers(queries, db=db)
 
             # 聚合结果
             aggregated_results = self.result_aggregator.aggregate(results_map)
@@ -695,13 +955,9 @@ class FindKPService:
                 for r in aggregated_results
             ]
 
-            # LLM 提取联系人（使用结构化输出）
-            contacts_result = await self.extract_contacts_with_llm(
-                EXTRACT_CONTACTS_PROMPT.format(
-                    department=department,
-                    country_context=country_context,
-                    search_results=json.dumps(results, ensure_ascii=False),
-                )
+            # LLM 提取联系人（使用结构化输出，结果过多时分块并发提取）
+            contacts_result = await self._extract_contacts_map_reduce(
+                results, department, country_context
             )
 
             # 处理 LLM 返回的联系人数据
@@ -728,11 +984,14 @@ class FindKPService:
 
             return {"contacts": contacts, "results": results}
 
+        except ReplayMissError:
+            raise
         except Exception as e:
             logger.error(f"搜索{department}部门联系人失败: {e}", exc_info=True)
             # 确保总是返回有效的字典
             return {"contacts": [], "results": []}
 
+    @timed("findkp", "company_info")
     async def _search_and_save_company_info(
         self,
         company_name_en: str,
@@ -766,6 +1025,8 @@ class FindKPService:
             country=country,
             local_name=company_name_local,
         )
+        # 之后的 LLM 调用用量关联到该公司
+        set_usage_company(company.id)
         country_context = self._get_country_context(country)
 
         # 定义查询顺序：优先本地名，回退英文名
@@ -856,6 +1117,7 @@ class FindKPService:
         await db.commit()
         return company
 
+    @timed("findkp", "contacts")
     async def _search_and_save_contacts(
         self,
         company: Company,
@@ -894,7 +1156,20 @@ class FindKPService:
             + (f" ({country})" if country else "")
         )
 
-        # 并行执行采购和销售搜索
+        # 统一规划两个部门的查询，去重后一次批量搜索，再按查询分发结果
+        union_queries, department_query_keys = (
+            self.email_search_strategy.generate_department_search_plan(
+                domain=company.domain,
+                company_name_en=company_name_en,
+                departments=["采购", "销售"],
+                country=country,
+            )
+        )
+        shared_results_map = await self._search_with_multiple_providers(
+            union_queries, db=db
+        )
+
+        # 并行执行采购和销售联系人提取
         procurement_task = self._search_contacts_parallel(
             company_name_en,
             company_name_local,
@@ -903,6 +1178,10 @@ class FindKPService:
             "采购",
             country_context,
             db,
+            results_map={
+                key: shared_results_map.get(key, [])
+                for key in department_query_keys["采购"]
+            },
         )
         sales_task = self._search_contacts_parallel(
             company_name_en,
@@ -912,12 +1191,21 @@ class FindKPService:
             "销售",
             country_context,
             db,
+            results_map={
+                key: shared_results_map.get(key, [])
+                for key in department_query_keys["销售"]
+            },
         )
 
         procurement_result, sales_result = await asyncio.gather(
             procurement_task, sales_task, return_exceptions=True
         )
 
+        # 回放未命中必须失败，不能当作"没有联系人"
+        for result in (procurement_result, sales_result):
+            if isinstance(result, ReplayMissError):
+                raise result
+
         # 处理异常情况和 None 值
         if isinstance(procurement_result, Exception):
             logger.error(f"采购部门搜索失败: {procurement_result}")
@@ -1006,37 +1294,55 @@ class FindKPService:
         # 4. 保存所有联系人（不再过滤没有 email 的联系人）
         valid_contacts = cleaned_contacts  # 保留所有有效联系人，即使没有 email
 
-        # 5. 批量保存联系人
+        # 5. 批量保存联系人（单次批量 INSERT，仓储层负责隔离坏行）
         all_contacts = []
         if valid_contacts:
             logger.info(f"批量保存 {len(valid_contacts)} 个联系人...")
+            # 转换为 KPInfo 对象列表（数据校验失败的联系人单独跳过）
+            kp_info_list = []
+            for contact_data in valid_contacts:
+                try:
+                    kp_info_list.append(KPInfo(**contact_data))
+                except Exception as e:
+                    logger.error(f"联系人数据无效，跳过: {e}, 数据: {contact_data}")
+
             try:
-                # 转换为 KPInfo 对象列表
-                kp_info_list = [
-                    KPInfo(**contact_data) for contact_data in valid_contacts
+                async with span("findkp", "db_save_contacts"):
+                    saved_contacts = await repo.create_contacts_batch(
+                        kp_info_list, company.id
+                    )
+                all_contacts = [
+                    self._contact_to_kp_info(contact) for contact in saved_contacts
                 ]
-                # 批量保存
-                saved_contacts = await repo.create_contacts_batch(
-                    kp_info_list, company.id
-                )
-                all_contacts = kp_info_list
                 logger.info(f"成功保存 {len(saved_contacts)} 个联系人")
             except Exception as e:
                 logger.error(f"批量保存联系人失败: {e}", exc_info=True)
-                # 降级为单个保存
-                logger.info("降级为单个保存模式...")
-                for contact_data in valid_contacts:
-                    try:
-                        kp_info = KPInfo(**contact_data)
-                        contact = await repo.create_contact(kp_info, company.id)
-                        all_contacts.append(kp_info)
-                        logger.debug(f"联系人已保存: {contact.email}")
-                    except Exception as e2:
-                        logger.error(f"保存联系人失败: {e2}, 数据: {contact_data}")
-                        continue
 
         return all_contacts
 
+    @staticmethod
+    def _contact_to_kp_info(contact) -> KPInfo:
+        """
+        将 Contact 对象转换为 KPInfo
+
+        Args:
+            contact: 联系人 ORM 对象
+
+        Returns:
+            KPInfo 对象
+        """
+        return KPInfo(
+            full_name=contact.full_name,
+            email=contact.email,
+            role=contact.role,
+            department=contact.department,
+            linkedin_url=contact.linkedin_url if contact.linkedin_url else None,
+            twitter_url=contact.twitter_url if contact.twitter_url else None,
+            source=contact.source or "N/A",
+            confidence_score=float(contact.confidence_score or 0.0),
+        )
+
+    @timed("findkp", "find_kps")
     async def find_kps(
         self,
         company_name_en: str,
@@ -1063,14 +1369,18 @@ class FindKPService:
             包含公司信息和联系人列表的字典
         """
         repo = Repository(db)
+        usage_token = set_usage_company(None)
 
         try:
             # 0. 检查缓存和状态
             company = await repo.get_company_by_name(company_name_en)
+            if company:
+                set_usage_company(company.id)
 
             # 如果公司状态为ignore，直接返回空结果
             if company and company.status == CompanyStatus.ignore:
                 logger.info(f"公司 {company_name_en} 已标记为ignore，跳过查询")
+                record_cache("findkp_company", hit=True)
                 return {
                     "company_id": company.id,
                     "company_domain": None,
@@ -1084,22 +1394,10 @@ class FindKPService:
 
                 if existing_contacts:
                     logger.info(f"找到 {len(existing_contacts)} 个现有联系人，直接返回")
+                    record_cache("findkp_company", hit=True)
                     # 将 Contact 对象转换为 KPInfo
                     kp_info_list = [
-                        KPInfo(
-                            full_name=contact.full_name,
-                            email=contact.email,
-                            role=contact.role,
-                            department=contact.department,
-                            linkedin_url=(
-                                contact.linkedin_url if contact.linkedin_url else None
-                            ),
-                            twitter_url=(
-                                contact.twitter_url if contact.twitter_url else None
-                            ),
-                            source=contact.source or "N/A",
-                            confidence_score=float(contact.confidence_score or 0.0),
-                        )
+                        self._contact_to_kp_info(contact)
                         for contact in existing_contacts
                     ]
                     return {
@@ -1112,6 +1410,7 @@ class FindKPService:
                     logger.info(
                         f"公司 {company_name_en} 已完成，但未找到联系人，仅搜索联系人..."
                     )
+                    record_cache("findkp_company", hit=False)
                     country_context = self._get_country_context(country)
 
                     # 更新公司状态为处理中
@@ -1142,6 +1441,8 @@ class FindKPService:
                         "contacts": all_contacts,
                     }
 
+            record_cache("findkp_company", hit=False)
+
             # 1. 查询公司信息（顺序查询，信息足够时提前停止）
             company = await self._search_and_save_company_info(
                 company_name_en,
@@ -1200,3 +1501,5 @@ class FindKPService:
             except Exception:
                 pass
             raise
+        finally:
+            reset_usage_company(usage_token)
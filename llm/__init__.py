@@ -5,8 +5,18 @@ LLM 模块 - 统一管理语言模型实例
 - OpenRouter（用于国外 API：OpenAI、Anthropic 等）
 - DeepSeek（国内 API，直接调用）
 - 预留 Qwen、Doubao 扩展支持
+- 按任务类型（task_type）路由到不同的模型配置
+- 回放 logs/llm 归档（model="replay"），用于离线、确定性的端到端测试
 """
 
-from .factory import get_llm, LLMRouter
+from .factory import get_llm, get_llm_for_task, LLMRouter, llm_router
+from .replay import ReplayLLM, ReplayMissError
 
-__all__ = ["get_llm", "LLMRouter"]
+__all__ = [
+    "get_llm",
+    "get_llm_for_task",
+    "LLMRouter",
+    "llm_router",
+    "ReplayLLM",
+    "ReplayMissError",
+]
@@ -4,15 +4,148 @@ LLM 工厂模块 - 根据模型名称自动路由到相应的 API 提供商
 
 import os
 from typing import Optional, Dict, Any, Tuple
-from langchain.chat_models import init_chat_model
 from config import settings
-from .glm_wrapper import GLMLLMWrapper
 
 from logs import logger
 
 
+def init_chat_model(**kwargs):
+    """
+    LangChain init_chat_model（延迟导入）
+
+    LangChain 及其 provider 包导入耗时较长，只在真正创建模型时导入，
+    避免 CLI 的 --help、查询类命令和只用回放模型的测试为此付出启动时间。
+    """
+    from langchain.chat_models import init_chat_model as _init_chat_model
+
+    return _init_chat_model(**kwargs)
+
+
 class LLMRouter:
-    """LLM 路由类，负责判断模型应该使用哪个提供商"""
+    """
+    LLM 路由类，负责判断模型应该使用哪个提供商，并按任务类型选择模型配置
+
+    每种任务类型（task_type）拥有独立的 model、temperature、max_tokens 和 timeout：
+    - 提取类任务（extract_*）默认使用 settings.LLM_EXTRACT_MODEL（便宜、快速）
+    - 写作类任务（generate_*）默认使用 settings.LLM_WRITER_MODEL（能力强）
+    - 级联升级任务（*_strong）默认使用 settings.LLM_MODEL
+    - settings.LLM_TASK_ROUTES 可按任务覆盖任意参数
+    - 以上均未配置时回退到 settings.LLM_MODEL / settings.LLM_TEMPERATURE
+    """
+
+    # 各任务类型的默认参数（temperature 默认沿用 settings.LLM_TEMPERATURE）
+    TASK_DEFAULTS: Dict[str, Dict[str, Any]] = {
+        "extract_company_info": {"max_tokens": 1024, "timeout": 60},
+        "extract_contacts": {"max_tokens": 2048, "timeout": 60},
+        "extract_contacts_strong": {"max_tokens": 2048, "timeout": 120},
+        "generate_email": {"max_tokens": 4096, "timeout": 180},
+        "generate_v4_email": {"max_tokens": 2048, "timeout": 120},
+    }
+
+    def __init__(self):
+        # 按 (model, temperature, max_tokens, timeout) 缓存 LLM 实例，相同配置的任务共享实例
+        self._cache: Dict[Tuple[Any, ...], Any] = {}
+
+    def get_task_config(self, task_type: str) -> Dict[str, Any]:
+        """
+        获取任务类型对应的模型配置
+
+        Args:
+            task_type: 任务类型（如 "extract_contacts", "generate_email"）
+
+        Returns:
+            包含 model, temperature, max_tokens, timeout 的字典
+        """
+        if task_type.endswith("_strong"):
+            # 级联升级使用的强模型，默认使用全局模型
+            group_model = settings.LLM_MODEL
+        elif task_type.startswith("extract"):
+            group_model = settings.LLM_EXTRACT_MODEL
+        elif task_type.startswith("generate"):
+            group_model = settings.LLM_WRITER_MODEL
+        else:
+            group_model = ""
+
+        config: Dict[str, Any] = {
+            "model": group_model or settings.LLM_MODEL,
+            "temperature": settings.LLM_TEMPERATURE,
+            "max_tokens": None,
+            "timeout": None,
+        }
+        config.update(self.TASK_DEFAULTS.get(task_type, {}))
+        config.update(settings.LLM_TASK_ROUTES.get(task_type, {}))
+        return config
+
+    def get_llm(self, task_type: str, **kwargs):
+        """
+        获取任务类型对应的 LLM 实例（相同配置复用同一实例）
+
+        Args:
+            task_type: 任务类型
+            **kwargs: 其他传递给 get_llm 的参数
+
+        Returns:
+            ChatModel: LangChain ChatModel 实例（或兼容接口的包装类）
+        """
+        config = self.get_task_config(task_type)
+        cache_key = (
+            config["model"],
+            config["temperature"],
+            config["max_tokens"],
+            config["timeout"],
+            tuple(sorted(kwargs.items())),
+        )
+        if cache_key not in self._cache:
+            extra_kwargs = dict(kwargs)
+            if config["max_tokens"]:
+                extra_kwargs["max_tokens"] = config["max_tokens"]
+            if config["timeout"]:
+                extra_kwargs["timeout"] = config["timeout"]
+
+            logger.debug(f"LLM 任务路由: task_type={task_type}, config={config}")
+            self._cache[cache_key] = get_llm(
+                model=config["model"],
+                temperature=config["temperature"],
+                **extra_kwargs,
+            )
+        return self._cache[cache_key]
+
+
+# 全局路由实例
+llm_router = LLMRouter()
+
+
+def get_llm_for_task(task_type: str, **kwargs):
+    """
+    按任务类型获取 LLM 实例（服务应优先使用此函数，而不是全局默认模型）
+
+    Args:
+        task_type: 任务类型（extract_company_info / extract_contacts /
+                   generate_email / generate_v4_email）
+        **kwargs: 其他传递给 get_llm 的参数
+
+    Returns:
+        ChatModel: LangChain ChatModel 实例（或兼容接口的包装类）
+    """
+    return llm_router.get_llm(task_type, **kwargs)
+
+
+def _parse_model_spec(model: str) -> Tuple[str, Optional[str]]:
+    """
+    解析模型描述字符串
+
+    支持两种格式：
+    - "glm"：只指定提供商，使用该提供商的默认模型
+    - "glm:glm-4-flash"：指定提供商和具体模型名称
+
+    Args:
+        model: 模型描述字符串
+
+    Returns:
+        (provider, model_name) 元组，model_name 可能为 None
+    """
+    provider, _, model_name = model.partition(":")
+    return provider.strip(), (model_name.strip() or None)
 
 
 def get_llm(model: Optional[str] = None, temperature: Optional[float] = None, **kwargs):
@@ -22,11 +155,13 @@ def get_llm(model: Optional[str] = None, temperature: Optional[float] = None, **
     根据模型名称自动路由到相应的 API 提供商：
     - 国外模型（gpt-*, claude-* 等）→ OpenRouter
     - 国内模型（deepseek-*, glm-*, qwen-* 等）→ 直接调用
+    - "replay" / "replay:<归档目录>" → 从 logs/llm 归档回放（离线测试和基准测试）
 
     Args:
-        model: 模型名称，默认使用 settings.LLM_MODEL
+        model: 模型名称，默认使用 settings.LLM_MODEL。
+               格式为 "provider" 或 "provider:model_name"（如 "glm:glm-4-flash"）
         temperature: 温度参数，默认使用 settings.LLM_TEMPERATURE
-        **kwargs: 其他 LangChain init_chat_model 支持的参数
+        **kwargs: 其他 LangChain init_chat_model 支持的参数（如 max_tokens, timeout）
 
     Returns:
         ChatModel: LangChain ChatModel 实例
@@ -37,13 +172,18 @@ def get_llm(model: Optional[str] = None, temperature: Optional[float] = None, **
     # 使用默认值
     model = model or settings.LLM_MODEL
     temperature = temperature if temperature is not None else settings.LLM_TEMPERATURE
+    provider, model_name = _parse_model_spec(model)
 
-    if model == "openrouter":
-        return _create_openrouter_llm(model, temperature, **kwargs)
-    elif model in ("deepseek", "qwen", "glm"):
-        return _create_direct_llm(model, model, temperature, **kwargs)
+    if provider == "openrouter":
+        return _create_openrouter_llm(
+            model_name or "openai/gpt-4o", temperature, **kwargs
+        )
+    elif provider in ("deepseek", "qwen", "glm"):
+        return _create_direct_llm(model_name, provider, temperature, **kwargs)
+    elif provider == "replay":
+        return _create_replay_llm(model_name, **kwargs)
     else:
-        raise ValueError(f"不支持的 provider_type: {model}")
+        raise ValueError(f"不支持的 provider_type: {provider}")
 
 
 def _create_openrouter_llm(model: str, temperature: float, **kwargs):
@@ -51,7 +191,7 @@ def _create_openrouter_llm(model: str, temperature: float, **kwargs):
     创建通过 OpenRouter 调用的 LLM 实例
 
     Args:
-        model: 模型名称
+        model: 模型名称（如 "openai/gpt-4o"）
         temperature: 温度参数
         **kwargs: 其他参数
 
@@ -97,12 +237,14 @@ def _create_openrouter_llm(model: str, temperature: float, **kwargs):
     return init_chat_model(**init_kwargs)
 
 
-def _create_direct_llm(model: str, provider_name: str, temperature: float, **kwargs):
+def _create_direct_llm(
+    model: Optional[str], provider_name: str, temperature: float, **kwargs
+):
     """
     创建直接调用的 LLM 实例（国内 API）
 
     Args:
-        model: 模型名称
+        model: 模型名称（None 表示使用提供商默认模型）
         provider_name: 提供商名称（"deepseek", "glm", "qwen"）
         temperature: 温度参数
         **kwargs: 其他参数
@@ -111,16 +253,18 @@ def _create_direct_llm(model: str, provider_name: str, temperature: float, **kwa
         ChatModel: LangChain ChatModel 实例
     """
     if provider_name == "deepseek":
-        return _create_deepseek_llm(temperature, **kwargs)
+        return _create_deepseek_llm(
+            temperature, model=model or "deepseek-chat", **kwargs
+        )
     elif provider_name == "glm":
-        return _create_glm_llm(temperature, **kwargs)
+        return _create_glm_llm(temperature, model=model or "glm-4.6", **kwargs)
     elif provider_name == "qwen":
-        return _create_qwen_llm(temperature, **kwargs)
+        return _create_qwen_llm(temperature, model=model or "qwen-plus", **kwargs)
     else:
         raise ValueError(f"不支持的国内 API 提供商: {provider_name}")
 
 
-def _create_deepseek_llm(temperature: float, **kwargs):
+def _create_deepseek_llm(temperature: float, model: str = "deepseek-chat", **kwargs):
     """
     创建 DeepSeek LLM 实例
 
@@ -140,7 +284,7 @@ def _create_deepseek_llm(temperature: float, **kwargs):
         raise ValueError("DeepSeek API Key 未配置。请设置 DEEPSEEK_API_KEY")
 
     return init_chat_model(
-        model="deepseek-chat",
+        model=model,
         model_provider="openai",
         api_key=settings.DEEPSEEK_API_KEY,
         temperature=temperature,
@@ -148,7 +292,7 @@ def _create_deepseek_llm(temperature: float, **kwargs):
     )
 
 
-def _create_glm_llm(temperature: float, **kwargs):
+def _create_glm_llm(temperature: float, model: str = "glm-4.6", **kwargs):
     """
     创建 GLM（智谱AI）LLM 实例（使用 Python SDK）
 
@@ -166,13 +310,15 @@ def _create_glm_llm(temperature: float, **kwargs):
     if not settings.GLM_API_KEY:
         raise ValueError("GLM API Key 未配置。请设置 GLM_API_KEY")
 
-    # 使用智谱AI Python SDK
+    # 使用智谱AI Python SDK（延迟导入，只有使用 GLM 时才加载 LangChain 消息类型）
+    from .glm_wrapper import GLMLLMWrapper
+
     return GLMLLMWrapper(
-        model="glm-4.6", temperature=temperature, api_key=settings.GLM_API_KEY, **kwargs
+        model=model, temperature=temperature, api_key=settings.GLM_API_KEY, **kwargs
     )
 
 
-def _create_qwen_llm(temperature: float, **kwargs):
+def _create_qwen_llm(temperature: float, model: str = "qwen-plus", **kwargs):
     """
     创建 Qwen（通义千问）LLM 实例（使用 OpenAI 兼容接口）
 
@@ -192,10 +338,31 @@ def _create_qwen_llm(temperature: float, **kwargs):
 
     # 使用 OpenAI 兼容接口，只需设置不同的 base_url
     return init_chat_model(
-        model="qwen-plus",
+        model=model,
         model_provider="openai",  # 使用 OpenAI 兼容接口
         temperature=temperature,
         api_key=settings.QWEN_API_KEY,
         base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",  # Qwen 兼容模式 API 地址
         **kwargs,
     )
+
+
+def _create_replay_llm(archive_dir: Optional[str] = None, **kwargs):
+    """
+    创建回放 LLM 实例（从 log_llm_request / log_llm_response 的归档返回响应）
+
+    Args:
+        archive_dir: 归档目录，默认 logs/llm
+        **kwargs: 其他参数（忽略）
+
+    Returns:
+        ReplayLLM: 兼容 LangChain 接口的回放 LLM
+    """
+    from .replay import ReplayLLM, load_archive
+
+    return ReplayLLM(
+        load_archive(archive_dir),
+        latency=settings.LLM_REPLAY_LATENCY,
+        model=f"replay:{archive_dir}" if archive_dir else "replay",
+        **kwargs,
+    )
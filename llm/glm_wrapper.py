@@ -4,8 +4,8 @@ GLM（智谱AI）SDK 包装类 - 兼容 LangChain ChatModel 接口
 
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import AIMessage
-from zai import ZhipuAiClient
 from config import settings
+from core.metrics import timed
 from logs import logger, log_llm_request, log_llm_response
 
 
@@ -17,6 +17,7 @@ class GLMLLMWrapper:
         model: str,
         temperature: float = 0.0,
         api_key: Optional[str] = None,
+        timeout: Optional[float] = None,
         **kwargs,
     ):
         """
@@ -26,20 +27,42 @@ class GLMLLMWrapper:
             model: 模型名称（如 "glm-4", "glm-4-plus"）
             temperature: 温度参数
             api_key: API Key，如果未提供则从 settings.GLM_API_KEY 读取
-            **kwargs: 其他参数（传递给 SDK）
+            timeout: 异步调用超时时间（秒），None 表示不限制
+            **kwargs: 其他参数（传递给 SDK，如 max_tokens）
         """
         self.model = model
         self.temperature = temperature
+        self.timeout = timeout
         self.api_key = api_key or settings.GLM_API_KEY
         if not self.api_key:
             raise ValueError("GLM API Key 未配置。请设置 GLM_API_KEY")
 
-        # 初始化智谱AI SDK 客户端
+        # 初始化智谱AI SDK 客户端（延迟导入，只有使用 GLM 时才加载 SDK）
+        from zai import ZhipuAiClient
+
         self.client = ZhipuAiClient(api_key=self.api_key)
         self.kwargs = kwargs
 
         logger.debug(f"GLM SDK 初始化: model={model}, temperature={temperature}")
 
+    @staticmethod
+    def _to_message(content: str, response: Any) -> AIMessage:
+        """转换为 AIMessage，并附带 SDK 返回的 token 用量（usage_metadata）"""
+        usage = getattr(response, "usage", None)
+        if usage is None or getattr(usage, "prompt_tokens", None) is None:
+            return AIMessage(content=content)
+        input_tokens = usage.prompt_tokens or 0
+        output_tokens = usage.completion_tokens or 0
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": usage.total_tokens or input_tokens + output_tokens,
+            },
+        )
+
+    @timed("llm", "glm")
     async def ainvoke(self, messages: List[Dict[str, str]], **kwargs) -> AIMessage:
         """
         异步调用 GLM（兼容 LangChain 接口）
@@ -88,8 +111,10 @@ class GLMLLMWrapper:
             response = self.client.chat.completions.create(**request_params)
             return response
 
-        # 在线程池中执行同步调用
-        response = await asyncio.to_thread(_sync_call)
+        # 在线程池中执行同步调用（配置了超时时间时限制等待时长）
+        response = await asyncio.wait_for(
+            asyncio.to_thread(_sync_call), timeout=self.timeout
+        )
 
         # 提取响应内容
         content = response.choices[0].message.content
@@ -105,8 +130,9 @@ class GLMLLMWrapper:
         logger.debug(f"GLM SDK 响应: content_length={len(content)}")
 
         # 返回 LangChain 兼容的消息对象
-        return AIMessage(content=content)
+        return self._to_message(content, response)
 
+    @timed("llm", "glm")
     def invoke(self, messages: List[Dict[str, str]], **kwargs) -> AIMessage:
         """
         同步调用 GLM（兼容 LangChain 接口）
@@ -164,4 +190,4 @@ class GLMLLMWrapper:
         logger.debug(f"GLM SDK 同步响应: content_length={len(content)}")
 
         # 返回 LangChain 兼容的消息对象
-        return AIMessage(content=content)
+        return self._to_message(content, response)
@@ -0,0 +1,266 @@
+"""
+回放 LLM - 使用 logs/llm 归档的请求/响应代替真实模型调用
+
+log_llm_request / log_llm_response 记录的每一对请求和响应按提示词哈希
+（消息角色和内容的 SHA-256）建立索引，ainvoke 和 with_structured_output
+直接从归档返回结果，可注入模拟延迟；未命中时抛出 ReplayMissError，
+不会静默返回空结果。用于确定性、零成本地端到端测试 FindKP 和 Writer。
+
+通过 get_llm 选择：model="replay"（使用 logs/llm）或 "replay:/path/to/llm"。
+"""
+
+import ast
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from core.metrics import record_cache, timed
+from logs import LOGS_DIR, logger
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage
+
+# LangChain 消息类型 -> 角色
+_MESSAGE_ROLES = {"human": "user", "ai": "assistant", "system": "system"}
+
+
+class ReplayMissError(LookupError):
+    """归档中没有可用于回放的响应"""
+
+
+def _normalize_messages(messages: Any) -> List[Dict[str, str]]:
+    """把消息统一为 [{"role", "content"}]（兼容字符串、字典和 LangChain 消息对象）"""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    normalized = []
+    for message in messages:
+        if isinstance(message, dict):
+            role = message.get("role", "user")
+            content = message.get("content", "")
+        else:
+            message_type = getattr(message, "type", "human")
+            role = _MESSAGE_ROLES.get(message_type, message_type)
+            content = getattr(message, "content", "")
+        normalized.append({"role": role, "content": content})
+    return normalized
+
+
+def prompt_hash(messages: Any) -> str:
+    """
+    计算提示词哈希
+
+    Args:
+        messages: 消息列表（与传给 ainvoke 的格式相同）
+
+    Returns:
+        SHA-256 十六进制字符串
+    """
+    canonical = json.dumps(
+        _normalize_messages(messages), ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _parse_structured(content: str) -> Optional[Any]:
+    """解析结构化输出的响应记录（JSON 或 str(model_dump()) 格式）"""
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            return parse(content)
+        except (ValueError, SyntaxError):
+            continue
+    return None
+
+
+class LLMArchive:
+    """logs/llm 归档索引（提示词哈希 -> 响应列表，按时间先后）"""
+
+    def __init__(self, archive_dir: Path):
+        """
+        加载归档并建立索引
+
+        Args:
+            archive_dir: 归档目录（包含 requests/ 和 responses/ 子目录）
+        """
+        self.archive_dir = Path(archive_dir)
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+        self.previews: Dict[str, str] = {}
+        self._load()
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"跳过无法读取的 LLM 日志 {path}: {e}")
+            return None
+
+    def _load(self) -> None:
+        request_hashes: Dict[str, str] = {}
+        for path in sorted((self.archive_dir / "requests").glob("*.log")):
+            data = self._read(path)
+            if data and "messages" in data:
+                key = prompt_hash(data["messages"])
+                request_hashes[path.name] = key
+                self.previews.setdefault(
+                    key, str(_normalize_messages(data["messages"])[-1]["content"])
+                )
+
+        pairs = 0
+        for path in sorted((self.archive_dir / "responses").glob("*.log")):
+            data = self._read(path)
+            if not data or not data.get("request_log_path"):
+                continue
+            key = request_hashes.get(Path(data["request_log_path"]).name)
+            content = data.get("response_content")
+            if key is None or not isinstance(content, str):
+                continue
+            if content.startswith("[ERROR]"):
+                continue
+            self.responses.setdefault(key, []).append(
+                {"content": content, "task_type": data.get("task_type")}
+            )
+            pairs += 1
+
+        logger.info(
+            f"LLM 回放归档已加载: {self.archive_dir}，"
+            f"{len(self.responses)} 个提示词，{pairs} 条响应"
+        )
+
+    def lookup(self, key: str) -> List[Dict[str, Any]]:
+        """获取提示词的响应记录（最新的在前）"""
+        return list(reversed(self.responses.get(key, [])))
+
+
+_archives: Dict[Path, LLMArchive] = {}
+
+
+def load_archive(archive_dir: Optional[str] = None) -> LLMArchive:
+    """加载归档（同一目录只加载一次）"""
+    path = Path(archive_dir) if archive_dir else LOGS_DIR / "llm"
+    path = path.resolve()
+    if path not in _archives:
+        _archives[path] = LLMArchive(path)
+    return _archives[path]
+
+
+class ReplayLLM:
+    """回放 LLM，兼容 LangChain ChatModel 的 ainvoke / invoke / with_structured_output"""
+
+    def __init__(
+        self,
+        archive: LLMArchive,
+        latency: float = 0.0,
+        model: str = "replay",
+        **kwargs,
+    ):
+        """
+        初始化回放 LLM
+
+        Args:
+            archive: LLM 归档索引
+            latency: 每次调用注入的模拟延迟（秒）
+            model: 模型名称（用于日志）
+            **kwargs: 其他模型参数（忽略，如 max_tokens、timeout）
+        """
+        self.archive = archive
+        self.latency = max(latency, 0.0)
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+
+    def _miss(self, key: str, reason: str) -> ReplayMissError:
+        self.misses += 1
+        record_cache("llm_replay", hit=False)
+        preview = self.archive.previews.get(key, "")[:200]
+        message = f"LLM 回放未命中（{reason}）: prompt_hash={key}"
+        if preview:
+            message += f"，提示词开头: {preview!r}"
+        logger.error(message)
+        return ReplayMissError(message)
+
+    def _replay_text(self, messages: Any) -> "AIMessage":
+        key = prompt_hash(messages)
+        records = self.archive.lookup(key)
+        if not records:
+            raise self._miss(key, "归档中没有该提示词")
+        self.hits += 1
+        record_cache("llm_replay", hit=True)
+        from langchain_core.messages import AIMessage
+
+        return AIMessage(content=records[0]["content"])
+
+    def _replay_structured(self, messages: Any, schema: Type[BaseModel]) -> BaseModel:
+        key = prompt_hash(messages)
+        records = self.archive.lookup(key)
+        if not records:
+            raise self._miss(key, "归档中没有该提示词")
+        for record in records:
+            data = _parse_structured(record["content"])
+            if data is None:
+                continue
+            try:
+                result = schema.model_validate(data)
+            except ValidationError:
+                continue
+            self.hits += 1
+            record_cache("llm_replay", hit=True)
+            return result
+        raise self._miss(key, f"没有可解析为 {schema.__name__} 的响应")
+
+    async def _simulate_latency(self) -> None:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    @timed("llm", "replay")
+    async def ainvoke(self, messages: Any, **kwargs) -> "AIMessage":
+        """
+        异步回放（兼容 LangChain 接口）
+
+        Args:
+            messages: 消息列表
+
+        Returns:
+            AIMessage: 归档中最近一次的响应
+
+        Raises:
+            ReplayMissError: 归档中没有该提示词
+        """
+        await self._simulate_latency()
+        return self._replay_text(messages)
+
+    def invoke(self, messages: Any, **kwargs) -> "AIMessage":
+        """同步回放（兼容 LangChain 接口）"""
+        return self._replay_text(messages)
+
+    def with_structured_output(self, schema: Type[BaseModel], **kwargs):
+        """
+        返回结构化输出回放器（兼容 LangChain 接口）
+
+        Args:
+            schema: Pydantic 模型类
+
+        Returns:
+            具有 ainvoke / invoke 的结构化回放器
+        """
+        return _StructuredReplay(self, schema)
+
+
+class _StructuredReplay:
+    """with_structured_output 返回的回放器"""
+
+    def __init__(self, llm: ReplayLLM, schema: Type[BaseModel]):
+        self.llm = llm
+        self.schema = schema
+
+    @timed("llm", "replay_structured")
+    async def ainvoke(self, messages: Any, **kwargs) -> BaseModel:
+        await self.llm._simulate_latency()
+        return self.llm._replay_structured(messages, self.schema)
+
+    def invoke(self, messages: Any, **kwargs) -> BaseModel:
+        return self.llm._replay_structured(messages, self.schema)
@@ -0,0 +1,56 @@
+"""LLM 用量报告 API 路由"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.connection import get_read_db
+from database.repository import Repository
+from schemas.llm_usage import LLMUsageReportResponse, LLMUsageRow
+from logs import logger
+
+# 创建路由
+router = APIRouter(prefix="/llm", tags=["LLM"])
+
+
+@router.get("/usage", response_model=LLMUsageReportResponse)
+async def get_llm_usage(
+    group_by: List[str] = Query(["task_type", "model"]),
+    days: Optional[float] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    LLM token 用量与成本报告（成本最高的在前）
+
+    Args:
+        group_by: 分组维度，可重复（task_type / model / company）
+        days: 只统计最近 N 天，默认全部
+        limit: 最多返回的行数
+        db: 只读数据库会话（只读副本，不可用时为主库）
+
+    Returns:
+        LLMUsageReportResponse: 聚合后的用量
+    """
+    since = datetime.now() - timedelta(days=days) if days else None
+    try:
+        rows = await Repository(db).get_llm_usage_report(
+            group_by=group_by, since=since, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"查询 LLM 用量失败: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"查询 LLM 用量失败: {str(e)}")
+
+    return LLMUsageReportResponse(
+        success=True,
+        message=f"共 {len(rows)} 行",
+        group_by=group_by,
+        since=since,
+        total_calls=sum(row["calls"] for row in rows),
+        total_cost_usd=round(sum(row["cost_usd"] for row in rows), 6),
+        rows=[LLMUsageRow(**row) for row in rows],
+    )
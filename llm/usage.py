@@ -0,0 +1,320 @@
+"""LLM token 用量与成本统计
+
+每次 LLM 调用后由调用方执行 record_llm_usage：
+- 优先读取接口返回的用量（AIMessage.usage_metadata 或 response_metadata["token_usage"]）
+- 没有用量信息时（如部分结构化输出、回放）用本地分词器估算：
+  安装了 tiktoken 时使用 cl100k_base，否则按字符数估算
+- 按 LLM_PRICING 计算成本，记录到进程内指标，并缓冲后批量写入 llm_usage 表
+
+调用方不知道公司时（如 FindKP 的提取方法），使用 set_usage_company 在当前上下文中
+绑定公司ID，同一个 find_kps 流程内的所有调用都会关联到该公司。
+"""
+
+import asyncio
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from core.metrics import registry
+from logs import logger
+
+try:
+    import tiktoken
+except ImportError:  # 可选依赖（随 langchain-openai 安装）
+    tiktoken = None
+
+LLM_TOKENS = registry.counter(
+    "smartlead_llm_tokens_total",
+    "LLM tokens by task type, model and direction",
+    ("task_type", "model", "direction"),
+)
+LLM_COST = registry.counter(
+    "smartlead_llm_cost_usd_total",
+    "Estimated LLM cost in USD",
+    ("task_type", "model"),
+)
+
+_usage_company: ContextVar[Optional[int]] = ContextVar(
+    "llm_usage_company", default=None
+)
+
+_encoding = None
+
+
+def set_usage_company(company_id: Optional[int]) -> Token:
+    """
+    在当前上下文中绑定公司ID（之后的 LLM 调用记录关联到该公司）
+
+    Returns:
+        用于 reset_usage_company 的令牌
+    """
+    return _usage_company.set(company_id)
+
+
+def reset_usage_company(token: Token) -> None:
+    """恢复 set_usage_company 之前绑定的公司ID"""
+    _usage_company.reset(token)
+
+
+def estimate_tokens_heuristic(text: str) -> int:
+    """
+    不依赖分词器的 token 估算
+
+    ASCII 字符按约 4 个字符 1 个 token 计算，
+    非 ASCII 字符（中文、越南语变音字符等）按 1 个字符 1 个 token 计算。
+    """
+    if not text:
+        return 0
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_count + 3) // 4 + (len(text) - ascii_count)
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本的 token 数（有 tiktoken 时使用 cl100k_base 分词）"""
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        try:
+            if _encoding is None:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            return len(_encoding.encode(text, disallowed_special=()))
+        except Exception as e:
+            # 编码文件无法下载等情况，回退到字符估算
+            logger.debug(f"tiktoken 不可用，使用字符估算: {e}")
+    return estimate_tokens_heuristic(text)
+
+
+def _messages_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            parts.append(str(message.get("content", "")))
+        else:
+            parts.append(str(getattr(message, "content", message)))
+    return "\n".join(parts)
+
+
+def extract_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """
+    从 LLM 响应中读取接口返回的用量
+
+    Args:
+        response: AIMessage 或 include_raw=True 时的原始响应
+
+    Returns:
+        (输入 token 数, 输出 token 数)，没有用量信息时返回 None
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage and usage.get("input_tokens") is not None:
+        return int(usage["input_tokens"]), int(usage.get("output_tokens") or 0)
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    if token_usage.get("prompt_tokens") is not None:
+        return (
+            int(token_usage["prompt_tokens"]),
+            int(token_usage.get("completion_tokens") or 0),
+        )
+    return None
+
+
+def unwrap_structured(result: Any) -> Tuple[Any, Any]:
+    """
+    拆分 with_structured_output(include_raw=True) 的返回值
+
+    不支持 include_raw 的实现（回放、替身）直接返回解析结果，此时原始响应为 None。
+
+    Returns:
+        (解析结果, 原始响应)
+
+    Raises:
+        解析失败时抛出 parsing_error（与不带 include_raw 时的行为一致）
+    """
+    if isinstance(result, dict) and "parsed" in result and "raw" in result:
+        if result.get("parsing_error") is not None:
+            raise result["parsing_error"]
+        return result["parsed"], result["raw"]
+    return result, None
+
+
+def model_price(model: str) -> Optional[Tuple[float, float]]:
+    """
+    查找模型价格（美元 / 百万 token）
+
+    先按完整名称查找，再按去掉 provider 前缀（如 "glm:"、"deepseek/"）的名称查找。
+
+    Returns:
+        (输入价格, 输出价格)，未配置时返回 None
+    """
+    pricing = settings.LLM_PRICING
+    for name in (model, model.split(":", 1)[-1], model.rsplit("/", 1)[-1]):
+        price = pricing.get(name)
+        if price:
+            return float(price[0]), float(price[1])
+    return None
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """按 LLM_PRICING 估算成本（美元），未配置价格的模型返回 0"""
+    price = model_price(model)
+    if price is None:
+        return 0.0
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+
+def record_llm_usage(
+    task_type: str,
+    model: str,
+    messages: Any,
+    response: Any = None,
+    output_text: Optional[str] = None,
+    company_id: Optional[int] = None,
+    contact_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    记录一次 LLM 调用的用量
+
+    Args:
+        task_type: 任务类型，如 extract_contacts、generate_email
+        model: 模型名称
+        messages: 请求消息（估算输入 token 时使用）
+        response: LLM 原始响应（读取接口返回的用量）
+        output_text: 输出文本（没有原始响应时估算输出 token 使用），默认取 response.content
+        company_id: 关联公司ID，默认使用 set_usage_company 绑定的公司
+        contact_id: 关联联系人ID
+
+    Returns:
+        用量字典（input_tokens、output_tokens、source、cost_usd），可附加到响应日志
+    """
+    usage = extract_usage(response) if response is not None else None
+    if usage is not None:
+        input_tokens, output_tokens = usage
+        source = "provider"
+    else:
+        if output_text is None:
+            output_text = str(getattr(response, "content", "") or "")
+        input_tokens = estimate_tokens(_messages_text(messages))
+        output_tokens = estimate_tokens(output_text)
+        source = "estimated"
+
+    model = model or "unknown"
+    cost = estimate_cost(model, input_tokens, output_tokens)
+    if company_id is None:
+        company_id = _usage_company.get()
+
+    LLM_TOKENS.inc(input_tokens, task_type=task_type, model=model, direction="input")
+    LLM_TOKENS.inc(output_tokens, task_type=task_type, model=model, direction="output")
+    LLM_COST.inc(cost, task_type=task_type, model=model)
+
+    if settings.LLM_USAGE_ENABLED:
+        get_usage_recorder().record(
+            {
+                "task_type": task_type,
+                "model": model[:128],
+                "company_id": company_id,
+                "contact_id": contact_id,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "usage_source": source,
+                "cost_usd": round(cost, 6),
+            }
+        )
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "source": source,
+        "cost_usd": round(cost, 6),
+    }
+
+
+class LLMUsageRecorder:
+    """
+    LLM 用量缓冲写入器
+
+    record 只追加到内存缓冲区；缓冲区达到 batch_size 时在后台批量写入，
+    进程退出前调用 flush 写入剩余记录。写入使用独立的数据库会话。
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = 200,
+    ):
+        """
+        初始化写入器
+
+        Args:
+            session_factory: 异步会话工厂，默认使用 database.connection.AsyncSessionLocal
+            batch_size: 缓冲多少条记录后触发后台写入
+        """
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self._pending: List[Dict[str, Any]] = []
+        self._tasks: set = set()
+        self.written = 0
+        self.failed = 0
+
+    def record(self, row: Dict[str, Any]) -> None:
+        """追加一条记录（不等待数据库）"""
+        self._pending.append(row)
+        if len(self._pending) < self.batch_size:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 同步调用（没有事件循环）时等待 flush 写入
+            return
+        task = loop.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """写入缓冲区中的所有记录（失败只记录日志）"""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+
+        from database.repository import Repository
+
+        session_factory = self.session_factory
+        if session_factory is None:
+            from database.connection import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+
+        try:
+            async with session_factory() as session:
+                await Repository(session).bulk_insert_llm_usage(rows)
+            self.written += len(rows)
+        except Exception as e:
+            self.failed += len(rows)
+            logger.error(f"写入 LLM 用量失败（{len(rows)} 条）: {e}")
+
+    async def close(self) -> None:
+        """等待后台写入完成并写入剩余记录"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+
+
+_recorder: Optional[LLMUsageRecorder] = None
+
+
+def get_usage_recorder() -> LLMUsageRecorder:
+    """获取进程内共享的用量写入器（按配置创建）"""
+    global _recorder
+    if _recorder is None:
+        _recorder = LLMUsageRecorder(batch_size=settings.LLM_USAGE_BATCH_SIZE)
+    return _recorder
+
+
+async def close_usage_recorder() -> None:
+    """写入剩余的用量记录（CLI 结束和 API 关闭时调用）"""
+    if _recorder is not None:
+        await _recorder.close()
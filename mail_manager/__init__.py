@@ -1,6 +1,7 @@
-"""MailManager 模块 - 邮件发送和追踪"""
+"""MailManager 模块 - 邮件发送和追踪
 
-from .router import router
+API 路由在 mail_manager.router 中，按需导入（CLI 不需要 FastAPI）。
+"""
 
-__all__ = ["router"]
+__all__ = []
 
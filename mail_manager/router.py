@@ -1,9 +1,11 @@
 """MailManager API 路由"""
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.connection import get_db
+from database.connection import get_db, get_read_db, get_replica_db
 from schemas.mail_manager import (
     SendEmailRequest,
     SendEmailResponse,
@@ -19,20 +21,37 @@ from logs import logger
 router = APIRouter(prefix="/mail_manager", tags=["MailManager"])
 
 
+def get_service(request: Request) -> MailManagerService:
+    """
+    FastAPI 依赖项，返回应用共享的 MailManagerService
+
+    服务在应用启动时由 lifespan 创建（见 main.py），发送器的 OAuth 初始化只需进行一次；
+    未经过 lifespan 的应用（如单独挂载路由）在首次请求时创建。
+    """
+    service = getattr(request.app.state, "mail_manager_service", None)
+    if service is None:
+        service = request.app.state.mail_manager_service = MailManagerService()
+    return service
+
+
 @router.post("/send", response_model=SendEmailResponse)
-async def send_email(request: SendEmailRequest, db: AsyncSession = Depends(get_db)):
+async def send_email(
+    request: SendEmailRequest,
+    db: AsyncSession = Depends(get_db),
+    service: MailManagerService = Depends(get_service),
+):
     """
     发送单封邮件
 
     Args:
         request: 发送邮件请求
         db: 数据库会话
+        service: MailManager 服务
 
     Returns:
         SendEmailResponse: 发送结果
     """
     try:
-        service = MailManagerService()
         result = await service.send_email(request, db)
         return result
     except Exception as e:
@@ -42,7 +61,9 @@ async def send_email(request: SendEmailRequest, db: AsyncSession = Depends(get_d
 
 @router.post("/send_batch", response_model=SendBatchEmailResponse)
 async def send_batch(
-    request: SendBatchEmailRequest, db: AsyncSession = Depends(get_db)
+    request: SendBatchEmailRequest,
+    db: AsyncSession = Depends(get_db),
+    service: MailManagerService = Depends(get_service),
 ):
     """
     批量发送邮件
@@ -50,12 +71,12 @@ async def send_batch(
     Args:
         request: 批量发送请求
         db: 数据库会话
+        service: MailManager 服务
 
     Returns:
         SendBatchEmailResponse: 批量发送结果
     """
     try:
-        service = MailManagerService()
         result = await service.send_batch(request, db)
         return result
     except Exception as e:
@@ -68,6 +89,8 @@ async def track_email_open(
     tracking_id: str,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    read_db: Optional[AsyncSession] = Depends(get_replica_db),
+    service: MailManagerService = Depends(get_service),
 ):
     """
     追踪像素端点
@@ -77,14 +100,17 @@ async def track_email_open(
     Args:
         tracking_id: 追踪ID
         request: FastAPI Request 对象
-        db: 数据库会话
+        db: 数据库会话（写入追踪事件）
+        read_db: 只读副本会话（按追踪ID查找邮件），没有可用副本时为 None，使用 db
+        service: MailManager 服务
 
     Returns:
         Response: 1x1 PNG 图片
     """
     try:
-        service = MailManagerService()
-        png_data = await service.track_email_open(tracking_id, request, db)
+        png_data = await service.track_email_open(
+            tracking_id, request, db, read_db=read_db
+        )
         return Response(content=png_data, media_type="image/png")
     except Exception as e:
         # 追踪失败不影响响应，返回 PNG
@@ -95,19 +121,23 @@ async def track_email_open(
 
 
 @router.get("/emails/{email_id}", response_model=EmailStatusResponse)
-async def get_email_status(email_id: int, db: AsyncSession = Depends(get_db)):
+async def get_email_status(
+    email_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    service: MailManagerService = Depends(get_service),
+):
     """
     查询邮件状态
 
     Args:
         email_id: 邮件ID
-        db: 数据库会话
+        db: 只读数据库会话（只读副本，不可用时为主库）
+        service: MailManager 服务
 
     Returns:
         EmailStatusResponse: 邮件状态信息
     """
     try:
-        service = MailManagerService()
         result = await service.get_email_status(email_id, db)
         return result
     except ValueError as e:
@@ -122,7 +152,8 @@ async def get_emails_list(
     status: str = None,
     limit: int = 10,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    service: MailManagerService = Depends(get_service),
 ):
     """
     查询邮件列表
@@ -131,13 +162,13 @@ async def get_emails_list(
         status: 邮件状态（可选：pending/sending/sent/failed/bounced）
         limit: 每页数量（默认 10）
         offset: 偏移量（默认 0）
-        db: 数据库会话
+        db: 只读数据库会话（只读副本，不可用时为主库）
+        service: MailManager 服务
 
     Returns:
         EmailListResponse: 邮件列表
     """
     try:
-        service = MailManagerService()
         result = await service.get_emails_list(status, limit, offset, db)
         return result
     except ValueError as e:
@@ -153,6 +184,7 @@ async def oauth2_callback(
     state: str = Query(..., description="状态参数（必需，用于标识授权流程）"),
     error: str = Query(None, description="错误信息（如果有）"),
     db: AsyncSession = Depends(get_db),
+    service: MailManagerService = Depends(get_service),
 ):
     """
     OAuth 2.0 回调端点
@@ -164,11 +196,11 @@ async def oauth2_callback(
         state: 状态参数（必需，用于标识授权流程）
         error: 错误信息（如果有）
         db: 数据库会话
+        service: MailManager 服务
 
     Returns:
         HTMLResponse: 显示授权结果的 HTML 页面
     """
-    service = MailManagerService()
     success, error_message = await service.handle_oauth2_callback(
         code, state, error, db
     )
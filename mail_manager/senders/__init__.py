@@ -1,6 +1,18 @@
-"""邮件发送器实现"""
+"""邮件发送器实现
 
-from .gmail_sender import GmailSender
-from .resend_sender import ResendSender
+发送器类按需导入（访问 GmailSender / ResendSender 时才加载对应 SDK）。
+"""
 
 __all__ = ["GmailSender", "ResendSender"]
+
+
+def __getattr__(name: str):
+    if name == "GmailSender":
+        from .gmail_sender import GmailSender
+
+        return GmailSender
+    if name == "ResendSender":
+        from .resend_sender import ResendSender
+
+        return ResendSender
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
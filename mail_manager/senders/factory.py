@@ -3,8 +3,6 @@
 from typing import Optional
 
 from ..email_sender import EmailSender
-from .gmail_sender import GmailSender
-from .resend_sender import ResendSender
 from config import settings
 from logs import logger
 
@@ -22,15 +20,20 @@ def create_email_sender(sender_type: Optional[str] = None) -> EmailSender:
     Raises:
         ValueError: 不支持的发送器类型
     """
+    # 发送器模块在使用时才导入（Gmail / Resend SDK 导入耗时较长，且只需安装所用的一个）
     if sender_type is None:
         sender_type = settings.EMAIL_SENDER_TYPE
 
     sender_type = sender_type.lower()
 
     if sender_type == "gmail":
+        from .gmail_sender import GmailSender
+
         logger.info("创建 Gmail 发送器实例")
         return GmailSender()
     elif sender_type == "resend":
+        from .resend_sender import ResendSender
+
         logger.info("创建 Resend 发送器实例")
         return ResendSender()
     elif sender_type == "smtp":
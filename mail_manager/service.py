@@ -2,12 +2,10 @@
 
 import asyncio
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
 
+from core.metrics import record_error, span, timed
 from database.repository import Repository
 from database.models import EmailStatus, EmailTrackingEventType
 from schemas.mail_manager import (
@@ -19,7 +17,6 @@ from schemas.mail_manager import (
     EmailListResponse,
     EmailTrackingEvent,
 )
-from writer.service import WriterService
 from .email_sender import EmailSender, EmailSendException
 from .senders.factory import create_email_sender
 from .oauth2_manager import get_oauth2_manager
@@ -32,16 +29,41 @@ from .utils import (
 from config import settings
 from logs import logger
 
+if TYPE_CHECKING:
+    # 只用于类型注解，CLI 导入本模块时不导入 FastAPI
+    from fastapi import Request
+
 
 class MailManagerService:
     """MailManager 服务类，负责邮件发送和追踪"""
 
     def __init__(self):
-        """初始化 MailManager 服务"""
-        # 通过工厂函数创建邮件发送器
-        self.email_sender: EmailSender = create_email_sender()
-        self.writer_service = WriterService()
+        """
+        初始化 MailManager 服务
 
+        邮件发送器和 WriterService 在首次使用时创建，
+        查询状态、列表和追踪等操作不需要加载发送 SDK 和 LLM 客户端。
+        """
+        self._email_sender: Optional[EmailSender] = None
+        self._writer_service = None
+
+    @property
+    def email_sender(self) -> EmailSender:
+        """邮件发送器（首次访问时通过工厂函数创建）"""
+        if self._email_sender is None:
+            self._email_sender = create_email_sender()
+        return self._email_sender
+
+    @property
+    def writer_service(self):
+        """WriterService（首次访问时创建）"""
+        if self._writer_service is None:
+            from writer.service import WriterService
+
+            self._writer_service = WriterService()
+        return self._writer_service
+
+    @timed("mail_manager", "send_email")
     async def send_email(
         self, request: SendEmailRequest, db: AsyncSession
     ) -> SendEmailResponse:
@@ -119,15 +141,16 @@ class MailManagerService:
 
             # 6. 调用邮件发送器发送
             try:
-                message_id = await self.email_sender.send_email(
-                    to_email=request.to_email,
-                    to_name=request.to_name,
-                    from_email=from_email,
-                    from_name=from_name,
-                    subject=subject,
-                    html_content=html_content,
-                    text_content=text_content,
-                )
+                async with span("mail_manager", "sender"):
+                    message_id = await self.email_sender.send_email(
+                        to_email=request.to_email,
+                        to_name=request.to_name,
+                        from_email=from_email,
+                        from_name=from_name,
+                        subject=subject,
+                        html_content=html_content,
+                        text_content=text_content,
+                    )
 
                 # 7. 发送成功，更新状态
                 sent_at = datetime.now()
@@ -152,6 +175,7 @@ class MailManagerService:
 
             except EmailSendException as e:
                 # 发送失败，更新状态
+                record_error("mail_manager", "send_email")
                 error_msg = str(e)
                 await repository.update_email_status(
                     email_record.id, EmailStatus.failed, error_message=error_msg
@@ -175,6 +199,7 @@ class MailManagerService:
             logger.error(f"发送邮件时发生错误: {e}", exc_info=True)
             raise
 
+    @timed("mail_manager", "send_batch")
     async def send_batch(
         self, request: SendBatchEmailRequest, db: AsyncSession
     ) -> SendBatchEmailResponse:
@@ -245,8 +270,13 @@ class MailManagerService:
             results=response_results,
         )
 
+    @timed("mail_manager", "track_open")
     async def track_email_open(
-        self, tracking_id: str, request: Request, db: AsyncSession
+        self,
+        tracking_id: str,
+        request: "Request",
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
     ) -> bytes:
         """
         处理邮件打开追踪请求
@@ -254,7 +284,8 @@ class MailManagerService:
         Args:
             tracking_id: 追踪ID
             request: FastAPI Request 对象
-            db: 数据库会话
+            db: 数据库会话（写入追踪事件）
+            read_db: 只读数据库会话（查找邮件），默认使用 db
 
         Returns:
             1x1 透明 PNG 图片字节
@@ -262,10 +293,19 @@ class MailManagerService:
         repository = Repository(db)
 
         try:
-            # 查找邮件
-            email = await repository.get_email_by_tracking_id(tracking_id)
-
-            if not email:
+            # 查找邮件（优先只读副本）
+            email_id = None
+            if read_db is not None and read_db is not db:
+                email = await Repository(read_db).get_email_by_tracking_id(tracking_id)
+                email_id = email.id if email else None
+                # 结束只读事务，写入期间不占用副本连接
+                await read_db.rollback()
+            if email_id is None:
+                # 未使用副本，或刚发送的邮件还未复制到副本
+                email = await repository.get_email_by_tracking_id(tracking_id)
+                email_id = email.id if email else None
+
+            if email_id is None:
                 logger.warning(f"追踪ID不存在: {tracking_id}")
                 # 即使邮件不存在，也返回 PNG（避免暴露信息）
                 return generate_1x1_png()
@@ -278,7 +318,7 @@ class MailManagerService:
             # 创建追踪事件
             opened_at = datetime.now()
             await repository.create_tracking_event(
-                email_id=email.id,
+                email_id=email_id,
                 event_type=EmailTrackingEventType.opened,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -286,10 +326,10 @@ class MailManagerService:
             )
 
             # 更新首次打开时间
-            await repository.update_email_first_opened_at(email.id, opened_at)
+            await repository.update_email_first_opened_at(email_id, opened_at)
 
             logger.debug(
-                f"邮件打开追踪: email_id={email.id}, "
+                f"邮件打开追踪: email_id={email_id}, "
                 f"tracking_id={tracking_id}, ip={ip_address}"
             )
 
@@ -471,6 +511,8 @@ class MailManagerService:
 
         # 立即用授权码换取 token 并保存到数据库
         try:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             # Gmail API 所需的作用域
             SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 
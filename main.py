@@ -1,8 +1,23 @@
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from findkp.router import router as findkp_router
 from writer.router import router as writer_router
 from mail_manager.router import router as mail_manager_router
+from llm.router import router as llm_router
+from findkp.service import FindKPService
+from writer.service import WriterService
+from mail_manager.service import MailManagerService
+from config import settings
+from core.metrics import render_prometheus
+from core.profiling import LoopBlockDetector, ProfilingMiddleware
+from core.search.telemetry import close_telemetry_writer
+from database.connection import ENGINES, warm_up_pool
+from llm.usage import close_usage_recorder, estimate_tokens
 
 # 导入 logs 模块以初始化日志配置（包括 httpx 日志级别设置）
 import logs  # noqa: F401
@@ -15,18 +30,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    启动预热：预先建立数据库连接和搜索提供者的 HTTP 连接，加载进程内缓存
+
+    各步骤并发执行，失败只记录日志，不影响启动。
+    """
+    started = time.perf_counter()
+    steps = []
+    if settings.API_WARMUP_DB_CONNECTIONS > 0:
+        steps.append(warm_up_pool(settings.API_WARMUP_DB_CONNECTIONS))
+    if settings.API_WARMUP_HTTP:
+        steps.append(app.state.findkp_service.warmup())
+    if settings.API_WARMUP_PRIME_CACHES:
+        # 首次调用时加载分词器（tiktoken 编码表）
+        steps.append(asyncio.to_thread(estimate_tokens, "warm up"))
+
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*steps, return_exceptions=True),
+            timeout=settings.API_WARMUP_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"启动预热超过 {settings.API_WARMUP_TIMEOUT} 秒，跳过剩余步骤")
+        return
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"启动预热步骤失败: {result}")
+    logger.info(f"启动预热完成，耗时 {time.perf_counter() - started:.2f} 秒")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期
+
+    启动时创建共享的服务实例（路由通过依赖项从 app.state 获取）、预热连接，
+    并按配置启动事件循环阻塞检测；关闭时释放 HTTP 客户端、
+    写完 Serper 遥测队列和 LLM 用量缓冲区中剩余的记录，最后关闭所有数据库连接池。
+    """
+    app.state.findkp_service = FindKPService()
+    app.state.writer_service = WriterService()
+    app.state.mail_manager_service = MailManagerService()
+
+    loop_block_detector = None
+    if settings.LOOP_BLOCK_THRESHOLD_MS > 0:
+        loop_block_detector = LoopBlockDetector(
+            settings.LOOP_BLOCK_THRESHOLD_MS / 1000
+        ).start()
+
+    await warm_up(app)
+    try:
+        yield
+    finally:
+        if loop_block_detector is not None:
+            await loop_block_detector.stop()
+        await app.state.findkp_service.aclose()
+        await close_telemetry_writer()
+        await close_usage_recorder()
+        for engine in ENGINES.values():
+            await engine.dispose()
+
+
 # 创建 FastAPI 应用实例
 app = FastAPI(
     title="Smart Lead Agent API",
     description="自动化潜在客户开发系统 - 三大板块: FindKP, MailManager, Writer",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 
+# 按比例抽样剖析请求（PROFILE_SAMPLE_RATE > 0 时启用）
+if settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        interval=settings.PROFILE_INTERVAL_MS / 1000,
+    )
+
 # 注册路由
 app.include_router(findkp_router)
 app.include_router(writer_router)
 app.include_router(mail_manager_router)
+app.include_router(llm_router)
 
 
 @app.get("/")
@@ -46,6 +134,14 @@ async def health_check():
     return {"status": "healthy", "message": "Smart Lead Agent is running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 文本格式的指标（阶段耗时、调用/错误/缓存命中计数、进行中数量）"""
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
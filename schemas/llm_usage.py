@@ -0,0 +1,34 @@
+"""LLM 用量报告的数据模型"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .base import BaseResponse
+
+
+class LLMUsageRow(BaseModel):
+    """用量报告的一行（未参与分组的维度为 None）"""
+
+    task_type: Optional[str] = None
+    model: Optional[str] = None
+    company_id: Optional[int] = None
+    company_name: Optional[str] = None
+    calls: int
+    estimated_calls: int  # 用本地分词器估算用量的调用数
+    input_tokens: int
+    output_tokens: int
+    avg_input_tokens: float
+    avg_output_tokens: float
+    cost_usd: float
+
+
+class LLMUsageReportResponse(BaseResponse):
+    """用量报告响应模型"""
+
+    group_by: List[str]
+    since: Optional[datetime] = None
+    total_calls: int = 0
+    total_cost_usd: float = 0.0
+    rows: List[LLMUsageRow] = []
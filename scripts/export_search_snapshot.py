@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+导出离线回放搜索快照
+
+从 serper_responses / serper_organic_results 中读取已记录的查询和结果，
+按规范化查询建立索引后写入快照文件，供 ReplaySearchProvider.from_snapshot
+（或配置 SEARCH_REPLAY_SNAPSHOT）离线回放使用。
+
+使用方法：
+    python scripts/export_search_snapshot.py --output data/search_snapshot.json.gz
+    python scripts/export_search_snapshot.py --output snapshot.json --limit 5000  # 只导出最近 5000 条响应
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.search.replay_provider import ReplaySearchProvider
+from database.connection import AsyncSessionLocal
+
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def export_snapshot(output: str, limit: Optional[int] = None) -> int:
+    """
+    导出快照
+
+    Args:
+        output: 快照文件路径（.gz 结尾时压缩）
+        limit: 最多导出的响应记录数（最近的优先）
+
+    Returns:
+        导出的查询数量
+    """
+    async with AsyncSessionLocal() as session:
+        provider = await ReplaySearchProvider.from_database(session, limit=limit)
+    count = provider.save_snapshot(output)
+    logger.info(f"已导出 {count} 个查询到 {output}")
+    return count
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="导出离线回放搜索快照")
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="快照文件路径（.json 或 .json.gz）",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="最多导出的响应记录数（最近的优先，默认全部）",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(export_snapshot(args.output, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,37 @@
 1. 扫描指定目录下的所有 .json 文件
 2. 解析每个文件的 results.content 节点数据
 3. 将数据批量导入到 trade_records 表
-4. 支持增量导入（记录已处理的文件，跳过已处理）
+4. 支持增量导入（按大小/修改时间/内容哈希识别已处理文件，重命名或重复下载的文件同样跳过）
+5. 多进程并行流式解析文件，Core 批量 INSERT 分块写入，并报告导入速度
+6. 按 dedup_key（trade_id 或内容哈希）幂等写入，重叠导出、重命名文件或 --force 不会产生重复记录
+7. 每个文件导入后刷新其涉及进口商的贸易汇总（importer_trade_summaries）
 
 使用方法：
-    python scripts/make_t_json.py [--dir /path/to/json/files]
+    python scripts/make_t_json.py [--dir /path/to/json/files] [--workers 4] [--chunk-size 2000]
+    python scripts/make_t_json.py --compact  # 一次性压缩：回填历史记录去重键并删除重复记录
+    python scripts/make_t_json.py --watch  # 持续监听目录，新文件下载完成后自动导入
+    python scripts/make_t_json.py --rebuild-summaries  # 全量重建进口商贸易汇总
 """
 
 import asyncio
-import json
 import logging
-import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database.connection import AsyncSessionLocal
+from config import settings
+from database.connection import BatchSessionLocal
 from database.repository import Repository
+from database.trade_summary import ImporterSummaryBuilder
+from database.trade_ingest import (
+    IncrementalImporter,
+    TradeDirectoryWatcher,
+    TradeIngestEngine,
+)
 
 # 配置日志
 logging.basicConfig(
@@ -56,100 +67,11 @@ async def scan_json_files(directory: str) -> List[str]:
     return [str(f) for f in json_files]
 
 
-async def parse_json_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
-    """
-    解析 JSON 文件，提取 results.content 数据
-
-    Args:
-        file_path: JSON 文件路径
-
-    Returns:
-        results.content 数组，如果解析失败则返回 None
-    """
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # 提取 results.content
-        results = data.get("results", {})
-        if not isinstance(results, dict):
-            logger.warning(f"文件 {file_path} 的 results 不是字典类型")
-            return None
-
-        content = results.get("content", [])
-        if not isinstance(content, list):
-            logger.warning(f"文件 {file_path} 的 results.content 不是列表类型")
-            return None
-
-        logger.info(f"文件 {file_path} 包含 {len(content)} 条记录")
-        return content
-
-    except json.JSONDecodeError as e:
-        logger.error(f"文件 {file_path} JSON 解析失败: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"读取文件 {file_path} 失败: {e}", exc_info=True)
-        return None
-
-
-async def import_file(
-    file_path: str, repository: Repository, force: bool = False
-) -> bool:
-    """
-    导入单个文件的数据
-
-    Args:
-        file_path: JSON 文件路径
-        repository: Repository 实例
-        force: 是否强制重新导入（忽略已处理记录）
-
-    Returns:
-        是否成功导入
-    """
-    # 检查文件是否已处理
-    if not force:
-        processed_file = await repository.get_processed_file(file_path)
-        if processed_file:
-            logger.info(
-                f"文件 {file_path} 已处理过，跳过（记录数: {processed_file.records_count}）"
-            )
-            return True
-
-    # 解析 JSON 文件
-    content = await parse_json_file(file_path)
-    if content is None:
-        logger.error(f"文件 {file_path} 解析失败，跳过")
-        return False
-
-    if len(content) == 0:
-        logger.warning(f"文件 {file_path} 没有数据，跳过")
-        # 即使没有数据，也记录为已处理
-        file_size = os.path.getsize(file_path)
-        await repository.create_processed_file(file_path, file_size, 0)
-        return True
-
-    try:
-        # 批量插入数据
-        records = await repository.create_trade_records_batch(
-            trade_records=content, source_file=file_path, auto_commit=True
-        )
-
-        # 记录已处理文件
-        file_size = os.path.getsize(file_path)
-        await repository.create_processed_file(
-            file_path=file_path, file_size=file_size, records_count=len(records)
-        )
-
-        logger.info(f"文件 {file_path} 导入成功: {len(records)} 条记录")
-        return True
-
-    except Exception as e:
-        logger.error(f"文件 {file_path} 导入失败: {e}", exc_info=True)
-        return False
-
-
 async def import_all_files(
-    directory: str = "/home/www/downloads-tendata", force: bool = False
+    directory: str = "/home/www/downloads-tendata",
+    force: bool = False,
+    workers: int = settings.TRADE_IMPORT_WORKERS,
+    chunk_size: int = settings.TRADE_IMPORT_CHUNK_SIZE,
 ) -> None:
     """
     导入目录下所有 JSON 文件
@@ -157,6 +79,8 @@ async def import_all_files(
     Args:
         directory: JSON 文件目录
         force: 是否强制重新导入所有文件
+        workers: 并行解析文件的进程数
+        chunk_size: 每次批量 INSERT 的行数
     """
     logger.info(f"开始导入目录: {directory}")
 
@@ -166,22 +90,71 @@ async def import_all_files(
         logger.warning("没有找到 JSON 文件")
         return
 
-    # 创建数据库会话
-    async with AsyncSessionLocal() as session:
+    engine = TradeIngestEngine(
+        BatchSessionLocal, workers=workers, chunk_size=chunk_size
+    )
+    importer = IncrementalImporter(BatchSessionLocal, engine)
+    stats, skipped_count = await importer.import_files(json_files, force=force)
+
+    logger.info(
+        f"导入完成: 成功 {stats.files_success} 个文件, 失败 {stats.files_failed} 个文件, "
+        f"跳过 {skipped_count} 个文件, 共 {stats.rows} 条记录"
+        f"（新增 {stats.rows_inserted}, 更新 {stats.rows_updated}）, "
+        f"耗时 {stats.elapsed:.1f}s ({stats.rows_per_sec:.0f} rows/sec)"
+    )
+
+
+async def watch_directory(
+    directory: str = "/home/www/downloads-tendata",
+    workers: int = settings.TRADE_IMPORT_WORKERS,
+    chunk_size: int = settings.TRADE_IMPORT_CHUNK_SIZE,
+    interval: float = settings.TRADE_IMPORT_WATCH_INTERVAL,
+    debounce: float = settings.TRADE_IMPORT_WATCH_DEBOUNCE,
+) -> None:
+    """
+    持续监听目录，新文件下载完成后自动增量导入
+
+    Args:
+        directory: JSON 文件目录
+        workers: 并行解析文件的进程数
+        chunk_size: 每次批量 INSERT 的行数
+        interval: 轮询间隔（秒）
+        debounce: 文件最后修改后静默多久才导入（秒）
+    """
+    engine = TradeIngestEngine(
+        BatchSessionLocal, workers=workers, chunk_size=chunk_size
+    )
+    importer = IncrementalImporter(BatchSessionLocal, engine)
+    watcher = TradeDirectoryWatcher(
+        importer, directory, interval=interval, debounce=debounce
+    )
+    await watcher.run()
+
+
+async def compact_trade_records(chunk_size: int = 5000) -> None:
+    """
+    压缩 trade_records 表：为历史记录回填 dedup_key 并分块删除重复记录
+
+    Args:
+        chunk_size: 每块处理的记录数
+    """
+    logger.info("开始压缩 trade_records...")
+    async with BatchSessionLocal() as session:
         repository = Repository(session)
+        stats = await repository.compact_trade_records(chunk_size=chunk_size)
 
-        success_count = 0
-        fail_count = 0
+    logger.info(
+        f"压缩完成: 扫描 {stats['scanned']} 条, 回填去重键 {stats['updated']} 条, "
+        f"删除重复 {stats['deleted']} 条"
+    )
 
-        for file_path in json_files:
-            logger.info(f"处理文件: {file_path}")
-            success = await import_file(file_path, repository, force=force)
-            if success:
-                success_count += 1
-            else:
-                fail_count += 1
 
-        logger.info(f"导入完成: 成功 {success_count} 个文件, 失败 {fail_count} 个文件")
+async def rebuild_importer_summaries() -> None:
+    """全量重建进口商贸易汇总表（首次启用汇总或数据修复时使用）"""
+    logger.info("开始重建进口商贸易汇总...")
+    async with BatchSessionLocal() as session:
+        count = await ImporterSummaryBuilder().rebuild_all(session)
+    logger.info(f"重建完成: {count} 个进口商")
 
 
 def main():
@@ -200,11 +173,80 @@ def main():
         action="store_true",
         help="强制重新导入所有文件（忽略已处理记录）",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.TRADE_IMPORT_WORKERS,
+        help=f"并行解析文件的进程数（默认: {settings.TRADE_IMPORT_WORKERS}）",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.TRADE_IMPORT_CHUNK_SIZE,
+        help=f"每次批量 INSERT 的行数（默认: {settings.TRADE_IMPORT_CHUNK_SIZE}）",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="压缩 trade_records：回填历史记录去重键并删除重复记录（不导入文件）",
+    )
+    parser.add_argument(
+        "--rebuild-summaries",
+        action="store_true",
+        help="全量重建进口商贸易汇总表（不导入文件）",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="持续监听目录，新文件下载完成后自动导入（Ctrl+C 退出）",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=settings.TRADE_IMPORT_WATCH_INTERVAL,
+        help=f"--watch 轮询间隔秒数（默认: {settings.TRADE_IMPORT_WATCH_INTERVAL}）",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=settings.TRADE_IMPORT_WATCH_DEBOUNCE,
+        help=f"文件最后修改后静默多少秒才导入（默认: {settings.TRADE_IMPORT_WATCH_DEBOUNCE}）",
+    )
 
     args = parser.parse_args()
 
+    if args.compact:
+        asyncio.run(compact_trade_records(chunk_size=args.chunk_size))
+        return
+
+    if args.rebuild_summaries:
+        asyncio.run(rebuild_importer_summaries())
+        return
+
+    if args.watch:
+        try:
+            asyncio.run(
+                watch_directory(
+                    directory=args.dir,
+                    workers=args.workers,
+                    chunk_size=args.chunk_size,
+                    interval=args.interval,
+                    debounce=args.debounce,
+                )
+            )
+        except KeyboardInterrupt:
+            logger.info("已停止监听")
+        return
+
     # 运行异步导入
-    asyncio.run(import_all_files(directory=args.dir, force=args.force))
+    asyncio.run(
+        import_all_files(
+            directory=args.dir,
+            force=args.force,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+"""pytest 公共配置
+
+测试不连接数据库和外部 API；没有 .env 时为必填配置提供占位值，使 config.settings 可以加载。
+"""
+
+import os
+
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "SERPER_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,120 @@
+"""ContactMerger 合并去重测试"""
+
+from findkp.contact_extraction import ContactMerger
+
+
+def merge(*contact_lists):
+    return ContactMerger().merge(list(contact_lists))
+
+
+def test_chain_merge_across_different_keys():
+    # A 与 B 邮箱相同，B 与 C LinkedIn 相同，三条记录是同一个人
+    result = merge(
+        [{"full_name": "Nguyen Van A", "email": "a.nguyen@abc.vn"}],
+        [
+            {
+                "email": "A.Nguyen@abc.vn",
+                "linkedin_url": "https://www.linkedin.com/in/anguyen/",
+            }
+        ],
+        [
+            {
+                "linkedin_url": "linkedin.com/in/anguyen?trk=x",
+                "role": "Purchasing Manager",
+            }
+        ],
+    )
+    assert len(result) == 1
+    assert result[0]["full_name"] == "Nguyen Van A"
+    assert result[0]["role"] == "Purchasing Manager"
+
+
+def test_contact_bridging_two_existing_entries_merges_them():
+    result = merge(
+        [{"full_name": "Tran B", "email": "b@abc.vn"}],
+        [{"full_name": "Someone", "linkedin_url": "linkedin.com/in/tranb"}],
+        [{"email": "b@abc.vn", "linkedin_url": "https://linkedin.com/in/tranb"}],
+        [{"full_name": "Le C", "email": "c@abc.vn"}],
+    )
+    assert [contact["email"] for contact in result] == ["b@abc.vn", "c@abc.vn"]
+    assert result[0]["linkedin_url"] == "linkedin.com/in/tranb"
+
+
+def test_keys_from_filled_fields_keep_merging():
+    # 第三条补全了第一条的邮箱，新邮箱键指向第二条记录，继续合并
+    result = merge(
+        [{"full_name": "Pham D"}],
+        [{"email": "d@abc.vn", "linkedin_url": "linkedin.com/in/phamd"}],
+        [{"full_name": "Pham D", "email": "d@abc.vn"}],
+    )
+    assert len(result) == 1
+    assert result[0]["linkedin_url"] == "linkedin.com/in/phamd"
+
+
+def test_empty_keys_do_not_merge():
+    result = merge(
+        [
+            {"full_name": "Nguyen E", "email": "", "linkedin_url": None},
+            {"full_name": "Nguyen F", "email": "  ", "linkedin_url": ""},
+            {"full_name": "   ", "email": None},
+        ]
+    )
+    assert [contact["full_name"] for contact in result] == ["Nguyen E", "Nguyen F"]
+
+
+def test_shared_mailbox_and_company_page_do_not_merge_people():
+    result = merge(
+        [
+            {
+                "full_name": "Nguyen G",
+                "email": "sales@abc.vn",
+                "linkedin_url": "https://www.linkedin.com/company/abc",
+            },
+            {
+                "full_name": "Tran H",
+                "email": "Sales@abc.vn",
+                "linkedin_url": "linkedin.com/company/abc/",
+            },
+        ]
+    )
+    assert [contact["full_name"] for contact in result] == ["Nguyen G", "Tran H"]
+
+
+def test_shared_mailbox_alone_still_deduplicates():
+    result = merge([{"email": "info@abc.vn"}], [{"email": "INFO@abc.vn"}])
+    assert len(result) == 1
+
+
+def test_field_precedence_and_confidence():
+    result = merge(
+        [{"full_name": "Vo K", "role": "Buyer", "confidence_score": 0.4}],
+        [
+            {
+                "full_name": "vo  k",
+                "role": "Director",
+                "email": "k@abc.vn",
+                "confidence_score": 0.9,
+            }
+        ],
+    )
+    assert result == [
+        {
+            "full_name": "Vo K",
+            "email": "k@abc.vn",
+            "role": "Buyer",
+            "linkedin_url": None,
+            "twitter_url": None,
+            "confidence_score": 0.9,
+        }
+    ]
+
+
+def test_absorbed_entry_keeps_earliest_position_and_fields():
+    result = merge(
+        [{"full_name": "Do M", "role": "Manager"}],
+        [{"email": "m@abc.vn", "role": "Owner"}],
+        [{"full_name": "Do M", "email": "m@abc.vn"}],
+    )
+    assert len(result) == 1
+    assert result[0]["role"] == "Manager"
+    assert result[0]["email"] == "m@abc.vn"
@@ -0,0 +1,88 @@
+"""Google 搜索每日配额测试"""
+
+from datetime import date, timedelta
+
+import httpx
+
+from core.search.google_provider import DailyQuotaTracker, GoogleSearchProvider
+
+
+def quota_error(reason, message="", metadata=None):
+    error = {"code": 429, "message": message, "errors": [{"reason": reason}]}
+    if metadata:
+        error["details"] = [{"metadata": metadata}]
+    return httpx.Response(429, json={"error": error})
+
+
+def test_tracker_stops_at_daily_limit():
+    tracker = DailyQuotaTracker(daily_limit=2)
+    assert tracker.try_acquire()
+    assert tracker.try_acquire()
+    assert not tracker.try_acquire()
+    assert tracker.remaining == 0
+
+
+def test_tracker_without_limit():
+    tracker = DailyQuotaTracker(daily_limit=0)
+    assert all(tracker.try_acquire() for _ in range(100))
+    assert tracker.remaining is None
+
+
+def test_tracker_mark_exhausted():
+    tracker = DailyQuotaTracker(daily_limit=0)
+    tracker.mark_exhausted()
+    assert tracker.remaining == 0
+    assert not tracker.try_acquire()
+
+
+def test_tracker_resets_on_new_day():
+    tracker = DailyQuotaTracker(daily_limit=1)
+    assert tracker.try_acquire()
+    tracker.mark_exhausted()
+    assert not tracker.try_acquire()
+
+    tracker._day = tracker._day - timedelta(days=1)
+    assert tracker.remaining == 1
+    assert tracker.try_acquire()
+
+
+def test_tracker_uses_quota_timezone():
+    tracker = DailyQuotaTracker(daily_limit=1, timezone="America/Los_Angeles")
+    assert str(tracker.tz) == "America/Los_Angeles"
+
+    tracker = DailyQuotaTracker(daily_limit=1, timezone="Not/AZone")
+    assert tracker.tz is None
+    assert tracker._today() == date.today()
+
+
+def test_daily_limit_reason_is_daily_quota():
+    response = quota_error("dailyLimitExceeded", "Daily Limit Exceeded")
+    assert GoogleSearchProvider._is_daily_quota_error(response)
+
+
+def test_per_minute_rate_limit_is_not_daily_quota():
+    response = quota_error(
+        "rateLimitExceeded",
+        "Quota exceeded for quota metric 'Queries' and limit 'Queries per minute'",
+    )
+    assert not GoogleSearchProvider._is_daily_quota_error(response)
+
+
+def test_per_day_rate_limit_is_daily_quota():
+    response = quota_error(
+        "rateLimitExceeded",
+        "Quota exceeded for quota metric 'Queries' and limit 'Queries per day'",
+    )
+    assert GoogleSearchProvider._is_daily_quota_error(response)
+
+    response = quota_error(
+        "rateLimitExceeded",
+        "Quota exceeded",
+        metadata={"quota_limit": "DefaultPerDayPerProject"},
+    )
+    assert GoogleSearchProvider._is_daily_quota_error(response)
+
+
+def test_non_json_response_is_not_daily_quota():
+    response = httpx.Response(429, text="Too Many Requests")
+    assert not GoogleSearchProvider._is_daily_quota_error(response)
@@ -0,0 +1,76 @@
+"""贸易记录去重键测试"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from database.repository import Repository
+
+ITEM = {
+    "date": "2024-03-01T00:00:00Z",
+    "importer": "CÔNG TY TNHH ABC VIỆT NAM",
+    "exporter": "XYZ CO., LTD",
+    "hsCode": "39011099",
+    "goodsDesc": "Hạt nhựa PE",
+    "sumOfUSD": 12500.5,
+    "weight": 20000,
+}
+
+
+def dedup_key(**row):
+    return Repository.build_trade_dedup_key(row)
+
+
+def test_trade_id_is_used_when_present():
+    assert dedup_key(trade_id="T-1", importer="ABC") == "T-1"
+    assert dedup_key(trade_id="T-1", importer="XYZ") == "T-1"
+
+
+def test_key_ignores_bookkeeping_fields():
+    base = dedup_key(importer="ABC", sum_of_usd=1)
+    assert base == dedup_key(
+        id=42,
+        importer="ABC",
+        sum_of_usd=1,
+        source_file="a.json",
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2),
+    )
+
+
+def test_numbers_normalize_across_types():
+    keys = {
+        dedup_key(importer="ABC", sum_of_usd=value, weight=weight)
+        for value, weight in (
+            (12500.5, 100),
+            (Decimal("12500.50"), Decimal("100.00")),
+            (Decimal("12500.5000"), 100.0),
+        )
+    }
+    assert len(keys) == 1
+
+
+def test_datetimes_normalize_timezone():
+    naive = dedup_key(importer="ABC", trade_date=datetime(2024, 3, 1))
+    aware = dedup_key(
+        importer="ABC", trade_date=datetime(2024, 3, 1, tzinfo=timezone.utc)
+    )
+    assert naive == aware
+
+
+def test_different_content_gives_different_key():
+    assert dedup_key(importer="ABC", sum_of_usd=1) != dedup_key(
+        importer="ABC", sum_of_usd=2
+    )
+
+
+def test_same_item_in_different_files_gives_same_key():
+    first = Repository.build_trade_record_row(ITEM, "exports/2024-03.json")
+    second = Repository.build_trade_record_row(dict(ITEM), "renamed/copy.json")
+    assert first["source_file"] != second["source_file"]
+    assert first["dedup_key"] == second["dedup_key"]
+    assert len(first["dedup_key"]) == 40
+
+
+def test_item_with_trade_id_keys_on_trade_id():
+    row = Repository.build_trade_record_row({**ITEM, "tradeId": 987}, "a.json")
+    assert row["dedup_key"] == "987"
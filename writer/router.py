@@ -1,6 +1,6 @@
 """Writer API 路由"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.connection import get_db
 from schemas.writer import (
@@ -15,9 +15,24 @@ from logs import logger
 router = APIRouter(prefix="/writer", tags=["Writer"])
 
 
+def get_service(request: Request) -> WriterService:
+    """
+    FastAPI 依赖项，返回应用共享的 WriterService
+
+    服务在应用启动时由 lifespan 创建（见 main.py）；
+    未经过 lifespan 的应用（如单独挂载路由）在首次请求时创建。
+    """
+    service = getattr(request.app.state, "writer_service", None)
+    if service is None:
+        service = request.app.state.writer_service = WriterService()
+    return service
+
+
 @router.post("/generate", response_model=GenerateEmailResponse)
 async def generate_emails(
-    request: GenerateEmailRequest, db: AsyncSession = Depends(get_db)
+    request: GenerateEmailRequest,
+    db: AsyncSession = Depends(get_db),
+    service: WriterService = Depends(get_service),
 ):
     """
     根据公司信息生成营销邮件
@@ -25,6 +40,7 @@ async def generate_emails(
     Args:
         request: 包含公司ID或公司名称的请求，可指定 LLM 模型类型
         db: 异步数据库会话
+        service: Writer 服务
 
     Returns:
         GenerateEmailResponse: 包含公司信息和生成的邮件列表
@@ -38,8 +54,6 @@ async def generate_emails(
             f"company_name={request.company_name}, "
         )
 
-        service = WriterService()
-
         result = await service.generate_emails(
             company_id=request.company_id,
             company_name=request.company_name,
@@ -4,9 +4,11 @@ import re
 import json
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Dict, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from llm import get_llm
+from llm import get_llm_for_task
+from llm.usage import record_llm_usage
+from core.metrics import record_error, timed
 from database.repository import Repository
 from database.models import Company, Contact
 from schemas.writer import (
@@ -28,8 +30,9 @@ class WriterService:
         """
         初始化 Writer 服务
         """
-        # 使用统一的 LLM 工厂函数，支持指定模型类型
-        self.llm = get_llm()
+        # 按任务类型获取 LLM（写作类任务默认使用能力更强的模型）
+        self.email_llm = get_llm_for_task("generate_email")
+        self.v4_email_llm = get_llm_for_task("generate_v4_email")
 
     def _separate_stages(self, content: str) -> tuple[str, str]:
         """
@@ -73,41 +76,6 @@ class WriterService:
             return title
         return ""
 
-    def _deduplicate_contacts(self, contacts: List[Contact]) -> List[Contact]:
-        """
-        按邮箱去重，保留置信度最高的联系人
-
-        Args:
-            contacts: 联系人列表
-
-        Returns:
-            去重后的联系人列表（只包含有邮箱的联系人）
-        """
-        email_map: Dict[str, Contact] = {}
-
-        for contact in contacts:
-            if not contact.email:
-                continue
-
-            email_lower = contact.email.lower()
-            if email_lower not in email_map:
-                email_map[email_lower] = contact
-            else:
-                # 比较置信度，保留更高的
-                existing = email_map[email_lower]
-                existing_score = existing.confidence_score or 0.0
-                current_score = contact.confidence_score or 0.0
-
-                if current_score > existing_score:
-                    email_map[email_lower] = contact
-                elif current_score == existing_score:
-                    # 置信度相同，保留最新的
-                    if contact.created_at and existing.created_at:
-                        if contact.created_at > existing.created_at:
-                            email_map[email_lower] = contact
-
-        return list(email_map.values())
-
     def _format_prompt(self, company: Company, contact: Contact) -> str:
         """
         格式化 Prompt 模板
@@ -219,6 +187,7 @@ class WriterService:
             logger.debug(f"原始响应内容: {content[:500]}")
             return None
 
+    @timed("writer", "email_v3")
     async def _generate_email_for_contact(
         self, company: Company, contact: Contact
     ) -> Optional[EmailContent]:
@@ -242,9 +211,9 @@ class WriterService:
         try:
             messages = [{"role": "user", "content": prompt}]
             model_name = (
-                self.llm.model_name
-                if hasattr(self.llm, "model_name")
-                else getattr(self.llm, "_model_name", "unknown")
+                self.email_llm.model_name
+                if hasattr(self.email_llm, "model_name")
+                else getattr(self.email_llm, "_model_name", "unknown")
             )
 
             # 记录 LLM 请求
@@ -255,15 +224,24 @@ class WriterService:
             )
 
             # 调用 LLM
-            response = await self.llm.ainvoke(messages)
+            response = await self.email_llm.ainvoke(messages)
 
             # 记录 LLM 响应
             if hasattr(response, "content"):
+                usage = record_llm_usage(
+                    "generate_email",
+                    model_name,
+                    messages,
+                    response,
+                    company_id=company.id,
+                    contact_id=contact.id,
+                )
                 log_llm_response(
                     response_content=response.content,
                     request_log_path=request_log_path,
                     model=model_name,
                     task_type="generate_email",
+                    usage=usage,
                 )
 
                 # 解析响应
@@ -273,12 +251,14 @@ class WriterService:
                 return None
 
         except Exception as e:
+            record_error("writer", "email_v3")
             logger.error(
                 f"为联系人 {contact.id} ({contact.email}) 生成邮件失败: {e}",
                 exc_info=True,
             )
             return None
 
+    @timed("writer", "generate_emails")
     async def generate_emails(
         self,
         company_id: Optional[int] = None,
@@ -313,12 +293,10 @@ class WriterService:
         if not company:
             raise ValueError(f"公司不存在: {company_id or company_name}")
 
-        # 查询联系人
-        contacts = await repository.get_all_contacts_with_email_by_company(company.id)
-        logger.info(f"公司 {company.name} 共有 {len(contacts)} 个联系人")
-
-        # 去重
-        deduplicated_contacts = self._deduplicate_contacts(contacts)
+        # 查询联系人（在数据库中按邮箱去重）
+        deduplicated_contacts = await repository.get_unique_email_contacts_by_company(
+            company.id
+        )
         logger.info(
             f"去重后（按邮箱）共有 {len(deduplicated_contacts)} 个联系人（有邮箱）"
         )
@@ -450,6 +428,7 @@ class WriterService:
             logger.debug(f"原始响应内容: {content[:500]}")
             return None
 
+    @timed("writer", "email_v4")
     async def _generate_v4_fragment_for_contact(
         self, company: Company, contact: Contact
     ) -> Optional[V4EmailFragment]:
@@ -473,9 +452,9 @@ class WriterService:
         try:
             messages = [{"role": "user", "content": prompt}]
             model_name = (
-                self.llm.model_name
-                if hasattr(self.llm, "model_name")
-                else getattr(self.llm, "_model_name", "unknown")
+                self.v4_email_llm.model_name
+                if hasattr(self.v4_email_llm, "model_name")
+                else getattr(self.v4_email_llm, "_model_name", "unknown")
             )
 
             # 记录 LLM 请求
@@ -486,15 +465,24 @@ class WriterService:
             )
 
             # 调用 LLM
-            response = await self.llm.ainvoke(messages)
+            response = await self.v4_email_llm.ainvoke(messages)
 
             # 记录 LLM 响应
             if hasattr(response, "content"):
+                usage = record_llm_usage(
+                    "generate_v4_email",
+                    model_name,
+                    messages,
+                    response,
+                    company_id=company.id,
+                    contact_id=contact.id,
+                )
                 log_llm_response(
                     response_content=response.content,
                     request_log_path=request_log_path,
                     model=model_name,
                     task_type="generate_v4_email",
+                    usage=usage,
                 )
 
                 # 解析 JSON 响应
@@ -504,6 +492,7 @@ class WriterService:
                 return None
 
         except Exception as e:
+            record_error("writer", "email_v4")
             logger.error(
                 f"为联系人 {contact.id} ({contact.email}) 生成 V4 片段失败: {e}",
                 exc_info=True,